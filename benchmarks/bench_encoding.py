@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""Measure encode time and size of the intermediate image formats."""
+from __future__ import annotations
+
+import argparse
+import timeit
+from io import BytesIO
+
+from PIL import Image
+
+from pytesseract.pytesseract import INTERMEDIATE_FORMATS
+
+
+# A4 page scanned at 300 DPI
+PAGE_SIZE = (2480, 3508)
+
+ENCODINGS = {
+    'PNG (default)': ('PNG', {}),
+    'JPEG (quality 95)': ('JPEG', {'quality': 95}),
+    **{
+        f'{name} (intermediate)': (pillow_format, options)
+        for name, (pillow_format, _, options) in INTERMEDIATE_FORMATS.items()
+    },
+}
+
+
+def synthetic_page(mode, size):
+    """Returns a page of black text-like strokes on white."""
+    image = Image.effect_noise(size, 64).point(
+        lambda value: 0 if value < 40 else 255,
+    )
+    return image.convert(mode)
+
+
+def encode(image, pillow_format, options):
+    with BytesIO() as buffer:
+        image.save(buffer, format=pillow_format, **options)
+        return buffer.tell()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('image', nargs='?', help='defaults to synthetic pages')
+    parser.add_argument('-n', '--number', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.image:
+        with Image.open(args.image) as image:
+            image.load()
+        images = {args.image: image}
+    else:
+        images = {
+            f'{mode} {PAGE_SIZE[0]}x{PAGE_SIZE[1]}': synthetic_page(
+                mode,
+                PAGE_SIZE,
+            )
+            for mode in ('L', 'RGB')
+        }
+
+    print(f'{"image":<16}{"encoding":<22}{"time":>10}{"bytes":>14}')
+    for label, image in images.items():
+        for name, (pillow_format, options) in ENCODINGS.items():
+            try:
+                size = encode(image, pillow_format, options)
+            except (OSError, KeyError, ValueError):
+                continue
+            seconds = min(
+                timeit.repeat(
+                    lambda: encode(image, pillow_format, options),
+                    number=1,
+                    repeat=args.number,
+                ),
+            )
+            print(f'{label:<16}{name:<22}{seconds:>9.4f}s{size:>14,}')
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""Measure the parse time of large image_to_data TSV outputs."""
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+
+from pytesseract.pytesseract import file_to_dict
+from pytesseract.pytesseract import file_to_numpy
+from pytesseract.pytesseract import numpy_installed
+from pytesseract.pytesseract import pandas_installed
+from pytesseract.pytesseract import tsv_to_pandas
+
+
+HEADER = (
+    'level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\t'
+    'left\ttop\twidth\theight\tconf\ttext'
+)
+
+
+def synthetic_tsv(rows, seed=0):
+    """Returns a TSV of words with the shape tesseract 5 writes."""
+    rng = random.Random(seed)
+    lines = [HEADER, '1\t1\t0\t0\t0\t0\t0\t0\t2480\t3508\t-1\t']
+    for i in range(rows):
+        word = ''.join(rng.choices('abcdefghij', k=rng.randint(1, 9)))
+        lines.append(
+            f'5\t1\t{i // 500 + 1}\t{i // 100 % 5 + 1}\t{i // 10 % 10 + 1}\t'
+            f'{i % 10 + 1}\t{rng.randrange(2480)}\t{rng.randrange(3508)}\t'
+            f'{rng.randrange(200)}\t{rng.randrange(60)}\t'
+            f'{rng.uniform(0, 100):.6f}\t{word}',
+        )
+    return '\n'.join(lines) + '\n'
+
+
+def legacy_file_to_dict(tsv, cell_delimiter, str_col_idx):
+    """The row by row, cell by cell parser of pytesseract 0.3.13."""
+    result = {}
+    rows = [row.split(cell_delimiter) for row in tsv.strip().split('\n')]
+    if len(rows) < 2:
+        return result
+
+    header = rows.pop(0)
+    length = len(header)
+    if len(rows[-1]) < length:
+        rows[-1].append('')
+
+    if str_col_idx < 0:
+        str_col_idx += length
+
+    for i, head in enumerate(header):
+        result[head] = list()
+        for row in rows:
+            if len(row) <= i:
+                continue
+
+            if i != str_col_idx:
+                try:
+                    val = int(float(row[i]))
+                except ValueError:
+                    val = row[i]
+            else:
+                val = row[i]
+
+            result[head].append(val)
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '-r',
+        '--rows',
+        type=int,
+        nargs='+',
+        default=[1000, 10000, 50000],
+    )
+    parser.add_argument('-n', '--number', type=int, default=5)
+    args = parser.parse_args()
+
+    parsers = {
+        'file_to_dict (legacy)': lambda tsv: legacy_file_to_dict(
+            tsv,
+            '\t',
+            -1,
+        ),
+        'file_to_dict': lambda tsv: file_to_dict(tsv, '\t', -1),
+    }
+    if numpy_installed:
+        parsers['file_to_numpy'] = lambda tsv: file_to_numpy(tsv, '\t', -1)
+    if pandas_installed:
+        parsers['tsv_to_pandas'] = lambda tsv: tsv_to_pandas(tsv.encode())
+
+    print(f'{"rows":>8}  {"parser":<24}{"time":>10}')
+    for rows in args.rows:
+        tsv = synthetic_tsv(rows)
+        assert legacy_file_to_dict(tsv, '\t', -1) == file_to_dict(
+            tsv,
+            '\t',
+            -1,
+        )
+        for name, parse in parsers.items():
+            seconds = min(
+                timeit.repeat(
+                    lambda: parse(tsv),
+                    number=1,
+                    repeat=args.number,
+                ),
+            )
+            print(f'{rows:>8}  {name:<24}{seconds * 1000:>8.2f}ms')
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
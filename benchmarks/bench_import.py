@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""Measure the import time of pytesseract with python -X importtime."""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+
+
+def import_times(module):
+    """Returns the (self, cumulative) microseconds of every imported module."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=True,
+        text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines()[1:]:
+        self_time, cumulative, name = line.partition(':')[2].split('|')
+        times[name.strip()] = int(self_time), int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('module', nargs='?', default='pytesseract')
+    parser.add_argument('-n', '--number', type=int, default=5)
+    parser.add_argument('-t', '--top', type=int, default=15)
+    parser.add_argument(
+        '--max-ms',
+        type=float,
+        help='exit with an error when the best run is slower',
+    )
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.number)]
+    best = min(runs, key=lambda times: times[args.module][1])
+
+    print(f'{"module":<48}{"self":>10}{"cumulative":>12}')
+    top = args.top
+    slowest = sorted(best.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (self_time, cumulative) in slowest[:top]:
+        print(
+            f'{name:<48}{self_time / 1000:>8.1f}ms{cumulative / 1000:>10.1f}ms'
+        )
+
+    total = best[args.module][1] / 1000
+    print(f'\nimport {args.module}: {total:.1f}ms, {len(best)} modules')
+    if args.max_ms is not None and total > args.max_ms:
+        return f'import time {total:.1f}ms exceeds {args.max_ms}ms'
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+"""
+Measure the wrapper overhead of every image_to_* function and output type.
+
+Every call runs the deterministic fake_tesseract.py instead of tesseract, so
+the OCR time is constant and tiny. The overhead of a call is its best time
+minus the best time of running the fake executable directly on the same
+input, which leaves what pytesseract itself costs: image conversion and
+encoding, temporary files, argument handling, output reading and parsing.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import timeit
+from os import path
+from tempfile import TemporaryDirectory
+
+from PIL import Image
+
+import pytesseract
+from pytesseract import Output
+from pytesseract.pytesseract import numpy_installed
+from pytesseract.pytesseract import pandas_installed
+
+
+BENCH_DIR = path.dirname(path.abspath(__file__))
+FAKE_TESSERACT = path.join(BENCH_DIR, 'fake_tesseract.py')
+
+TABLE_OUTPUTS = (
+    Output.STRING,
+    Output.BYTES,
+    Output.DICT,
+    Output.NUMPY,
+    Output.DATAFRAME,
+)
+
+# name, extension of the tesseract run, function, output types
+CASES = [
+    (
+        'image_to_string',
+        'txt',
+        pytesseract.image_to_string,
+        (Output.STRING, Output.BYTES, Output.DICT),
+    ),
+    (
+        'image_to_boxes',
+        'box',
+        pytesseract.image_to_boxes,
+        TABLE_OUTPUTS[:-1],
+    ),
+    ('image_to_data', 'tsv', pytesseract.image_to_data, TABLE_OUTPUTS),
+    (
+        'image_to_osd',
+        'osd',
+        pytesseract.image_to_osd,
+        (Output.STRING, Output.BYTES, Output.DICT),
+    ),
+    (
+        'image_to_pdf_or_hocr[pdf]',
+        'pdf',
+        lambda image, output_type: pytesseract.image_to_pdf_or_hocr(image),
+        (Output.BYTES,),
+    ),
+    (
+        'image_to_pdf_or_hocr[hocr]',
+        'hocr',
+        lambda image, output_type: pytesseract.image_to_pdf_or_hocr(
+            image,
+            extension='hocr',
+        ),
+        (Output.BYTES,),
+    ),
+    (
+        'image_to_alto_xml',
+        'xml',
+        lambda image, output_type: pytesseract.image_to_alto_xml(image),
+        (Output.BYTES,),
+    ),
+]
+
+# tesseract arguments of the direct runs of the fake executable
+DIRECT_ARGS = {
+    'txt': ['txt'],
+    'box': ['-c', 'tessedit_create_boxfile=1', 'batch.nochop', 'makebox'],
+    'tsv': ['-c', 'tessedit_create_tsv=1'],
+    'osd': ['--psm', '0'],
+    'pdf': ['pdf'],
+    'hocr': ['-c', 'tessedit_create_hocr=1'],
+    'xml': ['-c', 'tessedit_create_alto=1'],
+}
+
+
+def supported(output_type):
+    if output_type == Output.NUMPY:
+        return numpy_installed
+    if output_type == Output.DATAFRAME:
+        return pandas_installed
+    return True
+
+
+def synthetic_page(size):
+    """Returns an RGB page of dark text-like strokes on white."""
+    image = Image.effect_noise(size, 64).point(
+        lambda value: 0 if value < 40 else 255,
+    )
+    return image.convert('RGB')
+
+
+def inputs(size, directory):
+    """Returns the input kinds of a page: file path, PIL image, ndarray."""
+    image = synthetic_page(size)
+    filename = path.join(directory, f'page_{size[0]}x{size[1]}.png')
+    image.save(filename)
+
+    kinds = {'path': filename, 'PIL': image}
+    if numpy_installed:
+        import numpy
+
+        kinds['ndarray'] = numpy.asarray(image)
+    return filename, kinds
+
+
+def best_time(func, number):
+    return min(timeit.repeat(func, number=1, repeat=number))
+
+
+def direct_time(filename, extension, directory, number):
+    """Returns the best time of the fake executable run directly."""
+    args = [
+        FAKE_TESSERACT,
+        filename,
+        path.join(directory, 'direct'),
+        *DIRECT_ARGS[extension],
+    ]
+    return best_time(
+        lambda: subprocess.run(args, check=True, stdin=subprocess.DEVNULL),
+        number,
+    )
+
+
+def concurrency(func, image, workers, calls):
+    """Returns the calls per second of calls concurrent calls."""
+    images = [image] * calls
+    elapsed = timeit.timeit(
+        lambda: list(pytesseract.map_images(func, images, workers=workers)),
+        number=1,
+    )
+    return calls / elapsed
+
+
+def size_arg(value):
+    width, _, height = value.partition('x')
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--number', type=int, default=10)
+    parser.add_argument(
+        '--sizes',
+        type=lambda value: [size_arg(size) for size in value.split(',')],
+        default=[(640, 480), (2480, 3508)],
+        help='comma separated WIDTHxHEIGHT image sizes',
+    )
+    parser.add_argument(
+        '--workers',
+        type=lambda value: [int(workers) for workers in value.split(',')],
+        default=[1, 4],
+        help='comma separated concurrency levels',
+    )
+    parser.add_argument('--filter', default='', help='function name filter')
+    parser.add_argument('--delay', type=float, default=0.0)
+    parser.add_argument('--words', type=int, default=100)
+    parser.add_argument(
+        '--max-overhead-ms',
+        type=float,
+        help='exit with an error when an overhead is larger',
+    )
+    args = parser.parse_args()
+
+    os.environ['FAKE_TESSERACT_DELAY'] = str(args.delay)
+    os.environ['FAKE_TESSERACT_WORDS'] = str(args.words)
+    pytesseract.pytesseract.tesseract_cmd = FAKE_TESSERACT
+    cases = [case for case in CASES if args.filter in case[0]]
+
+    worst = 0.0
+    with TemporaryDirectory() as directory:
+        print(
+            f'{"function":<28}{"output":<11}{"size":<11}{"input":<9}'
+            f'{"call":>10}{"overhead":>11}',
+        )
+        for size in args.sizes:
+            filename, kinds = inputs(size, directory)
+            direct = {
+                extension: direct_time(
+                    filename,
+                    extension,
+                    directory,
+                    args.number,
+                )
+                for _, extension, _, _ in cases
+            }
+            for name, extension, func, output_types in cases:
+                for output_type in filter(supported, output_types):
+                    for kind, image in kinds.items():
+                        call = best_time(
+                            lambda: func(image, output_type=output_type),
+                            args.number,
+                        )
+                        overhead = (call - direct[extension]) * 1000
+                        worst = max(worst, overhead)
+                        print(
+                            f'{name:<28}{output_type:<11}'
+                            f'{size[0]}x{size[1]:<6}{kind:<9}'
+                            f'{call * 1000:>8.2f}ms{overhead:>9.2f}ms',
+                        )
+
+        print(f'\n{"function":<28}{"workers":>8}{"calls/s":>12}')
+        _, kinds = inputs(args.sizes[0], directory)
+        for name, _, func, output_types in cases:
+            for workers in args.workers:
+                rate = concurrency(
+                    lambda image: func(image, output_type=output_types[0]),
+                    kinds['PIL'],
+                    workers,
+                    max(args.number, workers * 4),
+                )
+                print(f'{name:<28}{workers:>8}{rate:>12.1f}')
+
+    print(f'\nlargest overhead: {worst:.2f}ms')
+    if args.max_overhead_ms is not None and worst > args.max_overhead_ms:
+        return f'overhead {worst:.2f}ms exceeds {args.max_overhead_ms}ms'
+
+
+if __name__ == '__main__':
+    raise SystemExit(main() if sys.platform != 'win32' else 'POSIX only')
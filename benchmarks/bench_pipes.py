@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""Compare the temporary file and the stdin/stdout tesseract code paths."""
+from __future__ import annotations
+
+import argparse
+import timeit
+from os import path
+
+from PIL import Image
+
+import pytesseract
+
+
+ROOT_DIR = path.dirname(path.dirname(path.abspath(__file__)))
+TEST_JPEG = path.join(ROOT_DIR, 'tests', 'data', 'test.jpg')
+
+FUNCTIONS = {
+    'txt': pytesseract.image_to_string,
+    'box': pytesseract.image_to_boxes,
+    'tsv': pytesseract.image_to_data,
+    'hocr': lambda image: pytesseract.image_to_pdf_or_hocr(
+        image,
+        extension='hocr',
+    ),
+}
+
+
+def bench(func, image, use_pipes, number):
+    pytesseract.pytesseract.use_pipes = use_pipes
+    try:
+        return min(timeit.repeat(lambda: func(image), number=1, repeat=number))
+    finally:
+        pytesseract.pytesseract.use_pipes = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('image', nargs='?', default=TEST_JPEG)
+    parser.add_argument('-n', '--number', type=int, default=10)
+    args = parser.parse_args()
+
+    with Image.open(args.image) as image:
+        image.load()
+
+    print(f'{"format":<8}{"input":<8}{"tempfile":>12}{"pipes":>12}')
+    for extension, func in FUNCTIONS.items():
+        for kind, obj in (('path', args.image), ('PIL', image)):
+            temp = bench(func, obj, False, args.number)
+            pipe = bench(func, obj, True, args.number)
+            print(f'{extension:<8}{kind:<8}{temp:>11.4f}s{pipe:>11.4f}s')
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+"""
+Deterministic stand-in for the tesseract executable.
+
+It parses the command line like tesseract does, reads the whole input
+(file, list file or stdin) and writes canned txt, tsv, box, hocr, osd, pdf
+and xml outputs of FAKE_TESSERACT_WORDS words (100 by default) per page,
+after sleeping FAKE_TESSERACT_DELAY seconds (0 by default). It only depends
+on the standard library, so its own cost stays small and constant.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+VERSION = 'tesseract 5.3.0\n leptonica-1.82.0\n'
+LANGUAGES = ('eng', 'fra', 'osd')
+
+# config files and variables enabling the output formats
+CONFIG_FILES = {'txt': 'txt', 'pdf': 'pdf', 'hocr': 'hocr', 'tsv': 'tsv'}
+VARIABLES = {
+    'tessedit_create_alto': 'xml',
+    'tessedit_create_boxfile': 'box',
+    'tessedit_create_hocr': 'hocr',
+    'tessedit_create_pdf': 'pdf',
+    'tessedit_create_tsv': 'tsv',
+    'tessedit_create_txt': 'txt',
+}
+OPTIONS_WITH_VALUE = {'-l', '--psm', '--oem', '--dpi', '--tessdata-dir'}
+
+TSV_HEADER = (
+    'level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\t'
+    'left\ttop\twidth\theight\tconf\ttext\n'
+)
+WORDS_PER_LINE = 10
+
+
+def words(count):
+    """Returns the (line, index, left, top, text) of the words of a page"""
+    for index in range(count):
+        line, column = divmod(index, WORDS_PER_LINE)
+        yield line + 1, column + 1, 20 + column * 90, 20 + line * 40, (
+            f'word{index}'
+        )
+
+
+def page_outputs(page, count):
+    txt, tsv, box, hocr = [], [], [], []
+    tsv.append(f'1\t{page}\t0\t0\t0\t0\t0\t0\t1000\t1000\t-1\t\n')
+    for line, word, left, top, text in words(count):
+        if word == 1:
+            if txt:
+                txt.append('\n')
+            tsv.append(
+                f'4\t{page}\t1\t1\t{line}\t0\t{left}\t{top}\t900\t30\t-1\t\n'
+            )
+        else:
+            txt.append(' ')
+        txt.append(text)
+        conf = 50 + (line * 7 + word * 13) % 50
+        tsv.append(
+            f'5\t{page}\t1\t1\t{line}\t{word}\t{left}\t{top}\t80\t30\t'
+            f'{conf}.5\t{text}\n',
+        )
+        box.extend(
+            f'{char} {left + i * 10} {960 - top} {left + i * 10 + 9} '
+            f'{990 - top} {page - 1}\n'
+            for i, char in enumerate(text)
+        )
+        hocr.append(
+            f"<span class='ocrx_word' title='bbox {left} {top} {left + 80} "
+            f"{top + 30}; x_wconf {conf}'>{text}</span>\n",
+        )
+    return {
+        'txt': ''.join(txt) + '\n\f',
+        'tsv': ''.join(tsv),
+        'box': ''.join(box),
+        'hocr': (
+            f"<div class='ocr_page' id='page_{page}'>\n"
+            f"{''.join(hocr)}</div>\n"
+        ),
+    }
+
+
+def outputs(pages, count, formats):
+    generated = [page_outputs(page, count) for page in range(1, pages + 1)]
+    result = {}
+    for name in formats:
+        if name == 'osd':
+            result[name] = (
+                'Page number: 0\nOrientation in degrees: 0\nRotate: 0\n'
+                'Orientation confidence: 9.30\nScript: Latin\n'
+                'Script confidence: 3.30\n'
+            )
+        elif name == 'pdf':
+            result[name] = (
+                '%PDF-1.5\n'
+                + '\n'.join(page['txt'] for page in generated)
+                + '%%EOF\n'
+            )
+        elif name == 'xml':
+            result[name] = (
+                '<?xml version="1.0" encoding="UTF-8"?>\n<alto>\n'
+                + ''.join(page['hocr'] for page in generated)
+                + '</alto>\n'
+            )
+        elif name == 'hocr':
+            result[name] = (
+                "<?xml version='1.0' encoding='UTF-8'?>\n<html><body>\n"
+                + ''.join(page['hocr'] for page in generated)
+                + '</body></html>\n'
+            )
+        elif name == 'tsv':
+            result[name] = TSV_HEADER + ''.join(
+                page['tsv'] for page in generated
+            )
+        else:
+            result[name] = ''.join(page[name] for page in generated)
+    return result
+
+
+def read_input(name):
+    """Reads the whole input like tesseract does, returns its page count"""
+    if name in {'stdin', '-'}:
+        sys.stdin.buffer.read()
+        return 1
+
+    with open(name, 'rb') as f:
+        data = f.read()
+    if not name.lower().endswith('.txt'):
+        return 1
+
+    listed = [line for line in data.decode().splitlines() if line.strip()]
+    for filename in listed:
+        with open(filename, 'rb') as f:
+            f.read()
+    return len(listed)
+
+
+def main(args):
+    if args[:1] in (['--version'], ['-v']):
+        sys.stdout.write(VERSION)
+        return 0
+    if args[:1] == ['--list-langs']:
+        sys.stdout.write(f'List of available languages ({len(LANGUAGES)}):\n')
+        sys.stdout.write(''.join(f'{lang}\n' for lang in LANGUAGES))
+        return 0
+    if len(args) < 2:
+        sys.stderr.write('Usage: tesseract imagename outputbase [options]\n')
+        return 1
+
+    input_name, output_base, rest = args[0], args[1], args[2:]
+    formats, osd = set(), False
+    index = 0
+    while index < len(rest):
+        arg = rest[index]
+        if arg in OPTIONS_WITH_VALUE:
+            osd = osd or (arg == '--psm' and rest[index + 1] == '0')
+            index += 2
+            continue
+        if arg == '-c':
+            name, _, value = rest[index + 1].partition('=')
+            if name in VARIABLES and value == '1':
+                formats.add(VARIABLES[name])
+            index += 2
+            continue
+        if arg in CONFIG_FILES:
+            formats.add(CONFIG_FILES[arg])
+        elif arg == 'makebox':
+            formats.add('box')
+        index += 1
+
+    if osd:
+        formats = {'osd'}
+    elif not formats:
+        formats = {'txt'}
+
+    pages = read_input(input_name)
+    time.sleep(float(os.environ.get('FAKE_TESSERACT_DELAY', 0)))
+    count = int(os.environ.get('FAKE_TESSERACT_WORDS', 100))
+
+    for name, output in sorted(outputs(pages, count, formats).items()):
+        if output_base in {'stdout', '-'}:
+            sys.stdout.write(output)
+        else:
+            with open(f'{output_base}.{name}', 'w', encoding='utf-8') as f:
+                f.write(output)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(sys.argv[1:]))
@@ -1,21 +1,60 @@
-# flake8: noqa: F401
 from __future__ import annotations
 
-from .pytesseract import ALTONotSupported
-from .pytesseract import get_languages
-from .pytesseract import get_tesseract_version
-from .pytesseract import image_to_alto_xml
-from .pytesseract import image_to_boxes
-from .pytesseract import image_to_data
-from .pytesseract import image_to_osd
-from .pytesseract import image_to_pdf_or_hocr
-from .pytesseract import image_to_string
-from .pytesseract import Output
-from .pytesseract import run_and_get_multiple_output
-from .pytesseract import run_and_get_output
-from .pytesseract import TesseractError
-from .pytesseract import TesseractNotFoundError
-from .pytesseract import TSVNotSupported
+from importlib import import_module
 
 
 __version__ = '0.3.14'
+
+# The names are imported from their submodule on first use, so that
+# importing a light submodule (e.g. the pytesseract.client of the OCR
+# server) doesn't load Pillow and the rest of the library.
+_EXPORTS = {
+    'map_images': 'executor',
+    'OCRExecutor': 'executor',
+    'TesseractProfile': 'profile',
+    'ALTONotSupported': 'pytesseract',
+    'get_languages': 'pytesseract',
+    'get_output_formats': 'pytesseract',
+    'get_tesseract_version': 'pytesseract',
+    'image_to_alto_xml': 'pytesseract',
+    'image_to_boxes': 'pytesseract',
+    'image_to_boxes_batch': 'pytesseract',
+    'image_to_data': 'pytesseract',
+    'image_to_data_batch': 'pytesseract',
+    'image_to_osd': 'pytesseract',
+    'image_to_outputs': 'pytesseract',
+    'image_to_pdf_or_hocr': 'pytesseract',
+    'image_to_string': 'pytesseract',
+    'image_to_string_batch': 'pytesseract',
+    'iter_image_to_data': 'pytesseract',
+    'iter_image_to_string': 'pytesseract',
+    'iter_run_and_get_output': 'pytesseract',
+    'Output': 'pytesseract',
+    'run_and_get_batch_output': 'pytesseract',
+    'run_and_get_multiple_output': 'pytesseract',
+    'run_and_get_output': 'pytesseract',
+    'TesseractError': 'pytesseract',
+    'TesseractNotFoundError': 'pytesseract',
+    'TSVNotSupported': 'pytesseract',
+    'image_to_string_regions': 'regions',
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(import_module(f'.{_EXPORTS[name]}', __name__), name)
+    else:
+        try:
+            value = import_module(f'.{name}', __name__)
+        except ModuleNotFoundError as e:
+            if e.name != f'{__name__}.{name}':
+                raise
+            raise AttributeError(
+                f'module {__name__!r} has no attribute {name!r}',
+            ) from None
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_EXPORTS})
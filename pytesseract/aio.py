@@ -0,0 +1,321 @@
+"""
+asyncio versions of the pytesseract image_to_* functions.
+
+Tesseract runs in asyncio subprocesses, so an event loop can keep many OCR
+jobs in flight without a thread per page. The number of concurrent tesseract
+processes per event loop is capped by ``max_processes`` (defaults to the
+number of available CPUs). Timeouts and task cancellation kill the child
+process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from errno import ENOENT
+from os import extsep
+from tempfile import NamedTemporaryFile
+from weakref import WeakKeyDictionary
+
+from .executor import available_cpu_count
+from .pytesseract import _read_output
+from .pytesseract import ALTONotSupported
+from .pytesseract import cleanup
+from .pytesseract import DEFAULT_ENCODING
+from .pytesseract import encode
+from .pytesseract import file_to_dict
+from .pytesseract import file_to_numpy
+from .pytesseract import get_errors
+from .pytesseract import get_tesseract_version
+from .pytesseract import osd_to_dict
+from .pytesseract import Output
+from .pytesseract import STREAMABLE_EXTENSIONS
+from .pytesseract import subprocess_env
+from .pytesseract import TESSERACT_ALTO_VERSION
+from .pytesseract import tesseract_args
+from .pytesseract import TESSERACT_MIN_VERSION
+from .pytesseract import TesseractError
+from .pytesseract import TesseractNotFoundError
+from .pytesseract import tsv_to_pandas
+from .pytesseract import TSVNotSupported
+
+
+# maximum number of tesseract processes running at once in an event loop,
+# read when the loop starts its first tesseract process
+max_processes = None
+
+_semaphores = WeakKeyDictionary()
+
+
+def _get_semaphore():
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max_processes or available_cpu_count())
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+async def run_tesseract(
+    input_filename,
+    output_filename_base,
+    extension,
+    lang,
+    config='',
+    nice=0,
+    timeout=0,
+    input_data=None,
+):
+    async with _get_semaphore():
+        return await _run_tesseract(
+            input_filename,
+            output_filename_base,
+            extension,
+            lang,
+            config,
+            nice,
+            timeout,
+            input_data,
+        )
+
+
+async def _run_tesseract(
+    input_filename,
+    output_filename_base,
+    extension,
+    lang,
+    config,
+    nice,
+    timeout,
+    input_data,
+):
+    """run_tesseract, with a process slot of the semaphore already held"""
+    cmd_args = tesseract_args(
+        input_filename,
+        output_filename_base,
+        extension,
+        lang,
+        config,
+        nice,
+    )
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd_args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=subprocess_env(),
+        )
+    except OSError as e:
+        if e.errno != ENOENT:
+            raise
+        else:
+            raise TesseractNotFoundError()
+
+    try:
+        output, error_string = await asyncio.wait_for(
+            proc.communicate(input_data),
+            timeout or None,
+        )
+    except asyncio.TimeoutError:
+        raise RuntimeError('Tesseract process timeout')
+    finally:
+        # timed out or cancelled
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+
+    if proc.returncode:
+        raise TesseractError(proc.returncode, get_errors(error_string))
+    return output
+
+
+async def run_and_get_output(
+    image,
+    extension='',
+    lang=None,
+    config='',
+    nice=0,
+    timeout=0,
+    return_bytes=False,
+):
+    # encoded only once a process slot is free, so that at most
+    # max_processes encoded images are held in memory
+    async with _get_semaphore():
+        input_filename, input_data = await asyncio.to_thread(encode, image)
+        args = [extension, lang, config, nice, timeout, input_data]
+
+        if extension in STREAMABLE_EXTENSIONS:
+            output = await _run_tesseract(input_filename, 'stdout', *args)
+        else:
+            with NamedTemporaryFile(prefix='tess_', delete=False) as f:
+                pass
+            try:
+                await _run_tesseract(input_filename, f.name, *args)
+                output = _read_output(f'{f.name}{extsep}{extension}', True)
+            finally:
+                cleanup(f.name)
+
+    return output if return_bytes else output.decode(DEFAULT_ENCODING)
+
+
+async def image_to_string(
+    image,
+    lang=None,
+    config='',
+    nice=0,
+    output_type=Output.STRING,
+    timeout=0,
+):
+    """
+    Returns the result of a Tesseract OCR run on the provided image to string
+    """
+    convert = {
+        Output.BYTES: lambda output: output,
+        Output.DICT: lambda output: {'text': output.decode(DEFAULT_ENCODING)},
+        Output.STRING: lambda output: output.decode(DEFAULT_ENCODING),
+    }[output_type]
+
+    args = [image, 'txt', lang, config, nice, timeout, True]
+    return convert(await run_and_get_output(*args))
+
+
+async def image_to_pdf_or_hocr(
+    image,
+    lang=None,
+    config='',
+    nice=0,
+    extension='pdf',
+    timeout=0,
+):
+    """
+    Returns the result of a Tesseract OCR run on the provided image to pdf/hocr
+    """
+
+    if extension not in {'pdf', 'hocr'}:
+        raise ValueError(f'Unsupported extension: {extension}')
+
+    if extension == 'hocr':
+        config = f'-c tessedit_create_hocr=1 {config.strip()}'
+
+    args = [image, extension, lang, config, nice, timeout, True]
+
+    return await run_and_get_output(*args)
+
+
+async def image_to_alto_xml(
+    image,
+    lang=None,
+    config='',
+    nice=0,
+    timeout=0,
+):
+    """
+    Returns the result of a Tesseract OCR run on the provided image to ALTO XML
+    """
+
+    version = await asyncio.to_thread(get_tesseract_version, cached=True)
+    if version < TESSERACT_ALTO_VERSION:
+        raise ALTONotSupported()
+
+    config = f'-c tessedit_create_alto=1 {config.strip()}'
+    args = [image, 'xml', lang, config, nice, timeout, True]
+
+    return await run_and_get_output(*args)
+
+
+async def image_to_boxes(
+    image,
+    lang=None,
+    config='',
+    nice=0,
+    output_type=Output.STRING,
+    timeout=0,
+):
+    """
+    Returns string containing recognized characters and their box boundaries
+    """
+    convert = {
+        Output.BYTES: lambda output: output,
+        Output.DICT: lambda output: file_to_dict(
+            f'char left bottom right top page\n'
+            f'{output.decode(DEFAULT_ENCODING)}',
+            ' ',
+            0,
+        ),
+        Output.NUMPY: lambda output: file_to_numpy(
+            f'char left bottom right top page\n'
+            f'{output.decode(DEFAULT_ENCODING)}',
+            ' ',
+            0,
+        ),
+        Output.STRING: lambda output: output.decode(DEFAULT_ENCODING),
+    }[output_type]
+
+    config = (
+        f'{config.strip()} -c tessedit_create_boxfile=1 batch.nochop makebox'
+    )
+    args = [image, 'box', lang, config, nice, timeout, True]
+    return convert(await run_and_get_output(*args))
+
+
+async def image_to_data(
+    image,
+    lang=None,
+    config='',
+    nice=0,
+    output_type=Output.STRING,
+    timeout=0,
+    pandas_config=None,
+):
+    """
+    Returns string containing box boundaries, confidences,
+    and other information. Requires Tesseract 3.05+
+    """
+    convert = {
+        Output.BYTES: lambda output: output,
+        Output.DATAFRAME: lambda output: tsv_to_pandas(output, pandas_config),
+        Output.DICT: lambda output: file_to_dict(
+            output.decode(DEFAULT_ENCODING),
+            '\t',
+            -1,
+        ),
+        Output.NUMPY: lambda output: file_to_numpy(
+            output.decode(DEFAULT_ENCODING),
+            '\t',
+            -1,
+        ),
+        Output.STRING: lambda output: output.decode(DEFAULT_ENCODING),
+    }[output_type]
+
+    version = await asyncio.to_thread(get_tesseract_version, cached=True)
+    if version < TESSERACT_MIN_VERSION:
+        raise TSVNotSupported()
+
+    config = f'-c tessedit_create_tsv=1 {config.strip()}'
+    args = [image, 'tsv', lang, config, nice, timeout, True]
+    return convert(await run_and_get_output(*args))
+
+
+async def image_to_osd(
+    image,
+    lang='osd',
+    config='',
+    nice=0,
+    output_type=Output.STRING,
+    timeout=0,
+):
+    """
+    Returns string containing the orientation and script detection (OSD)
+    """
+    convert = {
+        Output.BYTES: lambda output: output,
+        Output.DICT: lambda output: osd_to_dict(
+            output.decode(DEFAULT_ENCODING),
+        ),
+        Output.STRING: lambda output: output.decode(DEFAULT_ENCODING),
+    }[output_type]
+
+    config = f'--psm 0 {config.strip()}'
+    args = [image, 'osd', lang, config, nice, timeout, True]
+    return convert(await run_and_get_output(*args))
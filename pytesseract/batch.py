@@ -0,0 +1,303 @@
+"""
+Batch OCR of directories, globs and manifests from the command line.
+
+    pytesseract batch scans/ --format tsv --output-dir out/ --workers 8
+    pytesseract batch 'scans/**/*.tif' --jsonl results.jsonl \\
+        --checkpoint done.txt
+
+The files are recognized concurrently by an OCRExecutor. The results are
+streamed in input order, as JSON lines (with the output inline, or its file
+name with --output-dir) and/or as one output file per input. Every finished
+file is appended to the checkpoint file, an interrupted run started again
+with the same checkpoint skips them. With --output-dir, an image whose
+output name is already used by another image fails instead of overwriting
+its outputs. The throughput (pages/s) and the CPU
+utilization of the run are printed at the end.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from base64 import b64encode
+from glob import iglob
+from time import perf_counter
+
+from .executor import available_cpu_count
+from .executor import OCRExecutor
+from .pytesseract import count_pages
+from .pytesseract import image_to_data
+from .pytesseract import image_to_pdf_or_hocr
+from .pytesseract import image_to_string
+from .pytesseract import Output
+from .pytesseract import TesseractError
+from .pytesseract import TesseractNotFoundError
+
+
+IMAGE_EXTENSIONS = {
+    '.bmp',
+    '.gif',
+    '.jp2',
+    '.jpeg',
+    '.jpg',
+    '.pbm',
+    '.pgm',
+    '.png',
+    '.pnm',
+    '.ppm',
+    '.tif',
+    '.tiff',
+    '.webp',
+}
+
+# file extension and function of every output format
+FORMATS = {
+    'hocr': (
+        'hocr',
+        lambda image, **kwargs: image_to_pdf_or_hocr(
+            image,
+            extension='hocr',
+            **kwargs,
+        ),
+    ),
+    'json': (
+        'json',
+        lambda image, **kwargs: image_to_data(
+            image,
+            output_type=Output.DICT,
+            **kwargs,
+        ),
+    ),
+    'pdf': ('pdf', image_to_pdf_or_hocr),
+    'tsv': ('tsv', image_to_data),
+    'txt': ('txt', image_to_string),
+}
+# formats written by tesseract straight to the output files
+STREAMED_FORMATS = {'hocr', 'pdf'}
+
+
+def is_image(filename):
+    return os.path.splitext(filename)[1].lower() in IMAGE_EXTENSIONS
+
+
+def output_name(filename, root=None):
+    """Returns the name of the outputs of the file, relative to its root"""
+    name = os.path.relpath(filename, root or os.curdir)
+    if name.startswith(os.pardir):
+        name = os.path.basename(filename)
+    return os.path.splitext(name)[0]
+
+
+def iter_inputs(sources, manifest=None):
+    """
+    Yields the (filename, output name) of the images of the sources
+    (directories, globs or files) and of the lines of the manifest file
+    """
+    for source in sources:
+        if os.path.isdir(source):
+            for directory, dirnames, filenames in os.walk(source):
+                dirnames.sort()
+                for filename in sorted(filter(is_image, filenames)):
+                    filename = os.path.join(directory, filename)
+                    yield filename, output_name(filename, source)
+        elif any(char in source for char in '*?['):
+            for filename in sorted(iglob(source, recursive=True)):
+                if os.path.isfile(filename):
+                    yield filename, output_name(filename)
+        else:
+            yield source, output_name(source)
+
+    if manifest == '-':
+        yield from iter_manifest(sys.stdin)
+    elif manifest is not None:
+        with open(manifest, encoding='utf-8') as lines:
+            yield from iter_manifest(lines)
+
+
+def iter_manifest(lines):
+    for line in lines:
+        filename = line.strip()
+        if filename:
+            yield filename, output_name(filename)
+
+
+def read_checkpoint(filename):
+    """Returns the absolute paths of the files finished by earlier runs"""
+    try:
+        with open(filename, encoding='utf-8') as f:
+            return {line.rstrip('\n') for line in f if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+def recognize(item, output_format, output_dir=None, **kwargs):
+    """
+    Returns the result record of an input, with its output inline or
+    written in the output directory
+    """
+    filename, name = item
+    extension, func = FORMATS[output_format]
+    record = {'path': filename}
+    output_file = None
+    if output_dir is not None:
+        output_file = os.path.join(output_dir, f'{name}.{extension}')
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        if output_format in STREAMED_FORMATS:
+            # tesseract's own output file is moved there
+            kwargs['output_path'] = output_file
+
+    start = perf_counter()
+    try:
+        output = func(filename, **kwargs)
+    except TesseractNotFoundError:
+        raise
+    except (TesseractError, RuntimeError, OSError, TypeError) as e:
+        record['error'] = f'{type(e).__name__}: {e}'
+        return record
+
+    record['pages'] = count_pages(filename)
+    record['seconds'] = round(perf_counter() - start, 3)
+    if output_file is None:
+        if isinstance(output, bytes):
+            output = b64encode(output).decode('ascii')
+        record['output'] = output
+        return record
+
+    if output_format not in STREAMED_FORMATS:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            if output_format == 'json':
+                json.dump(output, f)
+            else:
+                f.write(output)
+    record['output_file'] = output_file
+    return record
+
+
+def cpu_time():
+    """Returns the CPU time of the process and of its finished children"""
+    times = os.times()
+    return sum(times[:4])
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='pytesseract batch',
+        description='OCR of every image of directories, globs or manifests',
+    )
+    parser.add_argument(
+        'sources',
+        nargs='*',
+        help='image files, directories (recursively) or glob patterns',
+    )
+    parser.add_argument(
+        '--manifest',
+        help='file listing one image per line, - for stdin',
+    )
+    parser.add_argument('-l', '--lang')
+    parser.add_argument('--config', default='')
+    parser.add_argument('--timeout', type=float, default=0)
+    parser.add_argument('--format', choices=sorted(FORMATS), default='txt')
+    parser.add_argument('--workers', type=int, help='default: one per CPU')
+    parser.add_argument('--omp-threads', type=int)
+    parser.add_argument('--output-dir', help='write one output per image')
+    parser.add_argument(
+        '--jsonl',
+        help='append the results as JSON lines, - for stdout (the default '
+        'without --output-dir)',
+    )
+    parser.add_argument(
+        '--checkpoint',
+        help='file of the finished images, skipped when resuming',
+    )
+    args = parser.parse_args(args)
+    if not args.sources and args.manifest is None:
+        parser.error('no images, give sources or --manifest')
+
+    jsonl = args.jsonl or (None if args.output_dir else '-')
+    done = read_checkpoint(args.checkpoint) if args.checkpoint else set()
+    counts = {'files': 0, 'failed': 0, 'skipped': 0, 'pages': 0}
+
+    results = jsonl and (
+        sys.stdout if jsonl == '-' else open(jsonl, 'a', encoding='utf-8')
+    )
+    checkpoint = args.checkpoint and open(
+        args.checkpoint,
+        'a',
+        encoding='utf-8',
+    )
+
+    def report(record):
+        counts['files'] += 1
+        if 'error' in record:
+            counts['failed'] += 1
+            print(f'{record["path"]}: {record["error"]}', file=sys.stderr)
+        else:
+            counts['pages'] += record['pages']
+        if results:
+            results.write(f'{json.dumps(record)}\n')
+            results.flush()
+        if checkpoint and 'error' not in record:
+            checkpoint.write(f'{os.path.abspath(record["path"])}\n')
+            checkpoint.flush()
+
+    # absolute path of the file written to each output name
+    outputs = {}
+
+    def pending():
+        for filename, name in iter_inputs(args.sources, args.manifest):
+            absolute = os.path.abspath(filename)
+            if absolute in done:
+                counts['skipped'] += 1
+                continue
+            if args.output_dir is not None:
+                other = outputs.setdefault(os.path.normcase(name), absolute)
+                if other != absolute:
+                    # the outputs of another file would be overwritten
+                    report(
+                        {
+                            'path': filename,
+                            'error': f'ValueError: output name {name!r} '
+                            f'already used by {other}',
+                        },
+                    )
+                    continue
+            yield filename, name
+
+    start, start_cpu = perf_counter(), cpu_time()
+    try:
+        with OCRExecutor(args.workers, args.omp_threads) as executor:
+            for record in executor.map(
+                recognize,
+                pending(),
+                output_format=args.format,
+                output_dir=args.output_dir,
+                lang=args.lang,
+                config=args.config,
+                timeout=args.timeout,
+            ):
+                report(record)
+    except TesseractNotFoundError as e:
+        print(f'{str(e)}\n', file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print('Interrupted', file=sys.stderr)
+        return 130
+    finally:
+        if results and results is not sys.stdout:
+            results.close()
+        if checkpoint:
+            checkpoint.close()
+        elapsed = perf_counter() - start
+        cpus = available_cpu_count()
+        utilization = (cpu_time() - start_cpu) / (elapsed * cpus or 1)
+        print(
+            f'{counts["files"]} files ({counts["failed"]} failed, '
+            f'{counts["skipped"]} skipped), {counts["pages"]} pages in '
+            f'{elapsed:.1f}s: {counts["pages"] / (elapsed or 1):.2f} pages/s, '
+            f'CPU {utilization:.0%} of {cpus} CPUs',
+            file=sys.stderr,
+        )
+
+    return 1 if counts['failed'] else 0
@@ -0,0 +1,152 @@
+"""
+Detection of blank and near-empty pages, which are answered without running
+tesseract.
+
+The statistics come from a small grayscale copy of the page (decoded at a
+reduced size when the format allows it): the standard deviation of the
+pixels, the ratio of ink pixels (pixels far enough from the background
+level, isolated specks removed) and the number of cells of a coarse grid
+holding ink, a cheap estimate of the number of separate marks. Enable it
+with::
+
+    pytesseract.pytesseract.blank_page_filter = BlankPageFilter()
+
+Skipped pages get the output tesseract gives for a blank page, for the txt,
+tsv and box formats.
+"""
+
+from __future__ import annotations
+
+from threading import Lock
+
+from PIL import Image
+from PIL import ImageFilter
+from PIL import ImageStat
+
+from .pytesseract import open_image
+from .pytesseract import PAGE_SEPARATOR
+from .pytesseract import TSV_HEADER
+
+
+def page_stats(image, size=256, contrast=64, grid=16):
+    """
+    Returns the standard deviation, the ink pixel ratio and the number of
+    grid cells holding ink of the image, or None when it can't be read or
+    has several pages (only tesseract sees them all)
+    """
+    try:
+        if isinstance(image, str):
+            with Image.open(image) as opened:
+                if getattr(opened, 'n_frames', 1) > 1:
+                    return None
+                # JPEG pages are decoded directly at a fraction of their size
+                opened.draft('L', (size, size))
+                small = opened.convert('L')
+        else:
+            image = open_image(image)
+            if getattr(image, 'n_frames', 1) > 1:
+                return None
+            small = image.convert('L')
+    except (OSError, TypeError):
+        return None
+
+    small.thumbnail((size, size), Image.BOX)
+    stddev = ImageStat.Stat(small).stddev[0]
+
+    # the most frequent level is the background, paper or solid frame
+    histogram = small.histogram()
+    background = histogram.index(max(histogram))
+    ink = small.point(
+        [
+            255 if abs(level - background) > contrast else 0
+            for level in range(256)
+        ],
+    ).filter(ImageFilter.MedianFilter(3))
+
+    ink_ratio = ink.histogram()[255] / (ink.width * ink.height)
+    cells = ink.resize(
+        (min(grid, ink.width), min(grid, ink.height)),
+        Image.BOX,
+    )
+    ink_cells = sum(1 for value in cells.tobytes() if value)
+    return stddev, ink_ratio, ink_cells
+
+
+def blank_output(extension, size):
+    """Returns what tesseract outputs for a blank page of the given size"""
+    if extension == 'txt':
+        return PAGE_SEPARATOR.encode()
+    if extension == 'box':
+        return b''
+    if extension == 'tsv':
+        width, height = size
+        page = f'1\t1\t0\t0\t0\t0\t0\t0\t{width}\t{height}\t-1\t'
+        return f'{TSV_HEADER}\n{page}\n'.encode()
+    return None
+
+
+class BlankPageFilter:
+    """
+    Pre-filter answering blank pages without tesseract. A page is blank when
+    its standard deviation is below min_stddev (solid color) or when it has
+    less than max_ink_ratio ink pixels spread over at most max_ink_cells
+    cells (empty backs, separator sheets, scanner dust, punch holes).
+    """
+
+    def __init__(
+        self,
+        min_stddev=2.0,
+        max_ink_ratio=0.001,
+        max_ink_cells=2,
+        size=256,
+        contrast=64,
+    ):
+        self.min_stddev = min_stddev
+        self.max_ink_ratio = max_ink_ratio
+        self.max_ink_cells = max_ink_cells
+        self.size = size
+        self.contrast = contrast
+
+        self.checked = 0
+        self.skipped = 0
+        self._lock = Lock()
+
+    @property
+    def stats(self):
+        return {'checked': self.checked, 'skipped': self.skipped}
+
+    def is_blank(self, image):
+        stats = page_stats(image, self.size, self.contrast)
+        if stats is None:
+            return False
+
+        stddev, ink_ratio, ink_cells = stats
+        return stddev < self.min_stddev or (
+            ink_ratio < self.max_ink_ratio and ink_cells <= self.max_ink_cells
+        )
+
+    def blank_output(self, image, extension):
+        """
+        Returns the output of a blank page when the image is one, or None when
+        it has to go through tesseract
+        """
+        if blank_output(extension, (0, 0)) is None:
+            return None
+
+        blank = self.is_blank(image)
+        with self._lock:
+            self.checked += 1
+            self.skipped += blank
+        if not blank:
+            return None
+
+        if extension == 'tsv':
+            return blank_output(extension, image_size(image))
+        return blank_output(extension, None)
+
+
+def image_size(image):
+    if isinstance(image, str):
+        with Image.open(image) as opened:
+            return opened.size
+    return open_image(image).size
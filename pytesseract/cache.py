@@ -0,0 +1,301 @@
+"""
+Content-addressed cache of tesseract outputs.
+
+Results are keyed by a hash of the image content (file bytes or pixel
+buffer), the lang, the normalized config, the requested output formats,
+the intermediate image format (and the channel order of numpy arrays), the
+settings of the resolution normalizer, blank page filter and engine and the
+tesseract version. They are kept in a bounded in-memory LRU and,
+optionally, in a sharded on-disk directory with size-based eviction.
+Enable it with::
+
+    pytesseract.pytesseract.result_cache = ResultCache(directory='~/.ocr')
+
+and bypass it for a single call with ``cache=False``.
+"""
+
+from __future__ import annotations
+
+import os
+import shlex
+import sys
+from collections import OrderedDict
+from hashlib import blake2b
+from tempfile import NamedTemporaryFile
+from threading import Lock
+
+from PIL import Image
+
+from . import pytesseract
+from .pytesseract import active_profile
+from .pytesseract import get_tesseract_version
+from .pytesseract import is_ndarray
+
+
+READ_CHUNK_SIZE = 1 << 20
+
+
+def image_digest(image):
+    """
+    Returns the hash of the image content, or None for inputs that can't be
+    cached (e.g. list files whose content points to other images)
+    """
+    digest = blake2b(digest_size=16)
+
+    if isinstance(image, str):
+        try:
+            with Image.open(image):
+                pass
+            with open(image, 'rb') as f:
+                for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+        except OSError:
+            return None
+    elif isinstance(image, Image.Image):
+        # the palette and transparency give the colors of P and PA pixels
+        digest.update(
+            f'{image.mode}{image.size}{image.info.get("dpi")}'
+            f'{image.info.get("transparency")}'.encode(),
+        )
+        digest.update(bytes(image.getpalette() or ()))
+        digest.update(image.tobytes())
+    elif is_ndarray(image):
+        # the channel order decides which pixels tesseract gets
+        digest.update(
+            f'{image.dtype.str}{image.shape}'
+            f'{pytesseract.ndarray_channel_order}'.encode(),
+        )
+        digest.update(
+            image.data if image.flags.c_contiguous else image.tobytes()
+        )
+    else:
+        return None
+
+    return digest.hexdigest()
+
+
+def pipeline_settings():
+    """
+    Returns the settings of the stages run before or instead of the tesseract
+    binary (resolution normalizer, blank page filter and engine)
+    """
+    normalizer = pytesseract.resolution_normalizer
+    page_filter = pytesseract.blank_page_filter
+    return [
+        pytesseract.engine,
+        str(
+            normalizer
+            and (
+                normalizer.target_dpi,
+                normalizer.x_height,
+                normalizer.max_scale,
+            )
+        ),
+        str(
+            page_filter
+            and (
+                page_filter.min_stddev,
+                page_filter.max_ink_ratio,
+                page_filter.max_ink_cells,
+                page_filter.size,
+                page_filter.contrast,
+            )
+        ),
+    ]
+
+
+def normalize_config(config):
+    return shlex.split(config, posix=not (sys.platform == 'win32'))
+
+
+class ResultCache:
+    """
+    Two-tier cache of tesseract outputs (bytes). The memory tier keeps at
+    most max_entries results and max_bytes bytes, the disk tier (when a
+    directory is given) at most max_disk_bytes bytes, evicting the least
+    recently used results first.
+    """
+
+    def __init__(
+        self,
+        max_entries=1024,
+        max_bytes=256 << 20,
+        directory=None,
+        max_disk_bytes=1 << 30,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = os.path.expanduser(directory) if directory else None
+        self.max_disk_bytes = max_disk_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self.disk_evictions = 0
+
+        self._lock = Lock()
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            self._disk_bytes = sum(size for _, _, size in self._disk_entries())
+
+    @property
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'disk_hits': self.disk_hits,
+            'disk_evictions': self.disk_evictions,
+            'entries': len(self._memory),
+            'bytes': self._memory_bytes,
+            'disk_bytes': self._disk_bytes,
+        }
+
+    def keys(self, image, lang, config, extensions):
+        """
+        Returns the key of every output format of a tesseract run producing
+        all the extensions at once, or None if the image can't be cached
+        """
+        digest = image_digest(image)
+        if digest is None:
+            return None
+
+        profile = active_profile()
+        run = '\0'.join(
+            [
+                digest,
+                str(get_tesseract_version(cached=True)),
+                lang or '',
+                str(pytesseract.intermediate_format),
+                *pipeline_settings(),
+                *(profile.options if profile else ()),
+                *(profile.config_files if profile else ()),
+                *normalize_config(config),
+                '\1',
+                *extensions,
+            ],
+        )
+        return [
+            blake2b(f'{run}\2{extension}'.encode(), digest_size=20).hexdigest()
+            for extension in extensions
+        ]
+
+    def get(self, key):
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = self._disk_get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._memory_set(key, value)
+        return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._memory_set(key, value)
+        self._disk_set(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self.directory:
+                for path, _, _ in self._disk_entries():
+                    os.remove(path)
+                self._disk_bytes = 0
+
+    def _memory_set(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+
+        old_value = self._memory.pop(key, None)
+        if old_value is not None:
+            self._memory_bytes -= len(old_value)
+        self._memory[key] = value
+        self._memory_bytes += len(value)
+
+        while (
+            len(self._memory) > self.max_entries
+            or self._memory_bytes > self.max_bytes
+        ):
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.evictions += 1
+
+    def _disk_path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def _disk_entries(self):
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.is_file() and not entry.name.startswith('.tmp_'):
+                    stat = entry.stat()
+                    yield entry.path, stat.st_mtime, stat.st_size
+
+    def _disk_get(self, key):
+        if not self.directory:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = f.read()
+            # the modification time orders the eviction
+            os.utime(path)
+        except OSError:
+            return None
+        return value
+
+    def _disk_set(self, key, value):
+        if not self.directory or len(value) > self.max_disk_bytes:
+            return
+
+        path = self._disk_path(key)
+        try:
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = 0
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with NamedTemporaryFile(
+            dir=os.path.dirname(path),
+            prefix='.tmp_',
+            delete=False,
+        ) as f:
+            f.write(value)
+        os.replace(f.name, path)
+
+        with self._lock:
+            self._disk_bytes += len(value) - old_size
+            if self._disk_bytes > self.max_disk_bytes:
+                self._disk_evict()
+
+    def _disk_evict(self):
+        # evict down to 90% of the limit so the directory isn't scanned on
+        # every following write
+        target = self.max_disk_bytes * 9 // 10
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[1])
+        self._disk_bytes = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if self._disk_bytes <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._disk_bytes -= size
+            self.disk_evictions += 1
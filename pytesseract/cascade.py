@@ -0,0 +1,186 @@
+"""
+Confidence-gated cascade of two tesseract profiles.
+
+The page is recognized with a fast profile (tessdata_fast, LSTM only...)
+first. Only the lines holding a word whose confidence is below a threshold
+are recognized again, one crop per line, with a slow and accurate profile
+(tessdata_best...) and their words are replaced in the TSV output when the
+slow profile is at least as confident.
+"""
+
+from __future__ import annotations
+
+from threading import Lock
+
+from .executor import map_images
+from .pytesseract import DEFAULT_ENCODING
+from .pytesseract import open_image
+from .pytesseract import output_config
+from .pytesseract import run_and_get_output
+from .pytesseract import split_table
+from .pytesseract import TSV_HEADER
+
+
+DEFAULT_THRESHOLD = 60
+DEFAULT_PADDING = 4
+
+LINE_LEVEL = '4'
+WORD_LEVEL = '5'
+
+
+def line_key(cells):
+    """Returns the page, block, paragraph and line numbers of a TSV row"""
+    return tuple(cells[1:5])
+
+
+def mean_conf(words):
+    confs = [float(cells[10]) for cells in words]
+    return sum(confs) / len(confs) if confs else -1.0
+
+
+def group_lines(rows):
+    """Returns the line row and the word rows of every line, in order"""
+    lines = {}
+    for cells in rows:
+        if cells[0] == LINE_LEVEL:
+            lines[line_key(cells)] = (cells, [])
+        elif cells[0] == WORD_LEVEL and line_key(cells) in lines:
+            lines[line_key(cells)][1].append(cells)
+    return lines
+
+
+def line_words(tsv, line, crop):
+    """
+    Returns the words of the TSV of a line crop as rows of the line, in page
+    coordinates
+    """
+    _, rows = split_table(tsv, '\t')
+    crop_left, crop_top = crop[:2]
+    words = []
+    for cells in rows:
+        if cells[0] != WORD_LEVEL or not cells[11].strip():
+            continue
+        left, top = int(cells[6]) + crop_left, int(cells[7]) + crop_top
+        words.append(
+            [
+                WORD_LEVEL,
+                *line[1:5],
+                str(len(words) + 1),
+                str(left),
+                str(top),
+                *cells[8:],
+            ],
+        )
+    return words
+
+
+class ConfidenceCascade:
+    """
+    Runs the OCR with fast_config, then the lines holding a word with a
+    confidence below threshold again with best_config. Both configs are
+    added to the config of every call, e.g. '--tessdata-dir /path --oem 1'
+    """
+
+    def __init__(
+        self,
+        fast_config='',
+        best_config='',
+        threshold=DEFAULT_THRESHOLD,
+        padding=DEFAULT_PADDING,
+        workers=None,
+    ):
+        self.fast_config = fast_config
+        self.best_config = best_config
+        self.threshold = threshold
+        self.padding = padding
+        self.workers = workers
+
+        self.lines = 0
+        self.escalated = 0
+        self.replaced = 0
+        self._lock = Lock()
+
+    @property
+    def stats(self):
+        return {
+            'lines': self.lines,
+            'escalated': self.escalated,
+            'replaced': self.replaced,
+        }
+
+    def crop_box(self, line, size):
+        left, top, width, height = map(int, line[6:10])
+        return (
+            max(0, left - self.padding),
+            max(0, top - self.padding),
+            min(size[0], left + width + self.padding),
+            min(size[1], top + height + self.padding),
+        )
+
+    def run(
+        self,
+        image,
+        lang=None,
+        config='',
+        nice=0,
+        timeout=0,
+        return_bytes=False,
+    ):
+        """Returns the TSV output of the cascade on the image"""
+        image = open_image(image)
+        tsv = run_and_get_output(
+            image,
+            'tsv',
+            lang,
+            output_config(['tsv'], f'{self.fast_config} {config}'.strip()),
+            nice,
+            timeout,
+        )
+        _, rows = split_table(tsv, '\t')
+        lines = group_lines(rows)
+        low = [
+            key
+            for key, (_, words) in lines.items()
+            if any(0 <= float(cells[10]) < self.threshold for cells in words)
+        ]
+
+        crops = [self.crop_box(lines[key][0], image.size) for key in low]
+        outputs = map_images(
+            run_and_get_output,
+            (image.crop(crop) for crop in crops),
+            workers=self.workers,
+            extension='tsv',
+            lang=lang,
+            # the line mode comes first, the configuration can override it
+            config=output_config(
+                ['tsv'],
+                f'--psm 7 {self.best_config} {config}'.strip(),
+            ),
+            nice=nice,
+            timeout=timeout,
+        )
+
+        replacements = {}
+        for key, crop, output in zip(low, crops, outputs):
+            line, words = lines[key]
+            best_words = line_words(output, line, crop)
+            if best_words and mean_conf(best_words) >= mean_conf(words):
+                replacements[key] = best_words
+
+        with self._lock:
+            self.lines += len(lines)
+            self.escalated += len(low)
+            self.replaced += len(replacements)
+
+        merged = []
+        for cells in rows:
+            key = line_key(cells)
+            if cells[0] != WORD_LEVEL or key not in replacements:
+                merged.append(cells)
+            elif cells is lines[key][1][0]:
+                merged.extend(replacements[key])
+
+        output = ''.join(
+            f'{row}\n' for row in [TSV_HEADER, *map('\t'.join, merged)]
+        )
+        return output.encode(DEFAULT_ENCODING) if return_bytes else output
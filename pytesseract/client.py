@@ -0,0 +1,264 @@
+"""
+Thin client of the local OCR server (pytesseract.server).
+
+Its image_to_* methods have the signatures of the library functions and
+raise its exceptions::
+
+    client = OCRClient('http://127.0.0.1:8884')
+    text = client.image_to_string('page.png', lang='eng')
+
+The module only imports the standard library, so services sending image
+files don't load Pillow nor the rest of pytesseract. They are imported on
+use for Pillow and numpy images, parsed output types (DICT, NUMPY and
+DATAFRAME) and the exceptions of failed requests.
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+from http.client import HTTPConnection
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8884
+DEFAULT_ENCODING = 'utf-8'
+
+# values of pytesseract.Output returned without parsing
+BYTES = 'bytes'
+STRING = 'string'
+
+
+class QueueFullError(RuntimeError):
+    def __init__(self, message='OCR server queue is full'):
+        super().__init__(message)
+
+
+class UnixHTTPConnection(HTTPConnection):
+    def __init__(self, path, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+def server_error(payload):
+    """Returns the exception the server raised, from its JSON payload"""
+    from . import pytesseract
+
+    message = payload.get('message', '')
+    return {
+        'ALTONotSupported': lambda: pytesseract.ALTONotSupported(),
+        'QueueFullError': lambda: QueueFullError(message),
+        'TSVNotSupported': lambda: pytesseract.TSVNotSupported(),
+        'TesseractError': lambda: pytesseract.TesseractError(
+            payload.get('status'),
+            message,
+        ),
+        'TesseractNotFoundError': lambda: pytesseract.TesseractNotFoundError(
+            payload.get('cmd'),
+        ),
+        'TypeError': lambda: TypeError(message),
+        'ValueError': lambda: ValueError(message),
+    }.get(payload.get('error'), lambda: RuntimeError(message))()
+
+
+def image_bytes(image):
+    """
+    Returns the bytes of the image file, or of the Pillow or numpy image
+    encoded like the library functions do
+    """
+    if isinstance(image, str):
+        with open(image, 'rb') as f:
+            return f.read()
+
+    from .pytesseract import encode
+
+    input_filename, data = encode(image)
+    if data is None:
+        with open(input_filename, 'rb') as f:
+            data = f.read()
+    return data
+
+
+def convert(output, extension, output_type, pandas_config=None):
+    """Converts the raw output like pytesseract.pytesseract.convert_output"""
+    if output_type == BYTES or extension in {'hocr', 'pdf', 'xml'}:
+        return output
+    if output_type == STRING:
+        return output.decode(DEFAULT_ENCODING)
+
+    from .pytesseract import convert_output
+
+    return convert_output(output, extension, output_type, pandas_config)
+
+
+class OCRClient:
+    """
+    Client of an OCRServer, at an http://host:port or unix:/path url. Its
+    methods raise the exceptions of the library functions
+    """
+
+    def __init__(
+        self, url=f'http://{DEFAULT_HOST}:{DEFAULT_PORT}', timeout=None
+    ):
+        self.url = url
+        self.timeout = timeout
+
+    def connection(self):
+        if self.url.startswith('unix:'):
+            return UnixHTTPConnection(self.url[5:], self.timeout)
+        url = urlsplit(self.url)
+        return HTTPConnection(url.hostname, url.port, timeout=self.timeout)
+
+    def request(self, method, route, params=None, body=None):
+        """Returns the response body of the request, raises its errors"""
+        params = {
+            name: value
+            for name, value in (params or {}).items()
+            if value not in (None, '', 0)
+        }
+        path = f'/{route}?{urlencode(params)}' if params else f'/{route}'
+        connection = self.connection()
+        try:
+            connection.request(method, path, body=body)
+            response = connection.getresponse()
+            content = response.read()
+        finally:
+            connection.close()
+
+        if response.status != 200:
+            try:
+                payload = json.loads(content)
+            except ValueError:
+                payload = {'message': content.decode(DEFAULT_ENCODING)}
+            raise server_error(payload)
+        return content
+
+    def run(self, name, image, **params):
+        """Returns the raw output of the function on the server"""
+        return self.request('POST', name, params, image_bytes(image))
+
+    def health(self):
+        return json.loads(self.request('GET', 'health'))
+
+    def get_languages(self, config=''):
+        return json.loads(self.request('GET', 'languages', {'config': config}))
+
+    def get_tesseract_version(self):
+        from packaging.version import Version
+
+        return Version(self.request('GET', 'version').decode())
+
+    def image_to_string(
+        self,
+        image,
+        lang=None,
+        config='',
+        nice=0,
+        output_type=STRING,
+        timeout=0,
+    ):
+        output = self.run(
+            'image_to_string',
+            image,
+            lang=lang,
+            config=config,
+            nice=nice,
+            timeout=timeout,
+        )
+        return convert(output, 'txt', output_type)
+
+    def image_to_boxes(
+        self,
+        image,
+        lang=None,
+        config='',
+        nice=0,
+        output_type=STRING,
+        timeout=0,
+    ):
+        output = self.run(
+            'image_to_boxes',
+            image,
+            lang=lang,
+            config=config,
+            nice=nice,
+            timeout=timeout,
+        )
+        return convert(output, 'box', output_type)
+
+    def image_to_data(
+        self,
+        image,
+        lang=None,
+        config='',
+        nice=0,
+        output_type=STRING,
+        timeout=0,
+        pandas_config=None,
+    ):
+        output = self.run(
+            'image_to_data',
+            image,
+            lang=lang,
+            config=config,
+            nice=nice,
+            timeout=timeout,
+        )
+        return convert(output, 'tsv', output_type, pandas_config)
+
+    def image_to_osd(
+        self,
+        image,
+        lang='osd',
+        config='',
+        nice=0,
+        output_type=STRING,
+        timeout=0,
+    ):
+        output = self.run(
+            'image_to_osd',
+            image,
+            lang=lang,
+            config=config,
+            nice=nice,
+            timeout=timeout,
+        )
+        return convert(output, 'osd', output_type)
+
+    def image_to_pdf_or_hocr(
+        self,
+        image,
+        lang=None,
+        config='',
+        nice=0,
+        extension='pdf',
+        timeout=0,
+    ):
+        return self.run(
+            'image_to_pdf_or_hocr',
+            image,
+            lang=lang,
+            config=config,
+            nice=nice,
+            extension=extension,
+            timeout=timeout,
+        )
+
+    def image_to_alto_xml(
+        self, image, lang=None, config='', nice=0, timeout=0
+    ):
+        return self.run(
+            'image_to_alto_xml',
+            image,
+            lang=lang,
+            config=config,
+            nice=nice,
+            timeout=timeout,
+        )
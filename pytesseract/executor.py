@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .pytesseract import active_profile
+from .pytesseract import call_with_stats
+from .pytesseract import current_stats
+from .pytesseract import set_thread_env
+
+
+CGROUP_V2_CPU_MAX = '/sys/fs/cgroup/cpu.max'
+CGROUP_V1_CPU_QUOTA = '/sys/fs/cgroup/cpu/cpu.cfs_quota_us'
+CGROUP_V1_CPU_PERIOD = '/sys/fs/cgroup/cpu/cpu.cfs_period_us'
+
+
+def _read_cgroup_file(filename):
+    try:
+        with open(filename) as f:
+            return f.read().split()
+    except OSError:
+        return []
+
+
+def cgroup_cpu_limit():
+    """
+    Returns the CPU quota of the current cgroup rounded up to whole CPUs,
+    or None when no quota is set
+    """
+    quota_period = _read_cgroup_file(CGROUP_V2_CPU_MAX)
+    if not quota_period:
+        quota_period = _read_cgroup_file(CGROUP_V1_CPU_QUOTA)
+        quota_period += _read_cgroup_file(CGROUP_V1_CPU_PERIOD)
+
+    try:
+        quota, period = (int(value) for value in quota_period)
+    except ValueError:  # 'max' quota, missing or malformed files
+        return None
+
+    if quota <= 0 or period <= 0:
+        return None
+    return max(1, -(-quota // period))
+
+
+def available_cpu_count():
+    """
+    Returns the number of CPUs the current process may actually use, taking
+    the CPU affinity mask and the cgroup CPU quota into account
+    """
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on Windows and macOS
+        count = os.cpu_count() or 1
+
+    limit = cgroup_cpu_limit()
+    return min(count, limit) if limit else count
+
+
+class OCRExecutor:
+    """
+    Runs pytesseract functions concurrently in a pool of threads. The OCR
+    itself happens in the tesseract child processes, so threads are enough
+    and the images never need to be pickled.
+
+    By default one worker is started per available CPU and every tesseract
+    process is limited to a single OpenMP thread (OMP_THREAD_LIMIT), so the
+    workers and the threads of their children don't oversubscribe the CPUs.
+    """
+
+    def __init__(self, workers=None, omp_threads=None):
+        cpus = available_cpu_count()
+        if workers is None:
+            workers = max(1, cpus // (omp_threads or 1))
+        if omp_threads is None:
+            omp_threads = max(1, cpus // workers)
+
+        self.workers = workers
+        self.omp_threads = omp_threads
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix='pytesseract',
+            initializer=set_thread_env,
+            initargs=({'OMP_THREAD_LIMIT': str(omp_threads)},),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def submit(self, func, *args, **kwargs):
+        stats = current_stats()
+        if stats is not None:
+            # the calls of the workers add to the OCRStats of the caller,
+            # which alone passes them to stats_hook
+            func, args = call_with_stats, (stats, func, *args)
+        profile = active_profile()
+        if profile is not None:
+            # the workers run with the TesseractProfile of the caller
+            return self._pool.submit(profile.call, func, *args, **kwargs)
+        return self._pool.submit(func, *args, **kwargs)
+
+    def map(self, func, images, **kwargs):
+        """
+        Yields func(image, **kwargs) for every image, in input order and as
+        soon as each result is ready. At most twice the number of workers
+        images are queued at a time, so images can be a lazy iterable.
+        """
+        pending = deque()
+        try:
+            for image in images:
+                pending.append(self.submit(func, image, **kwargs))
+                if len(pending) >= 2 * self.workers:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def map_images(func, images, workers=None, omp_threads=None, **kwargs):
+    """
+    Yields func(image, **kwargs) for every image in input order, running
+    them concurrently in an OCRExecutor
+    """
+    with OCRExecutor(workers, omp_threads) as executor:
+        yield from executor.map(func, images, **kwargs)
@@ -0,0 +1,365 @@
+"""
+In-process OCR engine binding the C API of the system libtesseract with
+ctypes.
+
+Every thread keeps one initialized TessBaseAPI handle per (tessdata dir,
+lang, oem, config files, variables), so the traineddata is loaded once and
+reused by the following calls. Enable it with::
+
+    pytesseract.pytesseract.engine = 'libtesseract'
+
+Only txt, tsv and box outputs of single page images are produced in-process,
+everything else (and any call when the library can't be loaded) goes
+through the tesseract binary as usual.
+"""
+
+from __future__ import annotations
+
+import ctypes.util
+import shlex
+import sys
+from threading import local
+
+from packaging.version import InvalidVersion
+from packaging.version import parse
+from PIL import Image
+
+from .pytesseract import is_ndarray
+from .pytesseract import ndarray_pixels
+from .pytesseract import PAGE_SEPARATOR
+from .pytesseract import prepare
+from .pytesseract import run_once
+from .pytesseract import TesseractError
+from .pytesseract import TSV_HEADER
+
+
+# explicit path of the libtesseract shared library, found automatically
+# when not set
+library_path = None
+
+LIBRARY_NAMES = (
+    'libtesseract.so.5',
+    'libtesseract.so.4',
+    'libtesseract.5.dylib',
+    'libtesseract.dylib',
+    'libtesseract-5.dll',
+)
+
+# older versions refuse to run under the locale Python sets at startup
+LIBTESSERACT_MIN_VERSION = parse('4.1')
+
+SUPPORTED_EXTENSIONS = {'box', 'tsv', 'txt'}
+
+DEFAULT_LANG = 'eng'
+DEFAULT_OEM = 3  # OEM_DEFAULT
+DEFAULT_PSM = 3  # PSM_AUTO, the tesseract command line default
+
+_thread_local = local()
+
+
+def _declare(lib):
+    c_char_pp = ctypes.POINTER(ctypes.c_char_p)
+    handle = ctypes.c_void_p
+    signatures = {
+        'TessVersion': (ctypes.c_char_p, []),
+        'TessBaseAPICreate': (handle, []),
+        'TessBaseAPIDelete': (None, [handle]),
+        'TessBaseAPIEnd': (None, [handle]),
+        'TessBaseAPIClear': (None, [handle]),
+        'TessBaseAPIInit4': (
+            ctypes.c_int,
+            [
+                handle,
+                ctypes.c_char_p,
+                ctypes.c_char_p,
+                ctypes.c_int,
+                c_char_pp,
+                ctypes.c_int,
+                c_char_pp,
+                c_char_pp,
+                ctypes.c_size_t,
+                ctypes.c_int,
+            ],
+        ),
+        'TessBaseAPISetPageSegMode': (None, [handle, ctypes.c_int]),
+        'TessBaseAPISetImage': (
+            None,
+            [
+                handle,
+                ctypes.c_void_p,
+                ctypes.c_int,
+                ctypes.c_int,
+                ctypes.c_int,
+                ctypes.c_int,
+            ],
+        ),
+        'TessBaseAPISetSourceResolution': (None, [handle, ctypes.c_int]),
+        'TessBaseAPIRecognize': (ctypes.c_int, [handle, ctypes.c_void_p]),
+        'TessBaseAPIGetUTF8Text': (ctypes.c_void_p, [handle]),
+        'TessBaseAPIGetTSVText': (ctypes.c_void_p, [handle, ctypes.c_int]),
+        'TessBaseAPIGetBoxText': (ctypes.c_void_p, [handle, ctypes.c_int]),
+        'TessDeleteText': (None, [ctypes.c_void_p]),
+        'TessMonitorCreate': (ctypes.c_void_p, []),
+        'TessMonitorDelete': (None, [ctypes.c_void_p]),
+        'TessMonitorSetDeadlineMSecs': (None, [ctypes.c_void_p, ctypes.c_int]),
+    }
+    for name, (restype, argtypes) in signatures.items():
+        func = getattr(lib, name)
+        func.restype = restype
+        func.argtypes = argtypes
+
+
+@run_once
+def load_library():
+    """
+    Returns the loaded libtesseract, or None when it is missing or too old
+    """
+    if library_path:
+        names = (library_path,)
+    else:
+        names = (ctypes.util.find_library('tesseract'),) + LIBRARY_NAMES
+
+    for name in filter(None, names):
+        try:
+            lib = ctypes.CDLL(name)
+            _declare(lib)
+        except (OSError, AttributeError):
+            continue
+
+        try:
+            version = parse(lib.TessVersion().decode().partition('-')[0])
+        except InvalidVersion:
+            continue
+        if version >= LIBTESSERACT_MIN_VERSION:
+            return lib
+
+    return None
+
+
+def parse_config(config):
+    """
+    Splits a pytesseract config string into the engine options, or returns
+    None when it uses options only the command line tool understands
+    """
+    options = {
+        'tessdata_dir': None,
+        'oem': DEFAULT_OEM,
+        'psm': DEFAULT_PSM,
+        'dpi': None,
+        'configs': [],
+        'variables': {},
+    }
+    tokens = iter(shlex.split(config, posix=not (sys.platform == 'win32')))
+    for token in tokens:
+        try:
+            if token == '--tessdata-dir':
+                options['tessdata_dir'] = next(tokens)
+            elif token in {'--oem', '--psm', '--dpi'}:
+                options[token[2:]] = int(next(tokens))
+            elif token == '-c':
+                name, _, value = next(tokens).partition('=')
+                # the renderers aren't used, keep them out of the handle key
+                if not name.startswith('tessedit_create_'):
+                    options['variables'][name] = value
+            elif token in {'--user-words', '--user-patterns'}:
+                name = f'{token[2:].replace("-", "_")}_file'
+                options['variables'][name] = next(tokens)
+            elif token.startswith('-'):
+                return None
+            else:
+                options['configs'].append(token)
+        except (StopIteration, ValueError):
+            return None
+
+    return options
+
+
+def image_buffer(image):
+    """
+    Returns the 8 bit gray or RGB pixel buffer of the image and its layout,
+    or None when it isn't a single page 8 bit image Pillow can read
+    """
+    if isinstance(image, str):
+        try:
+            with Image.open(image) as opened:
+                if getattr(opened, 'n_frames', 1) > 1:
+                    return None
+                opened.load()
+                return image_buffer(opened)
+        except OSError:
+            return None
+
+    if is_ndarray(image):
+        pixels = ndarray_pixels(image)
+        if pixels is not None:
+            # numpy pixels are used in place, without a copy
+            height, width = pixels.shape[:2]
+            bytes_per_pixel = 1 if pixels.ndim == 2 else 3
+            return pixels, width, height, bytes_per_pixel, None
+
+    try:
+        image, _ = prepare(image)
+    except TypeError:
+        return None
+
+    if image.mode.startswith('I'):
+        # Pillow clips 16 and 32 bit pixels to 8 bits where leptonica scales
+        # them down, they go through the tesseract binary instead
+        return None
+    if image.mode not in {'L', 'RGB'}:
+        image = image.convert('L' if image.mode in {'1', 'F'} else 'RGB')
+
+    bytes_per_pixel = len(image.getbands())
+    dpi = image.info.get('dpi')
+    return (
+        image.tobytes(),
+        image.width,
+        image.height,
+        bytes_per_pixel,
+        int(dpi[0]) if dpi else None,
+    )
+
+
+class TessBaseAPI:
+    """Initialized libtesseract handle, ended when garbage collected."""
+
+    def __init__(self, lib, tessdata_dir, lang, oem, configs, variables):
+        self._lib = lib
+        self._handle = lib.TessBaseAPICreate()
+
+        def c_array(values):
+            return (ctypes.c_char_p * len(values))(
+                *(value.encode() for value in values),
+            )
+
+        result = lib.TessBaseAPIInit4(
+            self._handle,
+            tessdata_dir.encode() if tessdata_dir else None,
+            lang.encode(),
+            oem,
+            c_array(configs),
+            len(configs),
+            c_array(list(variables)),
+            c_array(list(variables.values())),
+            len(variables),
+            0,
+        )
+        if result:
+            self.delete()
+            raise TesseractError(
+                result,
+                f'Failed loading language {lang!r}',
+            )
+
+    def __del__(self):
+        self.delete()
+
+    def delete(self):
+        if self._handle:
+            self._lib.TessBaseAPIEnd(self._handle)
+            self._lib.TessBaseAPIDelete(self._handle)
+            self._handle = None
+
+    def _get_text(self, func, *args):
+        pointer = func(self._handle, *args)
+        try:
+            return ctypes.string_at(pointer) if pointer else b''
+        finally:
+            self._lib.TessDeleteText(pointer)
+
+    def recognize(self, pixels, extension, psm, dpi, page_separator, timeout):
+        lib = self._lib
+        data, width, height, bytes_per_pixel, image_dpi = pixels
+        if not isinstance(data, bytes):
+            data = data.ctypes.data_as(ctypes.c_void_p)
+        lib.TessBaseAPISetPageSegMode(self._handle, psm)
+        lib.TessBaseAPISetImage(
+            self._handle,
+            data,
+            width,
+            height,
+            bytes_per_pixel,
+            width * bytes_per_pixel,
+        )
+        if dpi or image_dpi:
+            lib.TessBaseAPISetSourceResolution(self._handle, dpi or image_dpi)
+
+        monitor = lib.TessMonitorCreate()
+        try:
+            if timeout:
+                lib.TessMonitorSetDeadlineMSecs(monitor, int(timeout * 1000))
+            if lib.TessBaseAPIRecognize(self._handle, monitor):
+                if timeout:
+                    raise RuntimeError('Tesseract process timeout')
+                raise TesseractError(-1, 'Recognition failed')
+
+            if extension == 'tsv':
+                output = f'{TSV_HEADER}\n'.encode() + self._get_text(
+                    lib.TessBaseAPIGetTSVText,
+                    0,
+                )
+            elif extension == 'box':
+                output = self._get_text(lib.TessBaseAPIGetBoxText, 0)
+            else:
+                output = self._get_text(lib.TessBaseAPIGetUTF8Text)
+                output += page_separator.encode()
+            return output
+        finally:
+            lib.TessMonitorDelete(monitor)
+            lib.TessBaseAPIClear(self._handle)
+
+
+def get_api(lib, tessdata_dir, lang, oem, configs, variables):
+    """Returns the handle of the current thread for these settings."""
+    apis = getattr(_thread_local, 'apis', None)
+    if apis is None:
+        apis = _thread_local.apis = {}
+
+    key = (tessdata_dir, lang, oem, tuple(configs), tuple(variables.items()))
+    api = apis.get(key)
+    if api is None:
+        api = apis[key] = TessBaseAPI(
+            lib,
+            tessdata_dir,
+            lang,
+            oem,
+            configs,
+            variables,
+        )
+    return api
+
+
+def run_and_get_output(image, extension, lang=None, config='', timeout=0):
+    """
+    Returns the output bytes of an in-process OCR run, or None when the call
+    has to go through the tesseract binary
+    """
+    lib = load_library(cached=True)
+    if lib is None or extension not in SUPPORTED_EXTENSIONS:
+        return None
+
+    options = parse_config(config)
+    if options is None:
+        return None
+
+    pixels = image_buffer(image)
+    if pixels is None:
+        return None
+
+    variables = options['variables']
+    api = get_api(
+        lib,
+        options['tessdata_dir'],
+        lang or DEFAULT_LANG,
+        options['oem'],
+        options['configs'],
+        variables,
+    )
+    return api.recognize(
+        pixels,
+        extension,
+        options['psm'],
+        options['dpi'],
+        variables.get('page_separator', PAGE_SEPARATOR),
+        timeout,
+    )
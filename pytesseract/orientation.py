@@ -0,0 +1,137 @@
+"""
+Orientation and script detection (OSD) driven OCR.
+
+A cheap --psm 0 run detects the orientation and the script of a page: the
+page is rotated in memory and recognized with the languages of its script
+only, instead of a long list of languages covering every document. An
+OrientationRouter shared by the pages of a document stops running the OSD
+once the decision has been the same for a few pages in a row.
+"""
+
+from __future__ import annotations
+
+from threading import Lock
+
+from PIL import Image
+
+from .pytesseract import image_to_osd
+from .pytesseract import open_image
+from .pytesseract import Output
+from .pytesseract import TesseractError
+
+# languages of the scripts detected by the OSD
+SCRIPT_LANGUAGES = {
+    'Arabic': 'ara',
+    'Armenian': 'hye',
+    'Bengali': 'ben',
+    'Cyrillic': 'rus',
+    'Devanagari': 'hin',
+    'Georgian': 'kat',
+    'Greek': 'ell',
+    'Gujarati': 'guj',
+    'Gurmukhi': 'pan',
+    'Han': 'chi_sim',
+    'HanS': 'chi_sim',
+    'HanT': 'chi_tra',
+    'Hangul': 'kor',
+    'Hebrew': 'heb',
+    'Japanese': 'jpn',
+    'Kannada': 'kan',
+    'Khmer': 'khm',
+    'Korean': 'kor',
+    'Latin': 'eng',
+    'Malayalam': 'mal',
+    'Tamil': 'tam',
+    'Telugu': 'tel',
+    'Thai': 'tha',
+}
+
+# clockwise rotations of the OSD as counterclockwise Pillow transpositions
+ROTATIONS = {
+    90: Image.ROTATE_270,
+    180: Image.ROTATE_180,
+    270: Image.ROTATE_90,
+}
+
+
+class OrientationRouter:
+    """
+    Rotation and languages of the pages of a document, from their OSD. The
+    OSD isn't run anymore once stable_pages pages in a row got the same
+    decision. Detections below min_confidence are ignored
+    """
+
+    def __init__(
+        self,
+        script_routing=None,
+        stable_pages=3,
+        min_confidence=1.0,
+        config='',
+        nice=0,
+        timeout=0,
+    ):
+        self.script_routing = (
+            SCRIPT_LANGUAGES if script_routing is True else script_routing
+        )
+        self.stable_pages = stable_pages
+        self.min_confidence = min_confidence
+        self.config = config
+        self.nice = nice
+        self.timeout = timeout
+
+        self.decision = None
+        self.streak = 0
+        self.osd_runs = 0
+        self._lock = Lock()
+
+    @property
+    def stable(self):
+        return self.stable_pages and self.streak >= self.stable_pages
+
+    def detect(self, image):
+        """Returns the clockwise rotation and the script of the image"""
+        try:
+            osd = image_to_osd(
+                image,
+                config=self.config,
+                nice=self.nice,
+                output_type=Output.DICT,
+                timeout=self.timeout,
+            )
+        except TesseractError:
+            # too few characters to decide
+            return 0, None
+
+        rotate = osd.get('rotate', 0)
+        if osd.get('orientation_conf', 0) < self.min_confidence:
+            rotate = 0
+        script = osd.get('script')
+        if osd.get('script_conf', 0) < self.min_confidence:
+            script = None
+        return rotate, script
+
+    def decide(self, image):
+        """Returns the clockwise rotation and the script of the next page"""
+        with self._lock:
+            if self.stable:
+                return self.decision
+
+        decision = self.detect(image)
+        with self._lock:
+            self.osd_runs += 1
+            self.streak = self.streak + 1 if decision == self.decision else 1
+            self.decision = decision
+        return decision
+
+    def languages(self, script, lang=None):
+        """Returns the languages of the script, lang when it isn't routed"""
+        if not self.script_routing or script not in self.script_routing:
+            return lang
+        return self.script_routing[script]
+
+    def route(self, image, lang=None, rotate=True):
+        """Returns the image, rotated if asked, and the languages to use"""
+        degrees, script = self.decide(image)
+        if rotate and degrees in ROTATIONS:
+            image = open_image(image).transpose(ROTATIONS[degrees])
+        return image, self.languages(script, lang)
@@ -0,0 +1,191 @@
+"""
+Reusable OCR profiles.
+
+A TesseractProfile holds everything a tesseract run is configured with: the
+binary, the languages, the page segmentation and engine modes, the tessdata
+directory, the -c variables, nice and timeout. It is validated and turned
+into command line arguments once, then every call reuses them::
+
+    fast = TesseractProfile(lang='eng', psm=6, tessdata_dir='tessdata_fast')
+    text = fast.image_to_string('page.png')
+
+The profile is bound to the calling thread only while its calls run, so
+profiles with different binaries or tessdata directories can be used
+concurrently without touching the tesseract_cmd module global.
+"""
+
+from __future__ import annotations
+
+import re
+from contextlib import contextmanager
+from os import path
+from shutil import which
+
+from .pytesseract import active_profile
+from .pytesseract import config_file_index
+from .pytesseract import current_tesseract_cmd
+from .pytesseract import get_languages
+from .pytesseract import get_tesseract_version
+from .pytesseract import image_to_alto_xml
+from .pytesseract import image_to_boxes
+from .pytesseract import image_to_data
+from .pytesseract import image_to_osd
+from .pytesseract import image_to_outputs
+from .pytesseract import image_to_pdf_or_hocr
+from .pytesseract import image_to_string
+from .pytesseract import run_and_get_output
+from .pytesseract import set_thread_profile
+from .pytesseract import split_config
+from .pytesseract import TesseractNotFoundError
+
+
+PSM_VALUES = range(14)
+OEM_VALUES = range(4)
+VARIABLE_NAME = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+
+class TesseractProfile:
+    """
+    Validated tesseract configuration with its prebuilt arguments. With
+    validate, the languages are checked against the installed ones when the
+    profile is created instead of when tesseract fails
+    """
+
+    def __init__(
+        self,
+        cmd=None,
+        lang=None,
+        psm=None,
+        oem=None,
+        tessdata_dir=None,
+        variables=None,
+        config='',
+        nice=0,
+        timeout=0,
+        validate=True,
+    ):
+        cmd = cmd or current_tesseract_cmd()
+        resolved = which(cmd)
+        if resolved is None:
+            raise TesseractNotFoundError(cmd)
+        if psm is not None and psm not in PSM_VALUES:
+            raise ValueError(f'Invalid page segmentation mode: {psm}')
+        if oem is not None and oem not in OEM_VALUES:
+            raise ValueError(f'Invalid OCR engine mode: {oem}')
+        if tessdata_dir is not None and not path.isdir(tessdata_dir):
+            raise ValueError(f'No tessdata directory: {tessdata_dir}')
+
+        variables = dict(variables or {})
+        for name in variables:
+            if not VARIABLE_NAME.fullmatch(name):
+                raise ValueError(f'Invalid tesseract variable: {name!r}')
+
+        self.cmd = path.abspath(resolved)
+        self.lang = lang
+        self.psm = psm
+        self.oem = oem
+        self.tessdata_dir = tessdata_dir
+        self.variables = variables
+        self.config = config
+        self.nice = nice
+        self.timeout = timeout
+
+        self.tessdata_options = (
+            ('--tessdata-dir', tessdata_dir) if tessdata_dir else ()
+        )
+        options = list(self.tessdata_options)
+        if psm is not None:
+            options += ('--psm', str(psm))
+        if oem is not None:
+            options += ('--oem', str(oem))
+        for name, value in variables.items():
+            options += ('-c', f'{name}={value}')
+        tokens = split_config(config) if config else ()
+        index = config_file_index(tokens)
+        options += tokens[:index]
+        self.options = tuple(options)
+        # passed after the options of every call
+        self.config_files = tokens[index:]
+
+        if validate:
+            self.validate()
+
+    def __repr__(self):
+        return (
+            f'{type(self).__name__}(cmd={self.cmd!r}, lang={self.lang!r},'
+            f' options={self.options!r})'
+        )
+
+    def validate(self):
+        """Raises ValueError when a language is not installed"""
+        if not self.lang:
+            return
+        installed = set(self.get_languages(cached=True))
+        missing = [
+            lang for lang in self.lang.split('+') if lang not in installed
+        ]
+        if missing:
+            raise ValueError(
+                f'Languages not installed for {self.cmd}: '
+                f'{"+".join(missing)}',
+            )
+
+    @contextmanager
+    def active(self):
+        """Runs the pytesseract calls of the current thread with the profile"""
+        previous = active_profile()
+        set_thread_profile(self)
+        try:
+            yield self
+        finally:
+            set_thread_profile(previous)
+
+    def call(self, func, *args, **kwargs):
+        """Returns func(*args, **kwargs) run with the profile"""
+        with self.active():
+            return func(*args, **kwargs)
+
+    def _ocr(self, func, image, lang=None, nice=None, timeout=None, **kwargs):
+        return self.call(
+            func,
+            image,
+            lang=self.lang if lang is None else lang,
+            nice=self.nice if nice is None else nice,
+            timeout=self.timeout if timeout is None else timeout,
+            **kwargs,
+        )
+
+    def get_languages(self, cached=False):
+        return self.call(get_languages, cached=cached)
+
+    def get_tesseract_version(self, cached=True):
+        return self.call(get_tesseract_version, cached=cached)
+
+    def image_to_string(self, image, **kwargs):
+        return self._ocr(image_to_string, image, **kwargs)
+
+    def image_to_boxes(self, image, **kwargs):
+        return self._ocr(image_to_boxes, image, **kwargs)
+
+    def image_to_data(self, image, **kwargs):
+        return self._ocr(image_to_data, image, **kwargs)
+
+    def image_to_osd(self, image, lang='osd', **kwargs):
+        return self._ocr(image_to_osd, image, lang=lang, **kwargs)
+
+    def image_to_pdf_or_hocr(self, image, **kwargs):
+        return self._ocr(image_to_pdf_or_hocr, image, **kwargs)
+
+    def image_to_alto_xml(self, image, **kwargs):
+        return self._ocr(image_to_alto_xml, image, **kwargs)
+
+    def image_to_outputs(self, image, **kwargs):
+        return self._ocr(image_to_outputs, image, **kwargs)
+
+    def run_and_get_output(self, image, extension='txt', **kwargs):
+        return self._ocr(
+            run_and_get_output,
+            image,
+            extension=extension,
+            **kwargs,
+        )
@@ -1,7 +1,10 @@
 #!/usr/bin/env python
 from __future__ import annotations
 
+import json
 import logging
+import mmap
+import os
 import re
 import shlex
 import string
@@ -10,17 +13,37 @@ import sys
 from contextlib import contextmanager
 from csv import QUOTE_NONE
 from errno import ENOENT
+from errno import EXDEV
+from functools import lru_cache
 from functools import wraps
 from glob import iglob
+from hashlib import blake2b
+from importlib.util import find_spec
 from io import BytesIO
+from itertools import accumulate
 from os import environ
 from os import extsep
 from os import linesep
+from os import makedirs
 from os import remove
+from os import replace
+from os import stat
+from os.path import abspath
+from os.path import expanduser
+from os.path import join
 from os.path import normcase
 from os.path import normpath
 from os.path import realpath
+from shutil import copyfile
+from shutil import copyfileobj
+from shutil import which
 from tempfile import NamedTemporaryFile
+from tempfile import TemporaryFile
+from threading import local
+from threading import Lock
+from threading import Thread
+from threading import Timer
+from time import perf_counter
 from time import sleep
 
 from packaging.version import InvalidVersion
@@ -30,22 +53,48 @@ from PIL import Image
 
 
 tesseract_cmd = 'tesseract'
+# pass images on stdin and read results from stdout instead of going through
+# temporary files, for the output formats that can be streamed
+use_pipes = False
+# 'libtesseract' runs the OCR in-process through pytesseract.libtesseract
+# where possible instead of starting the tesseract binary for every call.
+# Calls made with a pytesseract.profile.TesseractProfile always start the
+# binary of the profile
+engine = 'subprocess'
+# pytesseract.cache.ResultCache consulted before running tesseract, if set
+result_cache = None
+# pytesseract.blank.BlankPageFilter answering blank pages without running
+# tesseract, if set
+blank_page_filter = None
+# pytesseract.resolution.ResolutionNormalizer downscaling oversize images
+# before running tesseract, if set
+resolution_normalizer = None
+# format of the in-memory images handed to tesseract, one of the fast
+# lossless INTERMEDIATE_FORMATS or None to keep the image format (PNG when
+# unknown) like older versions did
+intermediate_format = 'PNM'
+# channel order of 3/4 channel numpy arrays, 'BGR' for OpenCV images
+ndarray_channel_order = 'RGB'
+# callable receiving the OCRStats of every image_to_* call, for instance a
+# pytesseract.stats.StatsAggregator
+stats_hook = None
+# directory where the capabilities of the tesseract binaries (version,
+# languages) are kept across processes, in memory only if None
+capability_cache_dir = environ.get('PYTESSERACT_CAPABILITY_CACHE')
+
+# numpy and pandas are only imported when an array or a DataFrame output
+# shows up, importing them upfront would slow down every import pytesseract
+numpy_installed = find_spec('numpy') is not None
+pandas_installed = find_spec('pandas') is not None
 
-try:
-    from numpy import ndarray
-
-    numpy_installed = True
-except ModuleNotFoundError:
-    numpy_installed = False
-
-try:
-    import pandas as pd
+LOGGER = logging.getLogger('pytesseract')
 
-    pandas_installed = True
-except ModuleNotFoundError:
-    pandas_installed = False
+# per thread state, e.g. the environment overrides of the tesseract processes
+_thread_local = local()
 
-LOGGER = logging.getLogger('pytesseract')
+# capabilities of the tesseract binaries, see capability_cache
+_capabilities = {}
+_capabilities_lock = Lock()
 
 DEFAULT_ENCODING = 'utf-8'
 LANG_PATTERN = re.compile('^[a-z0-9_]+$')
@@ -72,6 +121,19 @@ OSD_KEYS = {
     'Script confidence': ('script_conf', float),
 }
 
+# tesseract options followed by a value
+OPTIONS_WITH_VALUE = {
+    '-c',
+    '-l',
+    '--dpi',
+    '--loglevel',
+    '--oem',
+    '--psm',
+    '--tessdata-dir',
+    '--user-patterns',
+    '--user-words',
+}
+
 EXTENTION_TO_CONFIG = {
     'box': 'tessedit_create_boxfile=1 batch.nochop makebox',
     'xml': 'tessedit_create_alto=1',
@@ -79,6 +141,27 @@ EXTENTION_TO_CONFIG = {
     'tsv': 'tessedit_create_tsv=1',
 }
 
+# Pillow format, storable modes and save options of the intermediate formats
+INTERMEDIATE_FORMATS = {
+    'BMP': ('BMP', {'1', 'L', 'P', 'RGB'}, {}),
+    'PNG': ('PNG', {'1', 'L', 'P', 'RGB'}, {'compress_level': 0}),
+    'PNM': ('PPM', {'1', 'L', 'RGB'}, {}),
+    'TIFF': ('TIFF', {'1', 'L', 'P', 'RGB'}, {'compression': 'raw'}),
+}
+
+# output formats tesseract can write to stdout on their own
+STREAMABLE_EXTENSIONS = {'box', 'hocr', 'tsv', 'txt'}
+
+# tesseract ends every page of the txt output with this separator
+PAGE_SEPARATOR = '\f'
+TSV_HEADER = (
+    'level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\t'
+    'left\ttop\twidth\theight\tconf\ttext'
+)
+# formats image_to_outputs can produce from a single tesseract run
+OUTPUT_EXTENSIONS = ('txt', 'tsv', 'box', 'hocr', 'pdf', 'xml')
+STREAM_READ_SIZE = 1 << 16
+
 TESSERACT_MIN_VERSION = Version('3.05')
 TESSERACT_ALTO_VERSION = Version('4.1.0')
 
@@ -87,9 +170,24 @@ class Output:
     BYTES = 'bytes'
     DATAFRAME = 'data.frame'
     DICT = 'dict'
+    NUMPY = 'numpy'
     STRING = 'string'
 
 
+# output types the outputs of the extensions are parsed into, besides bytes
+# and strings (hocr, pdf and xml are always bytes)
+PARSED_OUTPUT_TYPES = {
+    'box': {Output.DICT, Output.NUMPY},
+    'tsv': {Output.DATAFRAME, Output.DICT, Output.NUMPY},
+    'txt': {Output.DICT},
+}
+
+
+class NumpyNotSupported(EnvironmentError):
+    def __init__(self):
+        super().__init__('Missing numpy package')
+
+
 class PandasNotSupported(EnvironmentError):
     def __init__(self):
         super().__init__('Missing pandas package')
@@ -103,10 +201,10 @@ class TesseractError(RuntimeError):
 
 
 class TesseractNotFoundError(EnvironmentError):
-    def __init__(self):
+    def __init__(self, cmd=None):
         super().__init__(
-            f"{tesseract_cmd} is not installed or it's not in your PATH."
-            f' See README file for more information.',
+            f"{cmd or current_tesseract_cmd()} is not installed or it's not"
+            f' in your PATH. See README file for more information.',
         )
 
 
@@ -138,15 +236,15 @@ def kill(process, code):
 
 
 @contextmanager
-def timeout_manager(proc, seconds=None):
+def timeout_manager(proc, seconds=None, input=None):
     try:
         if not seconds:
-            yield proc.communicate()[1]
+            yield proc.communicate(input)
             return
 
         try:
-            _, error_string = proc.communicate(timeout=seconds)
-            yield error_string
+            output, error_string = proc.communicate(input, timeout=seconds)
+            yield output, error_string
         except subprocess.TimeoutExpired:
             kill(proc, -1)
             raise RuntimeError('Tesseract process timeout')
@@ -156,6 +254,205 @@ def timeout_manager(proc, seconds=None):
         proc.stderr.close()
 
 
+class OCRStats:
+    """
+    Wall time in seconds of the stages of an OCR call (prepare, encode,
+    spawn, wait, read, parse and total), CPU times in seconds and peak
+    memory in bytes of the tesseract processes, input pixels and output
+    bytes. The calls run by the OCRExecutor workers of a call add to its
+    stats, possibly concurrently
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.stages = {}
+        self.user_time = 0.0
+        self.system_time = 0.0
+        self.max_rss = 0
+        self.processes = 0
+        self.pixels = 0
+        self.output_bytes = 0
+        self.failed = False
+
+    def add(self, name, value):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    def add_time(self, stage, seconds):
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def add_rusage(self, rusage):
+        # kilobytes everywhere but on macOS
+        scale = 1 if sys.platform == 'darwin' else 1024
+        with self._lock:
+            self.processes += 1
+            self.user_time += rusage.ru_utime
+            self.system_time += rusage.ru_stime
+            self.max_rss = max(self.max_rss, rusage.ru_maxrss * scale)
+
+    def as_dict(self):
+        return {
+            **{f'{stage}_time': value for stage, value in self.stages.items()},
+            'user_time': self.user_time,
+            'system_time': self.system_time,
+            'max_rss': self.max_rss,
+            'processes': self.processes,
+            'pixels': self.pixels,
+            'output_bytes': self.output_bytes,
+            'failed': self.failed,
+        }
+
+
+def current_stats():
+    """Returns the OCRStats recorded by the current thread, if any"""
+    return getattr(_thread_local, 'stats', None)
+
+
+def call_with_stats(stats, func, *args, **kwargs):
+    """Returns func(*args, **kwargs), its calls recorded into the stats"""
+    previous = current_stats()
+    _thread_local.stats = stats
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _thread_local.stats = previous
+
+
+@contextmanager
+def measure(stage):
+    stats = current_stats()
+    if stats is None:
+        yield
+        return
+
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        stats.add_time(stage, perf_counter() - start)
+
+
+def measured(stage):
+    """Adds the wall time of the function calls to the stage"""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with measure(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def instrumented(func):
+    """
+    Records the OCRStats of the calls into their stats argument and/or
+    passes them to stats_hook. Nested calls add to the outer ones
+    """
+
+    @wraps(func)
+    def wrapper(*args, stats=None, **kwargs):
+        if (stats is None and stats_hook is None) or current_stats():
+            return func(*args, **kwargs)
+
+        stats = OCRStats() if stats is None else stats
+        _thread_local.stats = stats
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            stats.failed = True
+            raise
+        finally:
+            _thread_local.stats = None
+            stats.add_time('total', perf_counter() - start)
+            if stats_hook is not None:
+                stats_hook(stats)
+
+    return wrapper
+
+
+def count_pixels(image):
+    """Adds the pixels of the input image to the current stats"""
+    stats = current_stats()
+    if stats is None:
+        return
+
+    if isinstance(image, str):
+        try:
+            with Image.open(image) as opened:
+                width, height = opened.size
+        except OSError:
+            return
+    elif is_ndarray(image):
+        height, width = image.shape[:2]
+    else:
+        width, height = getattr(image, 'size', (0, 0))
+    stats.add('pixels', width * height)
+
+
+def count_output(output):
+    stats = current_stats()
+    if stats is not None and output is not None:
+        stats.add('output_bytes', len(output))
+
+
+def read_pipe(pipe, outputs):
+    outputs[pipe] = pipe.read()
+
+
+if hasattr(os, 'wait4'):
+
+    class ResourcePopen(subprocess.Popen):
+        """
+        Popen keeping the resource usage of the process: communicate reads
+        the pipes on threads and reaps the process itself with os.wait4
+        """
+
+        rusage = None
+
+        def communicate(self, input=None, timeout=None):
+            deadline = None if timeout is None else perf_counter() + timeout
+            outputs = {}
+            readers = [
+                Thread(target=read_pipe, args=(pipe, outputs), daemon=True)
+                for pipe in (self.stdout, self.stderr)
+                if pipe is not None
+            ]
+            for reader in readers:
+                reader.start()
+
+            if self.stdin is not None:
+                try:
+                    if input:
+                        self.stdin.write(input)
+                    self.stdin.close()
+                except BrokenPipeError:
+                    pass
+
+            # the pipes are closed when the process exits
+            for reader in readers:
+                reader.join(
+                    None if deadline is None else deadline - perf_counter(),
+                )
+                if reader.is_alive():
+                    raise subprocess.TimeoutExpired(self.args, timeout)
+
+            try:
+                _, status, self.rusage = os.wait4(self.pid, 0)
+            except ChildProcessError:
+                # reaped elsewhere, like Popen does it
+                status = 0
+            self.returncode = os.waitstatus_to_exitcode(status)
+            return outputs.get(self.stdout), outputs.get(self.stderr)
+
+else:
+    ResourcePopen = subprocess.Popen
+
+
 def run_once(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
@@ -167,6 +464,144 @@ def run_once(func):
     return wrapper
 
 
+@lru_cache(maxsize=16)
+def _which(cmd, path):
+    found = which(cmd, path=path)
+    return realpath(found) if found else None
+
+
+@lru_cache(maxsize=256)
+def split_config(config, posix=True):
+    """Returns the tokens of the config, split once per distinct config"""
+    return tuple(shlex.split(config, posix=posix))
+
+
+def active_profile():
+    """Returns the TesseractProfile the current thread runs with, if any"""
+    return getattr(_thread_local, 'profile', None)
+
+
+def set_thread_profile(profile=None):
+    """Sets the TesseractProfile of the calls made by the current thread"""
+    _thread_local.profile = profile
+
+
+def current_tesseract_cmd():
+    profile = active_profile()
+    return tesseract_cmd if profile is None else profile.cmd
+
+
+def tesseract_identity(config=''):
+    """
+    Returns what the capabilities of tesseract depend on: the resolved path,
+    modification time and size of the binary, and the tessdata directory of
+    the config with its modification time. None when the binary is missing
+    """
+    path = _which(current_tesseract_cmd(), environ.get('PATH'))
+    if path is None:
+        return None
+
+    profile = active_profile()
+    tessdata = environ.get('TESSDATA_PREFIX', '')
+    try:
+        args = [
+            *(profile.tessdata_options if profile else ()),
+            *(split_config(config) if config else ()),
+        ]
+        binary = stat(path)
+    except (ValueError, OSError):
+        return None
+    if '--tessdata-dir' in args[:-1]:
+        tessdata = args[len(args) - args[::-1].index('--tessdata-dir')]
+
+    try:
+        tessdata_mtime = stat(tessdata).st_mtime_ns if tessdata else 0
+    except OSError:
+        tessdata_mtime = 0
+
+    return (
+        path,
+        binary.st_mtime_ns,
+        binary.st_size,
+        abspath(tessdata) if tessdata else '',
+        tessdata_mtime,
+    )
+
+
+def _capability_file(key):
+    digest = blake2b(repr(key).encode(), digest_size=16).hexdigest()
+    return join(expanduser(capability_cache_dir), f'{digest}.json')
+
+
+def _read_capability(key):
+    try:
+        with open(_capability_file(key), encoding=DEFAULT_ENCODING) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get('key') == list(key) else None
+
+
+def _write_capability(key, value):
+    directory = expanduser(capability_cache_dir)
+    try:
+        makedirs(directory, exist_ok=True)
+        with NamedTemporaryFile(
+            'w',
+            dir=directory,
+            suffix='.tmp',
+            delete=False,
+            encoding=DEFAULT_ENCODING,
+        ) as f:
+            json.dump({'key': list(key), 'value': value}, f)
+        # atomic, concurrent processes never read half written entries
+        replace(f.name, _capability_file(key))
+    except OSError as e:
+        LOGGER.debug('Capability cache not written: %s', e)
+
+
+def capability_cache(encode=None, decode=None):
+    """
+    Caches the result of a tesseract probe per tesseract_identity, in memory
+    and in capability_cache_dir when set, for the calls with cached=True.
+    Calls without it always run the probe and refresh the cache
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, cached=False, **kwargs):
+            identity = tesseract_identity(
+                kwargs.get('config', args[0] if args else '')
+            )
+            if identity is None:
+                return func(*args, **kwargs)
+
+            key = (func.__name__, *identity)
+            if cached:
+                with _capabilities_lock:
+                    if key in _capabilities:
+                        return _capabilities[key]
+
+                entry = capability_cache_dir and _read_capability(key)
+                if entry:
+                    value = entry['value']
+                    value = decode(value) if decode else value
+                    with _capabilities_lock:
+                        _capabilities[key] = value
+                    return value
+
+            value = func(*args, **kwargs)
+            with _capabilities_lock:
+                _capabilities[key] = value
+            if capability_cache_dir:
+                _write_capability(key, encode(value) if encode else value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
 def get_errors(error_string):
     return ' '.join(
         line for line in error_string.decode(DEFAULT_ENCODING).splitlines()
@@ -183,9 +618,72 @@ def cleanup(temp_name):
                 raise
 
 
+def is_ndarray(image):
+    # an array can only exist once something else imported numpy
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(image, numpy.ndarray)
+
+
+def flatten_alpha(color, alpha):
+    """Composites uint8 color channels over a white background"""
+    # 255 - (255 - color) * alpha / 255, which fits in 16 bits
+    inverse = (255 - color).astype('uint16')
+    inverse *= alpha
+    inverse += 127
+    inverse //= 255
+    return (255 - inverse).astype('uint8')
+
+
+def ndarray_pixels(array):
+    """
+    Returns the uint8 gray or RGB C-contiguous pixels of the array, without
+    copying them when they already are, or None for other dtypes
+    """
+    if array.dtype == 'bool':
+        array = array.astype('uint8') * 255
+    if array.dtype != 'uint8':
+        return None
+
+    if array.ndim == 3 and array.shape[2] == 1:
+        array = array[..., 0]
+    if not (
+        array.ndim == 2 or array.ndim == 3 and array.shape[2] in {2, 3, 4}
+    ):
+        raise TypeError('Unsupported image object')
+
+    if array.ndim == 3:
+        channels = array.shape[2]
+        color = array[..., :3] if channels > 2 else array[..., :1]
+        if channels > 2 and ndarray_channel_order == 'BGR':
+            color = color[..., ::-1]
+        if channels in {2, 4}:
+            color = flatten_alpha(color, array[..., -1:])
+        array = color[..., 0] if color.shape[2] == 1 else color
+
+    return array if array.flags.c_contiguous else array.copy()
+
+
+def pnm_header(pixels):
+    height, width = pixels.shape[:2]
+    magic = b'P5' if pixels.ndim == 2 else b'P6'
+    return b'%s\n%d %d\n255\n' % (magic, width, height)
+
+
+def pnm_pixels(image):
+    """
+    Returns the pixels of numpy arrays that can be written straight to a PNM
+    file, or None when the image goes through Pillow
+    """
+    if not is_ndarray(image) or intermediate_format != 'PNM':
+        return None
+    return ndarray_pixels(image)
+
+
+@measured('prepare')
 def prepare(image):
-    if numpy_installed and isinstance(image, ndarray):
-        image = Image.fromarray(image)
+    if is_ndarray(image):
+        pixels = ndarray_pixels(image)
+        image = Image.fromarray(image if pixels is None else pixels)
 
     if not isinstance(image, Image.Image):
         raise TypeError('Unsupported image object')
@@ -200,25 +698,155 @@ def prepare(image):
         background.paste(image, (0, 0), image.getchannel('A'))
         image = background
 
+    if intermediate_format:
+        extension, modes, _ = INTERMEDIATE_FORMATS[intermediate_format]
+        if image.mode.startswith('I'):
+            # keep the 16/32 bit depth for tesseract to reduce
+            extension, _, _ = INTERMEDIATE_FORMATS['PNG']
+        elif image.mode not in modes:
+            image = image.convert(RGB_MODE)
+        return image, extension
+
     image.format = extension
     return image, extension
 
 
+def open_image(image):
+    """Returns the file path, numpy array or Pillow image as a Pillow image"""
+    if isinstance(image, str):
+        with Image.open(image) as opened:
+            opened.load()
+        return opened
+
+    if is_ndarray(image):
+        pixels = ndarray_pixels(image)
+        image = Image.fromarray(image if pixels is None else pixels)
+
+    if not isinstance(image, Image.Image):
+        raise TypeError('Unsupported image object')
+    return image
+
+
+def save_options(extension):
+    """Returns the Pillow save options of the intermediate image format"""
+    if not intermediate_format:
+        return {}
+
+    for name, _, options in INTERMEDIATE_FORMATS.values():
+        if name == extension:
+            return options
+    return {}
+
+
+def write_image(image, filename_base):
+    """Writes the image for tesseract and returns its filename"""
+    count_pixels(image)
+    with measure('prepare'):
+        pixels = pnm_pixels(image)
+    if pixels is not None:
+        filename = f'{filename_base}{extsep}PPM'
+        with measure('encode'), open(filename, 'wb') as f:
+            f.write(pnm_header(pixels))
+            f.write(pixels.data)
+        return filename
+
+    image, extension = prepare(image)
+    filename = f'{filename_base}{extsep}{extension}'
+    with measure('encode'):
+        image.save(filename, format=extension, **save_options(extension))
+    return filename
+
+
 @contextmanager
 def save(image):
     try:
         with NamedTemporaryFile(prefix='tess_', delete=False) as f:
             if isinstance(image, str):
+                count_pixels(image)
                 yield f.name, realpath(normpath(normcase(image)))
                 return
-            image, extension = prepare(image)
-            input_file_name = f'{f.name}_input{extsep}{extension}'
-            image.save(input_file_name, format=image.format)
+            input_file_name = write_image(image, f'{f.name}_input')
             yield f.name, input_file_name
     finally:
         cleanup(f.name)
 
 
+def count_pages(filename):
+    try:
+        with Image.open(filename) as image:
+            # tesseract only reads the first frame of animated GIF/WebP/PNG
+            if image.format != 'TIFF':
+                return 1
+            return getattr(image, 'n_frames', 1)
+    except OSError:
+        # not readable by Pillow, leave it to tesseract/leptonica
+        return 1
+
+
+@contextmanager
+def save_batch(images):
+    try:
+        with NamedTemporaryFile(prefix='tess_', delete=False) as f:
+            input_filenames, page_counts = [], []
+            for index, image in enumerate(images):
+                if isinstance(image, str):
+                    input_filename = realpath(normpath(normcase(image)))
+                    page_counts.append(count_pages(input_filename))
+                else:
+                    input_filename = write_image(
+                        image,
+                        f'{f.name}_input{index}',
+                    )
+                    page_counts.append(1)
+                input_filenames.append(input_filename)
+
+            list_filename = f'{f.name}_list{extsep}txt'
+            with open(list_filename, 'w', encoding=DEFAULT_ENCODING) as lst:
+                lst.writelines(f'{name}\n' for name in input_filenames)
+            yield f.name, list_filename, page_counts
+    finally:
+        cleanup(f.name)
+
+
+def encode(image):
+    """
+    Returns the tesseract input argument and the image bytes to pipe to it
+    """
+    count_pixels(image)
+    if isinstance(image, str):
+        return realpath(normpath(normcase(image))), None
+
+    with measure('prepare'):
+        pixels = pnm_pixels(image)
+    if pixels is not None:
+        with measure('encode'):
+            header = pnm_header(pixels)
+            # a single copy of the pixels, as the input of communicate()
+            header_size = len(header)
+            data = bytearray(header_size + pixels.nbytes)
+            data[:header_size] = header
+            data[header_size:] = pixels.data.cast('B')
+        return 'stdin', data
+
+    image, extension = prepare(image)
+    with measure('encode'), BytesIO() as buffer:
+        image.save(buffer, format=extension, **save_options(extension))
+        return 'stdin', buffer.getvalue()
+
+
+def set_thread_env(env=None):
+    """
+    Sets environment variables for the tesseract processes started by the
+    current thread, on top of os.environ
+    """
+    _thread_local.env = env
+
+
+def subprocess_env():
+    env = getattr(_thread_local, 'env', None)
+    return {**environ, **env} if env else environ
+
+
 def subprocess_args(include_stdout=True):
     # See https://github.com/pyinstaller/pyinstaller/wiki/Recipe-subprocess
     # for reference and comments.
@@ -227,7 +855,7 @@ def subprocess_args(include_stdout=True):
         'stdin': subprocess.PIPE,
         'stderr': subprocess.PIPE,
         'startupinfo': None,
-        'env': environ,
+        'env': subprocess_env(),
     }
 
     if hasattr(subprocess, 'STARTUPINFO'):
@@ -243,14 +871,13 @@ def subprocess_args(include_stdout=True):
     return kwargs
 
 
-def run_tesseract(
+def tesseract_args(
     input_filename,
     output_filename_base,
     extension,
     lang,
     config='',
     nice=0,
-    timeout=0,
 ):
     cmd_args = []
     not_windows = not (sys.platform == 'win32')
@@ -258,39 +885,187 @@ def run_tesseract(
     if not_windows and nice != 0:
         cmd_args += ('nice', '-n', str(nice))
 
-    cmd_args += (tesseract_cmd, input_filename, output_filename_base)
+    profile = active_profile()
+    cmd_args += (current_tesseract_cmd(), input_filename, output_filename_base)
 
     if lang is not None:
         cmd_args += ('-l', lang)
 
+    if profile is not None:
+        # tokenized and validated once by the profile
+        cmd_args += profile.options
+
     if config:
-        cmd_args += shlex.split(config, posix=not_windows)
+        cmd_args += split_config(config, not_windows)
+
+    if profile is not None:
+        # after the options of the call, tesseract stops parsing options at
+        # the first config file
+        cmd_args += profile.config_files
 
     for _extension in extension.split():
         if _extension not in {'box', 'osd', 'tsv', 'xml'}:
             cmd_args.append(_extension)
     LOGGER.debug('%r', cmd_args)
+    return cmd_args
 
+
+def run_tesseract(
+    input_filename,
+    output_filename_base,
+    extension,
+    lang,
+    config='',
+    nice=0,
+    timeout=0,
+    input_data=None,
+):
+    cmd_args = tesseract_args(
+        input_filename,
+        output_filename_base,
+        extension,
+        lang,
+        config,
+        nice,
+    )
+
+    stats = current_stats()
+    popen = subprocess.Popen if stats is None else ResourcePopen
     try:
-        proc = subprocess.Popen(cmd_args, **subprocess_args())
+        with measure('spawn'):
+            proc = popen(cmd_args, **subprocess_args())
     except OSError as e:
         if e.errno != ENOENT:
             raise
         else:
             raise TesseractNotFoundError()
 
-    with timeout_manager(proc, timeout) as error_string:
-        if proc.returncode:
-            raise TesseractError(proc.returncode, get_errors(error_string))
+    try:
+        with measure('wait'), timeout_manager(
+            proc,
+            timeout,
+            input_data,
+        ) as (output, error_string):
+            pass
+    finally:
+        if getattr(proc, 'rusage', None) is not None:
+            stats.add_rusage(proc.rusage)
+
+    if proc.returncode:
+        raise TesseractError(proc.returncode, get_errors(error_string))
+    count_output(output)
+    return output
 
 
+def config_file_index(tokens):
+    """Returns the index of the first config file of the config tokens"""
+    index = 0
+    while index < len(tokens) and tokens[index].startswith('-'):
+        index += 2 if tokens[index] in OPTIONS_WITH_VALUE else 1
+    return min(index, len(tokens))
+
+
+def split_config_files(config):
+    """
+    Returns the options of the config and its config files, the tokens from
+    the first one on (tesseract reads every later token as a config file)
+    """
+    posix = not (sys.platform == 'win32')
+    tokens = split_config(config, posix) if config else ()
+    index = config_file_index(tokens)
+    join = shlex.join if posix else ' '.join
+    return join(tokens[:index]), join(tokens[index:])
+
+
+def output_config(extensions, config=''):
+    """
+    Returns the config with the variables and config files enabling the
+    renderers of the output extensions added
+    """
+    variables, configs = [], []
+    for extension in extensions:
+        for token in EXTENTION_TO_CONFIG.get(extension, '').split():
+            (variables if '=' in token else configs).append(token)
+
+    # config files come last, tesseract stops parsing options at the first
+    options, config_files = split_config_files(config)
+    return ' '.join(
+        filter(
+            None,
+            [
+                options,
+                *(f'-c {var}' for var in variables),
+                *configs,
+                config_files,
+            ],
+        ),
+    )
+
+
+@measured('read')
 def _read_output(filename: str, return_bytes: bool = False):
     with open(filename, 'rb') as output_file:
-        if return_bytes:
-            return output_file.read()
-        return output_file.read().decode(DEFAULT_ENCODING)
+        output = output_file.read()
+    count_output(output)
+    return output if return_bytes else output.decode(DEFAULT_ENCODING)
+
 
+def write_output(filename, output_path):
+    """
+    Moves the output file of tesseract to output_path, or copies it in
+    chunks to output_path when it is a binary file object
+    """
+    if hasattr(output_path, 'write'):
+        with open(filename, 'rb') as output_file:
+            copyfileobj(output_file, output_path)
+        return output_path
+
+    try:
+        replace(filename, output_path)
+    except OSError as e:
+        if e.errno != EXDEV:
+            raise
+        # another file system, copied without reading it in memory
+        copyfile(filename, output_path)
+    return output_path
 
+
+def map_output(filename):
+    """Returns a read-only memory map of the output file"""
+    with open(filename, 'rb') as output_file:
+        if sys.platform == 'win32' or not stat(filename).st_size:
+            # the temporary file can't be removed while it is mapped
+            return memoryview(output_file.read())
+        return mmap.mmap(output_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def deliver_output(
+    filename,
+    return_bytes=False,
+    output_path=None,
+    memory_map=False,
+):
+    """
+    Returns the output file of tesseract read in memory, moved to
+    output_path (returned, mapped in memory with memory_map) or mapped in
+    memory
+    """
+    if output_path is None and not memory_map:
+        return _read_output(filename, return_bytes)
+
+    stats = current_stats()
+    if stats is not None:
+        stats.add('output_bytes', stat(filename).st_size)
+
+    if output_path is not None:
+        output_path = write_output(filename, output_path)
+        if not memory_map or hasattr(output_path, 'write'):
+            return output_path
+        filename = output_path
+    return map_output(filename)
+
+
+@instrumented
 def run_and_get_multiple_output(
     image,
     extensions: list[str],
@@ -298,14 +1073,41 @@ def run_and_get_multiple_output(
     nice: int = 0,
     timeout: int = 0,
     return_bytes: bool = False,
+    cache: bool = True,
+    config: str = '',
+    output_paths: dict | None = None,
+    memory_map: bool = False,
 ):
-    config = ' '.join(
-        EXTENTION_TO_CONFIG.get(extension, '') for extension in extensions
-    ).strip()
-    if config:
-        config = f'-c {config}'
-    else:
-        config = ''
+    run_config = output_config(extensions, config)
+    output_paths = output_paths or {}
+
+    keys = None
+    if cache and result_cache is not None and not (output_paths or memory_map):
+        keys = result_cache.keys(image, lang, run_config, extensions)
+    if keys is not None:
+        outputs = [result_cache.get(key) for key in keys]
+        if any(output is None for output in outputs):
+            outputs = run_and_get_multiple_output(
+                image,
+                extensions,
+                lang,
+                nice,
+                timeout,
+                True,
+                cache=False,
+                config=config,
+            )
+            for key, output in zip(keys, outputs):
+                result_cache.set(key, output)
+
+        return [
+            (
+                output
+                if return_bytes or extension in {'pdf', 'hocr'}
+                else output.decode(DEFAULT_ENCODING)
+            )
+            for output, extension in zip(outputs, extensions)
+        ]
 
     with save(image) as (temp_name, input_filename):
         kwargs = {
@@ -313,7 +1115,7 @@ def run_and_get_multiple_output(
             'output_filename_base': temp_name,
             'extension': ' '.join(extensions),
             'lang': lang,
-            'config': config,
+            'config': run_config,
             'nice': nice,
             'timeout': timeout,
         }
@@ -321,14 +1123,17 @@ def run_and_get_multiple_output(
         run_tesseract(**kwargs)
 
         return [
-            _read_output(
+            deliver_output(
                 f"{kwargs['output_filename_base']}{extsep}{extension}",
                 True if extension in {'pdf', 'hocr'} else return_bytes,
+                output_paths.get(extension),
+                memory_map,
             )
             for extension in extensions
         ]
 
 
+@instrumented
 def run_and_get_output(
     image,
     extension='',
@@ -337,7 +1142,96 @@ def run_and_get_output(
     nice=0,
     timeout=0,
     return_bytes=False,
+    cache=True,
+    output_path=None,
+    memory_map=False,
 ):
+    if output_path is not None or memory_map:
+        # straight from the output file of tesseract, without the in-memory
+        # result cache, page filters and engines
+        with save(image) as (temp_name, input_filename):
+            run_tesseract(
+                input_filename,
+                temp_name,
+                extension,
+                lang,
+                config,
+                nice,
+                timeout,
+            )
+            return deliver_output(
+                f'{temp_name}{extsep}{extension}',
+                return_bytes,
+                output_path,
+                memory_map,
+            )
+
+    keys = None
+    if cache and result_cache is not None:
+        keys = result_cache.keys(image, lang, config, [extension])
+    if keys is not None:
+        (key,) = keys
+        output = result_cache.get(key)
+        if output is None:
+            output = run_and_get_output(
+                image,
+                extension,
+                lang,
+                config,
+                nice,
+                timeout,
+                True,
+                cache=False,
+            )
+            result_cache.set(key, output)
+        return output if return_bytes else output.decode(DEFAULT_ENCODING)
+
+    normalized = None
+    if resolution_normalizer is not None:
+        normalized = resolution_normalizer.normalize(image, extension, config)
+    if normalized is not None:
+        from .resolution import rescale_output
+
+        small, small_config, size = normalized
+        output = run_and_get_output(
+            small,
+            extension,
+            lang,
+            small_config,
+            nice,
+            timeout,
+            True,
+            cache=False,
+        )
+        output = rescale_output(output, extension, size, small.size)
+        return output if return_bytes else output.decode(DEFAULT_ENCODING)
+
+    if blank_page_filter is not None:
+        output = blank_page_filter.blank_output(image, extension)
+        if output is not None:
+            return output if return_bytes else output.decode(DEFAULT_ENCODING)
+
+    if engine == 'libtesseract' and active_profile() is None:
+        from .libtesseract import run_and_get_output as run_in_process
+
+        output = run_in_process(image, extension, lang, config, timeout)
+        if output is not None:
+            return output if return_bytes else output.decode(DEFAULT_ENCODING)
+
+    if use_pipes and extension in STREAMABLE_EXTENSIONS:
+        input_filename, input_data = encode(image)
+        output = run_tesseract(
+            input_filename,
+            'stdout',
+            extension,
+            lang,
+            config,
+            nice,
+            timeout,
+            input_data,
+        )
+        return output if return_bytes else output.decode(DEFAULT_ENCODING)
+
     with save(image) as (temp_name, input_filename):
         kwargs = {
             'input_filename': input_filename,
@@ -356,39 +1250,400 @@ def run_and_get_output(
         )
 
 
-def file_to_dict(tsv, cell_delimiter, str_col_idx):
-    result = {}
-    rows = [row.split(cell_delimiter) for row in tsv.strip().split('\n')]
-    if len(rows) < 2:
-        return result
+def page_owners(page_counts):
+    """
+    Returns the index of the input image of every page and the first page
+    index of every input image
+    """
+    owners = [
+        index for index, count in enumerate(page_counts) for _ in range(count)
+    ]
+    return owners, list(accumulate(page_counts, initial=0))
+
+
+def split_text(text, page_counts):
+    owners, _ = page_owners(page_counts)
+    trailing = PAGE_SEPARATOR if text.endswith(PAGE_SEPARATOR) else ''
+    pages = text[: len(text) - len(trailing)].split(PAGE_SEPARATOR)
+
+    chunks = [[] for _ in page_counts]
+    for page, page_text in enumerate(pages[: len(owners)]):
+        chunks[owners[page]].append(page_text)
+    return [f'{PAGE_SEPARATOR.join(chunk)}{trailing}' for chunk in chunks]
+
+
+def split_tsv(tsv, page_counts):
+    owners, first_pages = page_owners(page_counts)
+    header, _, body = tsv.partition('\n')
+
+    chunks = [[header] for _ in page_counts]
+    for row in body.split('\n'):
+        if not row:
+            continue
+        cells = row.split('\t')
+        page = int(cells[1]) - 1
+        index = owners[page]
+        cells[1] = str(page - first_pages[index] + 1)
+        chunks[index].append('\t'.join(cells))
+    return [''.join(f'{row}\n' for row in chunk) for chunk in chunks]
+
+
+def split_boxes(boxes, page_counts):
+    owners, first_pages = page_owners(page_counts)
+
+    chunks = [[] for _ in page_counts]
+    for line in boxes.split('\n'):
+        if not line:
+            continue
+        box, _, page = line.rpartition(' ')
+        index = owners[int(page)]
+        chunks[index].append(f'{box} {int(page) - first_pages[index]}')
+    return [''.join(f'{line}\n' for line in chunk) for chunk in chunks]
+
+
+BATCH_SPLITTERS = {
+    'box': split_boxes,
+    'tsv': split_tsv,
+    'txt': split_text,
+}
+
+
+@instrumented
+def run_and_get_batch_output(
+    images,
+    extension='txt',
+    lang=None,
+    config='',
+    nice=0,
+    timeout=0,
+):
+    """
+    Runs tesseract once over all the images through a list file and returns
+    the output split back per image
+    """
+    if extension not in BATCH_SPLITTERS:
+        raise ValueError(f'Unsupported extension: {extension}')
+
+    with save_batch(images) as (temp_name, list_filename, page_counts):
+        if not page_counts:
+            return []
+
+        run_tesseract(
+            list_filename,
+            temp_name,
+            extension,
+            lang,
+            config,
+            nice,
+            timeout,
+        )
+        output = _read_output(f'{temp_name}{extsep}{extension}')
+
+    return BATCH_SPLITTERS[extension](output, page_counts)
 
+
+def iter_tesseract_output(
+    image,
+    extension,
+    lang=None,
+    config='',
+    nice=0,
+    timeout=0,
+):
+    """
+    Runs tesseract with the output on stdout and yields it in chunks as soon
+    as tesseract writes them
+    """
+    input_filename, input_data = encode(image)
+    cmd_args = tesseract_args(
+        input_filename,
+        'stdout',
+        extension,
+        lang,
+        config,
+        nice,
+    )
+
+    with TemporaryFile() as error_file:
+        kwargs = subprocess_args()
+        # a file, so warnings never block tesseract while stdout is read
+        kwargs['stderr'] = error_file
+        try:
+            proc = subprocess.Popen(cmd_args, **kwargs)
+        except OSError as e:
+            if e.errno != ENOENT:
+                raise
+            else:
+                raise TesseractNotFoundError()
+
+        timed_out = []
+
+        def on_timeout():
+            timed_out.append(True)
+            kill(proc, -1)
+
+        timer = Timer(timeout, on_timeout) if timeout else None
+        try:
+            if timer:
+                timer.start()
+            try:
+                if input_data:
+                    proc.stdin.write(input_data)
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass  # tesseract failed, reported by the return code
+
+            while True:
+                chunk = proc.stdout.read1(STREAM_READ_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+            proc.wait()
+        finally:
+            if timer:
+                timer.cancel()
+            if proc.poll() is None:
+                # the caller stopped iterating
+                kill(proc, -1)
+            proc.stdout.close()
+
+        if timed_out:
+            raise RuntimeError('Tesseract process timeout')
+        if proc.returncode:
+            error_file.seek(0)
+            raise TesseractError(
+                proc.returncode,
+                get_errors(error_file.read()),
+            )
+
+
+def iter_split(chunks, separator):
+    """Yields the separator terminated parts of a stream of chunks"""
+    rest = b''
+    for chunk in chunks:
+        *parts, rest = (rest + chunk).split(separator)
+        for part in parts:
+            yield part + separator
+    if rest:
+        yield rest
+
+
+def iter_text_pages(chunks):
+    return iter_split(chunks, PAGE_SEPARATOR.encode())
+
+
+def iter_tsv_pages(chunks):
+    lines = iter_split(chunks, b'\n')
+    header = next(lines, None)
+    page, rows = None, []
+    for line in lines:
+        cells = line.split(b'\t', 2)
+        if len(cells) < 3:
+            continue
+        if cells[1] != page:
+            if rows:
+                yield header + b''.join(rows)
+            page, rows = cells[1], []
+        rows.append(line)
+    if rows:
+        yield header + b''.join(rows)
+
+
+PAGE_READERS = {
+    'tsv': iter_tsv_pages,
+    'txt': iter_text_pages,
+}
+
+
+def iter_run_and_get_output(
+    image,
+    extension='txt',
+    lang=None,
+    config='',
+    nice=0,
+    timeout=0,
+    return_bytes=False,
+):
+    """
+    Runs tesseract on a (multi-page) image or list file and yields the output
+    of every page as soon as tesseract is done with it
+    """
+    if extension not in PAGE_READERS:
+        raise ValueError(f'Unsupported extension: {extension}')
+
+    args = [image, extension, lang, config, nice, timeout]
+    chunks = iter_tesseract_output(*args)
+    try:
+        for page in PAGE_READERS[extension](chunks):
+            yield page if return_bytes else page.decode(DEFAULT_ENCODING)
+    finally:
+        chunks.close()
+
+
+def split_table(tsv, cell_delimiter):
+    """Returns the header and the rows of split cells of the table"""
+    rows = [row.split(cell_delimiter) for row in tsv.strip().split('\n')]
     header = rows.pop(0)
-    length = len(header)
-    if len(rows[-1]) < length:
+    if rows and len(rows[-1]) < len(header):
         # Fixes bug that occurs when last text string in TSV is null, and
         # last row is missing a final cell in TSV file
         rows[-1].append('')
+    return header, rows
+
+
+def table_columns(header, rows):
+    """Returns the cells of every column, skipping the missing ones"""
+    length = len(header)
+    if set(map(len, rows)) == {length}:
+        # the common case of a well-formed table, transposed in one go
+        return list(zip(*rows))
+    return [[row[i] for row in rows if len(row) > i] for i in range(length)]
+
+
+def parse_ints(cells):
+    try:
+        return list(map(int, cells))
+    except ValueError:
+        pass
+
+    try:
+        return [int(float(val)) for val in cells]
+    except ValueError:
+        pass
+
+    values = []
+    for val in cells:
+        try:
+            values.append(int(float(val)))
+        except ValueError:
+            values.append(val)
+    return values
+
+
+def parse_floats(cells):
+    try:
+        return list(map(float, cells))
+    except ValueError:
+        return [float(val) if is_valid(val, float) else -1 for val in cells]
+
+
+def parse_column(column, parse=parse_ints):
+    """
+    Parses every distinct cell of the column once, most columns repeat a few
+    values (levels, indexes, coordinates)
+    """
+    unique = list(set(column))
+    if len(unique) > len(column) // 2:
+        return parse(column)
+    return list(map(dict(zip(unique, parse(unique))).__getitem__, column))
+
+
+@measured('parse')
+def file_to_dict(tsv, cell_delimiter, str_col_idx):
+    result = {}
+    header, rows = split_table(tsv, cell_delimiter)
+    if not rows:
+        return result
 
+    if str_col_idx < 0:
+        str_col_idx += len(header)
+
+    columns = table_columns(header, rows)
+    for i, (head, column) in enumerate(zip(header, columns)):
+        result[head] = (
+            list(column) if i == str_col_idx else parse_column(column)
+        )
+
+    return result
+
+
+@measured('parse')
+def file_to_numpy(tsv, cell_delimiter, str_col_idx):
+    """
+    Returns the table as a numpy structured array with object text, float32
+    conf and int32 columns, missing or malformed numbers are set to -1 and
+    missing text to an empty string
+    """
+    if not numpy_installed:
+        raise NumpyNotSupported()
+
+    import numpy as np
+
+    header, rows = split_table(tsv, cell_delimiter)
+    length = len(header)
     if str_col_idx < 0:
         str_col_idx += length
 
+    if set(map(len, rows)) - {length}:
+        # missing numbers are -1, missing text is empty like in file_to_dict
+        padding = ['-1'] * length
+        padding[str_col_idx] = ''
+        rows = [
+            (row + padding[cells:])[:length]
+            for row, cells in zip(rows, map(len, rows))
+        ]
+
+    dtype = []
     for i, head in enumerate(header):
-        result[head] = list()
-        for row in rows:
-            if len(row) <= i:
-                continue
+        if i == str_col_idx:
+            dtype.append((head, object))
+        elif head == 'conf':
+            dtype.append((head, np.float32))
+        else:
+            dtype.append((head, np.int32))
 
-            if i != str_col_idx:
-                try:
-                    val = int(float(row[i]))
-                except ValueError:
-                    val = row[i]
-            else:
-                val = row[i]
+    result = np.zeros(len(rows), dtype=dtype)
+    for i, column in enumerate(table_columns(header, rows)):
+        if i == str_col_idx:
+            result[header[i]] = column
+        else:
+            result[header[i]] = parse_column(column, parse_floats)
+    return result
 
-            result[head].append(val)
 
-    return result
+@measured('parse')
+def tsv_to_text(tsv):
+    """
+    Rebuilds the plain text output from the TSV output: words joined by
+    spaces, every line on its own, an empty line after every paragraph and
+    the page separator after every page
+    """
+    text, words = [], None
+    in_paragraph = in_page = False
+    for row in tsv.split('\n')[1:]:
+        cells = row.split('\t')
+        if len(cells) < 12:
+            continue
+
+        level = cells[0]
+        if level == '5':
+            if words is None:
+                words = []
+            words.append(cells[11])
+            continue
+
+        if words is not None:
+            text.append(f'{" ".join(words)}\n')
+            words = None
+        if level in {'1', '2', '3'} and in_paragraph:
+            text.append('\n')
+            in_paragraph = False
+        if level == '1':
+            if in_page:
+                text.append(PAGE_SEPARATOR)
+            in_page = True
+        elif level == '3':
+            in_paragraph = True
+        elif level == '4':
+            words = []
+
+    if words is not None:
+        text.append(f'{" ".join(words)}\n')
+    if in_paragraph:
+        text.append('\n')
+    if in_page:
+        text.append(PAGE_SEPARATOR)
+    return ''.join(text)
 
 
 def is_valid(val, _type):
@@ -405,6 +1660,7 @@ def is_valid(val, _type):
     return True
 
 
+@measured('parse')
 def osd_to_dict(osd):
     return {
         OSD_KEYS[kv[0]][0]: OSD_KEYS[kv[0]][1](kv[1])
@@ -413,11 +1669,14 @@ def osd_to_dict(osd):
     }
 
 
-@run_once
+@capability_cache()
 def get_languages(config=''):
-    cmd_args = [tesseract_cmd, '--list-langs']
+    profile = active_profile()
+    cmd_args = [current_tesseract_cmd(), '--list-langs']
+    if profile is not None:
+        cmd_args += profile.tessdata_options
     if config:
-        cmd_args += shlex.split(config)
+        cmd_args += split_config(config)
 
     try:
         result = subprocess.run(
@@ -442,14 +1701,14 @@ def get_languages(config=''):
     return languages
 
 
-@run_once
+@capability_cache(encode=str, decode=Version)
 def get_tesseract_version():
     """
     Returns Version object of the Tesseract version
     """
     try:
         output = subprocess.check_output(
-            [tesseract_cmd, '--version'],
+            [current_tesseract_cmd(), '--version'],
             stderr=subprocess.STDOUT,
             env=environ,
             stdin=subprocess.DEVNULL,
@@ -470,6 +1729,19 @@ def get_tesseract_version():
     return version
 
 
+def get_output_formats():
+    """
+    Returns the output formats (extensions) the tesseract binary supports,
+    from its cached version
+    """
+    version = get_tesseract_version(cached=True)
+    formats = ['box', 'hocr', 'osd', 'pdf', 'tsv', 'txt']
+    if version >= TESSERACT_ALTO_VERSION:
+        formats.append('xml')
+    return formats
+
+
+@instrumented
 def image_to_string(
     image,
     lang=None,
@@ -477,19 +1749,41 @@ def image_to_string(
     nice=0,
     output_type=Output.STRING,
     timeout=0,
+    cache=True,
+    auto_orient=False,
+    script_routing=None,
 ):
     """
     Returns the result of a Tesseract OCR run on the provided image to string
+
+    With auto_orient, the page is rotated as detected by the OSD first, and
+    with script_routing (True or a script to languages dict), recognized
+    with the languages of the detected script. auto_orient can also be an
+    OrientationRouter reusing the decisions across the pages of a document
     """
+    if auto_orient or script_routing:
+        from .orientation import OrientationRouter
+
+        router = auto_orient
+        if not isinstance(router, OrientationRouter):
+            router = OrientationRouter(
+                script_routing,
+                nice=nice,
+                timeout=timeout,
+            )
+        image, lang = router.route(image, lang, rotate=bool(auto_orient))
+
     args = [image, 'txt', lang, config, nice, timeout]
+    kwargs = {'cache': cache}
 
     return {
-        Output.BYTES: lambda: run_and_get_output(*(args + [True])),
-        Output.DICT: lambda: {'text': run_and_get_output(*args)},
-        Output.STRING: lambda: run_and_get_output(*args),
+        Output.BYTES: lambda: run_and_get_output(*(args + [True]), **kwargs),
+        Output.DICT: lambda: {'text': run_and_get_output(*args, **kwargs)},
+        Output.STRING: lambda: run_and_get_output(*args, **kwargs),
     }[output_type]()
 
 
+@instrumented
 def image_to_pdf_or_hocr(
     image,
     lang=None,
@@ -497,9 +1791,16 @@ def image_to_pdf_or_hocr(
     nice=0,
     extension='pdf',
     timeout=0,
+    cache=True,
+    output_path=None,
+    memory_map=False,
 ):
     """
     Returns the result of a Tesseract OCR run on the provided image to pdf/hocr
+
+    With output_path (a file path or a binary file object), the output is
+    moved or copied there and output_path is returned instead of the bytes.
+    With memory_map, a read-only memory map of the output is returned
     """
 
     if extension not in {'pdf', 'hocr'}:
@@ -509,19 +1810,29 @@ def image_to_pdf_or_hocr(
         config = f'-c tessedit_create_hocr=1 {config.strip()}'
 
     args = [image, extension, lang, config, nice, timeout, True]
+    kwargs = {
+        'cache': cache,
+        'output_path': output_path,
+        'memory_map': memory_map,
+    }
 
-    return run_and_get_output(*args)
+    return run_and_get_output(*args, **kwargs)
 
 
+@instrumented
 def image_to_alto_xml(
     image,
     lang=None,
     config='',
     nice=0,
     timeout=0,
+    cache=True,
+    output_path=None,
+    memory_map=False,
 ):
     """
     Returns the result of a Tesseract OCR run on the provided image to ALTO XML
+    (see image_to_pdf_or_hocr for output_path and memory_map)
     """
 
     if get_tesseract_version(cached=True) < TESSERACT_ALTO_VERSION:
@@ -529,10 +1840,16 @@ def image_to_alto_xml(
 
     config = f'-c tessedit_create_alto=1 {config.strip()}'
     args = [image, 'xml', lang, config, nice, timeout, True]
+    kwargs = {
+        'cache': cache,
+        'output_path': output_path,
+        'memory_map': memory_map,
+    }
 
-    return run_and_get_output(*args)
+    return run_and_get_output(*args, **kwargs)
 
 
+@instrumented
 def image_to_boxes(
     image,
     lang=None,
@@ -540,27 +1857,54 @@ def image_to_boxes(
     nice=0,
     output_type=Output.STRING,
     timeout=0,
+    cache=True,
+    tiles=None,
 ):
     """
     Returns string containing recognized characters and their box boundaries
     """
+    if tiles:
+        from .tiling import tiled_ocr
+
+        output = tiled_ocr(
+            image,
+            'box',
+            tiles,
+            lang=lang,
+            config=config,
+            nice=nice,
+            timeout=timeout,
+            return_bytes=True,
+            cache=cache,
+        )
+        return convert_output(output, 'box', output_type)
+
     config = (
         f'{config.strip()} -c tessedit_create_boxfile=1 batch.nochop makebox'
     )
     args = [image, 'box', lang, config, nice, timeout]
+    kwargs = {'cache': cache}
 
     return {
-        Output.BYTES: lambda: run_and_get_output(*(args + [True])),
+        Output.BYTES: lambda: run_and_get_output(*(args + [True]), **kwargs),
         Output.DICT: lambda: file_to_dict(
-            f'char left bottom right top page\n{run_and_get_output(*args)}',
+            'char left bottom right top page\n'
+            f'{run_and_get_output(*args, **kwargs)}',
             ' ',
             0,
         ),
-        Output.STRING: lambda: run_and_get_output(*args),
+        Output.NUMPY: lambda: file_to_numpy(
+            'char left bottom right top page\n'
+            f'{run_and_get_output(*args, **kwargs)}',
+            ' ',
+            0,
+        ),
+        Output.STRING: lambda: run_and_get_output(*args, **kwargs),
     }[output_type]()
 
 
-def get_pandas_output(args, config=None):
+@measured('parse')
+def tsv_to_pandas(tsv, config=None):
     if not pandas_installed:
         raise PandasNotSupported()
 
@@ -570,9 +1914,19 @@ def get_pandas_output(args, config=None):
     except (TypeError, ValueError):
         pass
 
-    return pd.read_csv(BytesIO(run_and_get_output(*args)), **kwargs)
+    import pandas as pd
+
+    return pd.read_csv(BytesIO(tsv), **kwargs)
+
+
+def get_pandas_output(args, config=None, **kwargs):
+    if not pandas_installed:
+        raise PandasNotSupported()
+
+    return tsv_to_pandas(run_and_get_output(*args, **kwargs), config)
 
 
+@instrumented
 def image_to_data(
     image,
     lang=None,
@@ -581,6 +1935,9 @@ def image_to_data(
     output_type=Output.STRING,
     timeout=0,
     pandas_config=None,
+    cache=True,
+    tiles=None,
+    cascade=None,
 ):
     """
     Returns string containing box boundaries, confidences,
@@ -590,20 +1947,56 @@ def image_to_data(
     if get_tesseract_version(cached=True) < TESSERACT_MIN_VERSION:
         raise TSVNotSupported()
 
+    if cascade is not None:
+        # pytesseract.cascade.ConfidenceCascade
+        output = cascade.run(
+            image,
+            lang,
+            config,
+            nice,
+            timeout,
+            return_bytes=True,
+        )
+        return convert_output(output, 'tsv', output_type, pandas_config)
+
+    if tiles:
+        from .tiling import tiled_ocr
+
+        output = tiled_ocr(
+            image,
+            'tsv',
+            tiles,
+            lang=lang,
+            config=config,
+            nice=nice,
+            timeout=timeout,
+            return_bytes=True,
+            cache=cache,
+        )
+        return convert_output(output, 'tsv', output_type, pandas_config)
+
     config = f'-c tessedit_create_tsv=1 {config.strip()}'
     args = [image, 'tsv', lang, config, nice, timeout]
+    kwargs = {'cache': cache}
 
     return {
-        Output.BYTES: lambda: run_and_get_output(*(args + [True])),
+        Output.BYTES: lambda: run_and_get_output(*(args + [True]), **kwargs),
         Output.DATAFRAME: lambda: get_pandas_output(
             args + [True],
             pandas_config,
+            **kwargs,
         ),
-        Output.DICT: lambda: file_to_dict(run_and_get_output(*args), '\t', -1),
-        Output.STRING: lambda: run_and_get_output(*args),
+        Output.DICT: lambda: file_to_dict(
+            run_and_get_output(*args, **kwargs), '\t', -1
+        ),
+        Output.NUMPY: lambda: file_to_numpy(
+            run_and_get_output(*args, **kwargs), '\t', -1
+        ),
+        Output.STRING: lambda: run_and_get_output(*args, **kwargs),
     }[output_type]()
 
 
+@instrumented
 def image_to_osd(
     image,
     lang='osd',
@@ -611,27 +2004,328 @@ def image_to_osd(
     nice=0,
     output_type=Output.STRING,
     timeout=0,
+    cache=True,
 ):
     """
     Returns string containing the orientation and script detection (OSD)
     """
     config = f'--psm 0 {config.strip()}'
     args = [image, 'osd', lang, config, nice, timeout]
+    kwargs = {'cache': cache}
 
     return {
-        Output.BYTES: lambda: run_and_get_output(*(args + [True])),
-        Output.DICT: lambda: osd_to_dict(run_and_get_output(*args)),
-        Output.STRING: lambda: run_and_get_output(*args),
+        Output.BYTES: lambda: run_and_get_output(*(args + [True]), **kwargs),
+        Output.DICT: lambda: osd_to_dict(run_and_get_output(*args, **kwargs)),
+        Output.STRING: lambda: run_and_get_output(*args, **kwargs),
     }[output_type]()
 
 
+def output_type_supported(extension, output_type):
+    return (
+        extension in {'hocr', 'pdf', 'xml'}
+        or output_type in {Output.BYTES, Output.STRING}
+        or output_type in PARSED_OUTPUT_TYPES.get(extension, ())
+    )
+
+
+def convert_output(output, extension, output_type, pandas_config=None):
+    """
+    Converts the output bytes of a tesseract run to the output type of the
+    matching image_to_* function
+    """
+    if extension in {'hocr', 'pdf', 'xml'} or output_type == Output.BYTES:
+        return output
+
+    text = output.decode(DEFAULT_ENCODING)
+    if output_type == Output.STRING:
+        return text
+
+    if extension == 'box':
+        text = f'char left bottom right top page\n{text}'
+
+    return {
+        ('box', Output.DICT): lambda: file_to_dict(text, ' ', 0),
+        ('box', Output.NUMPY): lambda: file_to_numpy(text, ' ', 0),
+        ('osd', Output.DICT): lambda: osd_to_dict(text),
+        ('tsv', Output.DATAFRAME): lambda: tsv_to_pandas(
+            output,
+            pandas_config,
+        ),
+        ('tsv', Output.DICT): lambda: file_to_dict(text, '\t', -1),
+        ('tsv', Output.NUMPY): lambda: file_to_numpy(text, '\t', -1),
+        ('txt', Output.DICT): lambda: {'text': text},
+    }[extension, output_type]()
+
+
+@instrumented
+def image_to_outputs(
+    image,
+    outputs=('txt', 'tsv'),
+    lang=None,
+    config='',
+    nice=0,
+    output_type=Output.STRING,
+    timeout=0,
+    pandas_config=None,
+    cache=True,
+):
+    """
+    Returns the results of a single Tesseract OCR run on the provided image
+    in every requested format (txt, tsv, box, hocr, pdf, xml) by format.
+    A single output_type applies to the formats it is supported by, the
+    others are strings. When only txt and tsv are requested, the text is
+    rebuilt from the TSV words (unless preserve_interword_spaces is set)
+    """
+    outputs = list(dict.fromkeys(outputs))
+    for extension in outputs:
+        if extension not in OUTPUT_EXTENSIONS:
+            raise ValueError(f'Unsupported extension: {extension}')
+
+    if isinstance(output_type, dict):
+        for extension, kind in output_type.items():
+            if not output_type_supported(extension, kind):
+                raise ValueError(
+                    f'Unsupported output type for {extension}: {kind}',
+                )
+    else:
+        output_type = {
+            extension: output_type
+            for extension in outputs
+            if output_type_supported(extension, output_type)
+        }
+
+    version = get_tesseract_version(cached=True)
+    if 'tsv' in outputs and version < TESSERACT_MIN_VERSION:
+        raise TSVNotSupported()
+    if 'xml' in outputs and version < TESSERACT_ALTO_VERSION:
+        raise ALTONotSupported()
+
+    # the text is rebuilt from the TSV words, a single output can go through
+    # the pipes or the in-process engine. The spacing of the words kept by
+    # preserve_interword_spaces is only in the txt output
+    extensions = outputs
+    if set(outputs) == {'txt', 'tsv'}:
+        if 'preserve_interword_spaces' not in config:
+            extensions = ['tsv']
+    if len(extensions) == 1:
+        (extension,) = extensions
+        run_config = output_config(extensions, config)
+        args = [image, extension, lang, run_config, nice, timeout, True]
+        results = [run_and_get_output(*args, cache=cache)]
+    else:
+        args = [image, extensions, lang, nice, timeout, True]
+        results = run_and_get_multiple_output(
+            *args,
+            cache=cache,
+            config=config,
+        )
+
+    results = dict(zip(extensions, results))
+    if 'txt' not in results:
+        tsv = results['tsv'].decode(DEFAULT_ENCODING)
+        results['txt'] = tsv_to_text(tsv).encode(DEFAULT_ENCODING)
+
+    return {
+        extension: convert_output(
+            results[extension],
+            extension,
+            output_type.get(extension, Output.STRING),
+            pandas_config,
+        )
+        for extension in outputs
+    }
+
+
+@instrumented
+def image_to_string_batch(
+    images,
+    lang=None,
+    config='',
+    nice=0,
+    output_type=Output.STRING,
+    timeout=0,
+):
+    """
+    Returns the results of a single Tesseract OCR run over all the provided
+    images, one string per image
+    """
+    args = [images, 'txt', lang, config, nice, timeout]
+
+    return {
+        Output.BYTES: lambda: [
+            text.encode(DEFAULT_ENCODING)
+            for text in run_and_get_batch_output(*args)
+        ],
+        Output.DICT: lambda: [
+            {'text': text} for text in run_and_get_batch_output(*args)
+        ],
+        Output.STRING: lambda: run_and_get_batch_output(*args),
+    }[output_type]()
+
+
+@instrumented
+def image_to_boxes_batch(
+    images,
+    lang=None,
+    config='',
+    nice=0,
+    output_type=Output.STRING,
+    timeout=0,
+):
+    """
+    Returns the image_to_boxes results of a single Tesseract OCR run over all
+    the provided images, one per image
+    """
+    config = (
+        f'{config.strip()} -c tessedit_create_boxfile=1 batch.nochop makebox'
+    )
+    args = [images, 'box', lang, config, nice, timeout]
+
+    return {
+        Output.BYTES: lambda: [
+            boxes.encode(DEFAULT_ENCODING)
+            for boxes in run_and_get_batch_output(*args)
+        ],
+        Output.DICT: lambda: [
+            file_to_dict(f'char left bottom right top page\n{boxes}', ' ', 0)
+            for boxes in run_and_get_batch_output(*args)
+        ],
+        Output.NUMPY: lambda: [
+            file_to_numpy(f'char left bottom right top page\n{boxes}', ' ', 0)
+            for boxes in run_and_get_batch_output(*args)
+        ],
+        Output.STRING: lambda: run_and_get_batch_output(*args),
+    }[output_type]()
+
+
+@instrumented
+def image_to_data_batch(
+    images,
+    lang=None,
+    config='',
+    nice=0,
+    output_type=Output.STRING,
+    timeout=0,
+    pandas_config=None,
+):
+    """
+    Returns the image_to_data results of a single Tesseract OCR run over all
+    the provided images, one per image. Requires Tesseract 3.05+
+    """
+
+    if get_tesseract_version(cached=True) < TESSERACT_MIN_VERSION:
+        raise TSVNotSupported()
+
+    config = f'-c tessedit_create_tsv=1 {config.strip()}'
+    args = [images, 'tsv', lang, config, nice, timeout]
+
+    return {
+        Output.BYTES: lambda: [
+            tsv.encode(DEFAULT_ENCODING)
+            for tsv in run_and_get_batch_output(*args)
+        ],
+        Output.DATAFRAME: lambda: [
+            tsv_to_pandas(tsv.encode(DEFAULT_ENCODING), pandas_config)
+            for tsv in run_and_get_batch_output(*args)
+        ],
+        Output.DICT: lambda: [
+            file_to_dict(tsv, '\t', -1)
+            for tsv in run_and_get_batch_output(*args)
+        ],
+        Output.NUMPY: lambda: [
+            file_to_numpy(tsv, '\t', -1)
+            for tsv in run_and_get_batch_output(*args)
+        ],
+        Output.STRING: lambda: run_and_get_batch_output(*args),
+    }[output_type]()
+
+
+def iter_image_to_string(
+    image,
+    lang=None,
+    config='',
+    nice=0,
+    output_type=Output.STRING,
+    timeout=0,
+):
+    """
+    Returns an iterator over the image_to_string result of every page of a
+    multi-page image or list file, yielded as soon as the page is recognized
+    """
+    args = [image, 'txt', lang, config, nice, timeout, True]
+
+    convert = {
+        Output.BYTES: lambda page: page,
+        Output.DICT: lambda page: {'text': page.decode(DEFAULT_ENCODING)},
+        Output.STRING: lambda page: page.decode(DEFAULT_ENCODING),
+    }[output_type]
+    return (convert(page) for page in iter_run_and_get_output(*args))
+
+
+def iter_image_to_data(
+    image,
+    lang=None,
+    config='',
+    nice=0,
+    output_type=Output.STRING,
+    timeout=0,
+    pandas_config=None,
+):
+    """
+    Returns an iterator over the image_to_data result of every page of a
+    multi-page image or list file, yielded as soon as the page is recognized.
+    Requires Tesseract 3.05+
+    """
+
+    if get_tesseract_version(cached=True) < TESSERACT_MIN_VERSION:
+        raise TSVNotSupported()
+
+    if output_type == Output.DATAFRAME and not pandas_installed:
+        raise PandasNotSupported()
+
+    config = f'-c tessedit_create_tsv=1 {config.strip()}'
+    args = [image, 'tsv', lang, config, nice, timeout, True]
+
+    convert = {
+        Output.BYTES: lambda page: page,
+        Output.DATAFRAME: lambda page: tsv_to_pandas(page, pandas_config),
+        Output.DICT: lambda page: file_to_dict(
+            page.decode(DEFAULT_ENCODING),
+            '\t',
+            -1,
+        ),
+        Output.NUMPY: lambda page: file_to_numpy(
+            page.decode(DEFAULT_ENCODING),
+            '\t',
+            -1,
+        ),
+        Output.STRING: lambda page: page.decode(DEFAULT_ENCODING),
+    }[output_type]
+    return (convert(page) for page in iter_run_and_get_output(*args))
+
+
 def main():
+    if sys.argv[1:2] == ['serve']:
+        from .server import main as serve
+
+        return serve(sys.argv[2:])
+
+    if sys.argv[1:2] == ['batch']:
+        from .batch import main as batch
+
+        return batch(sys.argv[2:])
+
     if len(sys.argv) == 2:
         filename, lang = sys.argv[1], None
     elif len(sys.argv) == 4 and sys.argv[1] == '-l':
         filename, lang = sys.argv[3], sys.argv[2]
     else:
-        print('Usage: pytesseract [-l lang] input_file\n', file=sys.stderr)
+        print(
+            'Usage: pytesseract [-l lang] input_file\n'
+            '       pytesseract batch [-h] [options] [sources ...]\n'
+            '       pytesseract serve [-h] [options]\n',
+            file=sys.stderr,
+        )
         return 2
 
     try:
@@ -0,0 +1,212 @@
+"""
+OCR of many regions of an image in a single tesseract run.
+
+The crops of the regions are packed in shelves, the tallest first, into one
+montage image with blank gaps between them. The montage goes through
+tesseract once and every recognized word is mapped back to the region
+holding its center, in the coordinates of the original image.
+"""
+
+from __future__ import annotations
+
+from math import isqrt
+
+from PIL import Image
+
+from .pytesseract import convert_output
+from .pytesseract import DEFAULT_ENCODING
+from .pytesseract import get_tesseract_version
+from .pytesseract import open_image
+from .pytesseract import Output
+from .pytesseract import output_config
+from .pytesseract import prepare
+from .pytesseract import run_and_get_output
+from .pytesseract import TESSERACT_MIN_VERSION
+from .pytesseract import TSV_HEADER
+from .pytesseract import TSVNotSupported
+
+
+DEFAULT_GAP = 32
+
+
+def shelf_pack(sizes, width, gap=DEFAULT_GAP):
+    """
+    Returns the (left, top) position of every (width, height) size packed
+    in shelves of at most width pixels, the tallest first, and the size of
+    the montage
+    """
+    positions = [None] * len(sizes)
+    x = y = gap
+    shelf_height = montage_width = 0
+    for index in sorted(range(len(sizes)), key=lambda i: -sizes[i][1]):
+        size_width, size_height = sizes[index]
+        if x > gap and x + size_width + gap > width:
+            # next shelf
+            x, y = gap, y + shelf_height + gap
+            shelf_height = 0
+        positions[index] = (x, y)
+        x += size_width + gap
+        shelf_height = max(shelf_height, size_height)
+        montage_width = max(montage_width, x)
+
+    return positions, (montage_width, y + shelf_height + gap)
+
+
+def montage_width(sizes, gap=DEFAULT_GAP):
+    """Returns a shelf width giving a roughly square montage"""
+    area = sum((width + gap) * (height + gap) for width, height in sizes)
+    widest = max(width for width, _ in sizes)
+    return max(widest + 2 * gap, isqrt(area))
+
+
+def crop_box(image, box):
+    """
+    Returns the crop of the (left, top, right, bottom) box, white where the
+    box goes beyond the image (Image.crop fills it with black)
+    """
+    left, top, right, bottom = box
+    width, height = image.size
+    clipped = (
+        max(left, 0),
+        max(top, 0),
+        min(right, width),
+        min(bottom, height),
+    )
+    if clipped == box:
+        return image.crop(box)
+
+    crop = Image.new(image.mode, (right - left, bottom - top), 'white')
+    if clipped[0] < clipped[2] and clipped[1] < clipped[3]:
+        crop.paste(image.crop(clipped), (clipped[0] - left, clipped[1] - top))
+    return crop
+
+
+def build_montage(image, boxes, gap=DEFAULT_GAP):
+    """
+    Returns the montage of the (left, top, right, bottom) boxes of the image
+    and the position of every box in it
+    """
+    image, _ = prepare(open_image(image))
+    if image.mode not in {'L', 'RGB'}:
+        image = image.convert('L' if image.mode == '1' else 'RGB')
+
+    crops = [crop_box(image, tuple(box)) for box in boxes]
+    sizes = [crop.size for crop in crops]
+    positions, size = shelf_pack(sizes, montage_width(sizes, gap), gap)
+
+    montage = Image.new(image.mode, size, 'white')
+    for crop, position in zip(crops, positions):
+        montage.paste(crop, position)
+    if 'dpi' in image.info:
+        montage.info['dpi'] = image.info['dpi']
+    return montage, positions
+
+
+def find_region(positions, sizes, x, y):
+    for index, ((left, top), (width, height)) in enumerate(
+        zip(positions, sizes),
+    ):
+        if left <= x < left + width and top <= y < top + height:
+            return index
+    return None
+
+
+def split_regions(tsv, boxes, positions):
+    """
+    Returns the TSV of the words of every region, in the coordinates of the
+    original image
+    """
+    sizes = [
+        (right - left, bottom - top) for left, top, right, bottom in boxes
+    ]
+    regions = [[] for _ in boxes]
+    for row in tsv.split('\n')[1:]:
+        cells = row.split('\t')
+        if len(cells) < 12 or cells[0] != '5':
+            continue
+
+        left, top, width, height = map(int, cells[6:10])
+        index = find_region(
+            positions,
+            sizes,
+            left + width // 2,
+            top + height // 2,
+        )
+        if index is None:
+            continue
+
+        (x, y), (box_left, box_top, _, _) = positions[index], boxes[index]
+        cells[6] = str(left - x + box_left)
+        cells[7] = str(top - y + box_top)
+        regions[index].append(cells)
+
+    return [
+        ''.join(f'{row}\n' for row in [TSV_HEADER, *map('\t'.join, rows)])
+        for rows in regions
+    ]
+
+
+def region_text(tsv):
+    """Returns the words of the TSV, one line of text per recognized line"""
+    lines, line_key = [], None
+    for row in tsv.split('\n')[1:]:
+        cells = row.split('\t')
+        if len(cells) < 12:
+            continue
+        if cells[2:5] != line_key:
+            lines.append([])
+            line_key = cells[2:5]
+        lines[-1].append(cells[11])
+    return '\n'.join(' '.join(words) for words in lines)
+
+
+def image_to_string_regions(
+    image,
+    boxes,
+    lang=None,
+    config='',
+    nice=0,
+    output_type=Output.STRING,
+    timeout=0,
+    gap=DEFAULT_GAP,
+    pandas_config=None,
+):
+    """
+    Returns the result of a single Tesseract OCR run on all the (left, top,
+    right, bottom) boxes of the image, one per box: the text for the string
+    and bytes output types, the words like image_to_data returns them, in
+    the coordinates of the image, for the others
+    """
+    if not boxes:
+        return []
+
+    if get_tesseract_version(cached=True) < TESSERACT_MIN_VERSION:
+        raise TSVNotSupported()
+
+    boxes = [tuple(map(int, box)) for box in boxes]
+    montage, positions = build_montage(image, boxes, gap)
+    tsv = run_and_get_output(
+        montage,
+        'tsv',
+        lang,
+        output_config(['tsv'], config),
+        nice,
+        timeout,
+    )
+    regions = split_regions(tsv, boxes, positions)
+
+    if output_type == Output.STRING:
+        return [region_text(region) for region in regions]
+    if output_type == Output.BYTES:
+        return [
+            region_text(region).encode(DEFAULT_ENCODING) for region in regions
+        ]
+    return [
+        convert_output(
+            region.encode(DEFAULT_ENCODING),
+            'tsv',
+            output_type,
+            pandas_config,
+        )
+        for region in regions
+    ]
@@ -0,0 +1,217 @@
+"""
+Resolution normalization of oversize images.
+
+Images far above the resolution tesseract needs (phone photos, high DPI
+scans) are downscaled to a target DPI, or to a target x-height of the text,
+before the OCR, with the matching --dpi. The DPI comes from the image info
+when it is plausible, from the measured height of the text lines otherwise.
+The coordinates of the tsv and box outputs are scaled back to the original
+image. Enable it with::
+
+    pytesseract.pytesseract.resolution_normalizer = ResolutionNormalizer()
+"""
+
+from __future__ import annotations
+
+from statistics import median
+
+from PIL import Image
+
+from .pytesseract import DEFAULT_ENCODING
+from .pytesseract import open_image
+
+# lower DPI values are mostly defaults of cameras and editors (72, 96)
+MIN_TRUSTED_DPI = 100
+# x-height in pixels of body text (10-12pt) scanned at 300 DPI
+BODY_X_HEIGHT = 20
+# ratio of the x-height to the height of a line of text, ascenders and
+# descenders included
+X_HEIGHT_RATIO = 0.5
+
+NORMALIZED_EXTENSIONS = {'box', 'tsv', 'txt'}
+
+
+def image_dpi(image):
+    """Returns the horizontal DPI of the image info, if trustworthy"""
+    dpi = image.info.get('dpi')
+    if not dpi or dpi[0] < MIN_TRUSTED_DPI:
+        return None
+    return float(dpi[0])
+
+
+def line_runs(profile, min_ink):
+    """Returns the lengths of the runs of inked rows of a row profile"""
+    runs, length = [], 0
+    for value in profile:
+        if value > min_ink:
+            length += 1
+        elif length:
+            runs.append(length)
+            length = 0
+    if length:
+        runs.append(length)
+    return runs
+
+
+def estimate_x_height(image, size=2048, strips=8, contrast=64):
+    """
+    Returns the estimated x-height in pixels of the text of the image, from
+    the median height of the text lines of vertical strips of a reduced
+    copy, or None when no text line is found
+    """
+    factor = max(1, max(image.size) // size)
+    gray = (image.reduce(factor) if factor > 1 else image).convert('L')
+
+    histogram = gray.histogram()
+    background = histogram.index(max(histogram))
+    ink = gray.point(
+        [
+            255 if abs(level - background) > contrast else 0
+            for level in range(256)
+        ],
+    )
+
+    # strips keep the lines of separate columns from blurring together
+    width, height = ink.size
+    runs = []
+    for index in range(strips):
+        left, right = index * width // strips, (index + 1) * width // strips
+        if right <= left:
+            continue
+        profile = ink.crop((left, 0, right, height)).resize(
+            (1, height),
+            Image.BOX,
+        )
+        # rows with at least 2% of ink pixels
+        runs.extend(run for run in line_runs(profile.tobytes(), 5) if run > 1)
+
+    if not runs:
+        return None
+    return median(runs) * factor * X_HEIGHT_RATIO
+
+
+class ResolutionNormalizer:
+    """
+    Downscales images whose resolution is above target_dpi, or whose text
+    x-height is above x_height pixels when set, unless it would keep more
+    than max_scale of the size
+    """
+
+    def __init__(self, target_dpi=300, x_height=None, max_scale=0.9):
+        self.target_dpi = target_dpi
+        self.x_height = x_height
+        self.max_scale = max_scale
+
+    def scale(self, image):
+        """Returns the scale factor and source DPI of the image, or None"""
+        dpi = image_dpi(image)
+        x_height = None
+        if self.x_height or dpi is None:
+            x_height = estimate_x_height(image)
+        if x_height is None and dpi is None:
+            return None
+
+        if dpi is None:
+            dpi = x_height * 300 / BODY_X_HEIGHT
+        if self.x_height and x_height:
+            return self.x_height / x_height, dpi
+        return self.target_dpi / dpi, dpi
+
+    def normalize(self, image, extension, config=''):
+        """
+        Returns the downscaled image and the config passing its DPI, or None
+        when the image is kept as it is
+        """
+        if extension not in NORMALIZED_EXTENSIONS or '--dpi' in config:
+            return None
+
+        try:
+            if isinstance(image, str):
+                with Image.open(image) as opened:
+                    if getattr(opened, 'n_frames', 1) > 1:
+                        return None
+                    opened.load()
+                    image = opened
+            else:
+                image = open_image(image)
+                if getattr(image, 'n_frames', 1) > 1:
+                    return None
+        except (OSError, TypeError):
+            return None
+
+        if image.mode in {'1', 'P'}:
+            image = image.convert('L' if image.mode == '1' else 'RGB')
+        scaled = self.scale(image)
+        if scaled is None or scaled[0] > self.max_scale:
+            return None
+
+        scale, dpi = scaled
+        size = (
+            max(1, round(image.width * scale)),
+            max(1, round(image.height * scale)),
+        )
+        small = image.resize(size, Image.LANCZOS, reducing_gap=3.0)
+        dpi = max(1, round(dpi * scale))
+        small.info['dpi'] = (dpi, dpi)
+        return small, f'--dpi {dpi} {config}'.strip(), image.size
+
+
+def rescale_tsv(tsv, size, small_size):
+    """Returns the TSV with the coordinates scaled from small_size to size"""
+    (width, height), (small_width, small_height) = size, small_size
+    scale_x, scale_y = width / small_width, height / small_height
+    rows = tsv.split('\n')
+    for index, row in enumerate(rows[1:], 1):
+        cells = row.split('\t')
+        if len(cells) < 12:
+            continue
+
+        if cells[0] == '1':
+            cells[6:10] = ['0', '0', str(width), str(height)]
+        else:
+            left, top, box_width, box_height = map(int, cells[6:10])
+            cells[6:10] = [
+                str(round(left * scale_x)),
+                str(round(top * scale_y)),
+                str(round(box_width * scale_x)),
+                str(round(box_height * scale_y)),
+            ]
+        rows[index] = '\t'.join(cells)
+    return '\n'.join(rows)
+
+
+def rescale_boxes(boxes, size, small_size):
+    """Returns the boxes with the coordinates scaled from small_size to size"""
+    (width, height), (small_width, small_height) = size, small_size
+    scale_x, scale_y = width / small_width, height / small_height
+    lines = boxes.split('\n')
+    for index, line in enumerate(lines):
+        cells = line.rsplit(' ', 5)
+        if len(cells) < 6:
+            continue
+
+        # the origin is the bottom left corner, which is kept by scaling
+        left, bottom, right, top = map(int, cells[1:5])
+        cells[1:5] = [
+            str(round(left * scale_x)),
+            str(round(bottom * scale_y)),
+            str(round(right * scale_x)),
+            str(round(top * scale_y)),
+        ]
+        lines[index] = ' '.join(cells)
+    return '\n'.join(lines)
+
+
+RESCALERS = {
+    'box': rescale_boxes,
+    'tsv': rescale_tsv,
+}
+
+
+def rescale_output(output, extension, size, small_size):
+    """Returns the output bytes in the coordinates of the original image"""
+    if extension not in RESCALERS:
+        return output
+    text = output.decode(DEFAULT_ENCODING)
+    rescaled = RESCALERS[extension](text, size, small_size)
+    return rescaled.encode(DEFAULT_ENCODING)
@@ -0,0 +1,486 @@
+"""
+Local OCR server.
+
+One server per host runs every OCR job in a bounded pool of workers::
+
+    pytesseract serve --port 8884 --workers 4 --queue-size 16
+    pytesseract serve --unix-socket /run/ocr.sock
+
+and the processes of the host send it their images through a
+pytesseract.client.OCRClient, whose image_to_* methods have the signatures
+of the library functions::
+
+    client = OCRClient('http://127.0.0.1:8884')
+    text = client.image_to_string('page.png', lang='eng')
+
+Jobs beyond the running and queued ones are rejected with a 429 response
+(QueueFullError in the client) instead of piling up. The server answers the
+raw tesseract output, the client converts it to the requested output type.
+The config of the clients is limited to --psm, --oem and allowed -c
+variables, so that they can't make tesseract read or write other files.
+GET /health returns the state of the pool as JSON and GET /metrics the
+counters and the OCRStats histograms in the Prometheus text format.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import stat
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from socketserver import ThreadingMixIn
+from socketserver import UnixStreamServer
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from threading import Thread
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+from . import pytesseract
+from .client import DEFAULT_HOST
+from .client import DEFAULT_PORT
+from .client import QueueFullError
+from .executor import OCRExecutor
+from .pytesseract import current_tesseract_cmd
+from .pytesseract import DEFAULT_ENCODING
+from .pytesseract import get_languages
+from .pytesseract import get_tesseract_version
+from .pytesseract import image_to_alto_xml
+from .pytesseract import image_to_boxes
+from .pytesseract import image_to_data
+from .pytesseract import image_to_osd
+from .pytesseract import image_to_pdf_or_hocr
+from .pytesseract import image_to_string
+from .pytesseract import LOGGER
+from .pytesseract import OCRStats
+from .pytesseract import Output
+from .pytesseract import split_config
+from .pytesseract import TesseractError
+from .pytesseract import TesseractNotFoundError
+from .stats import StatsAggregator
+
+
+MAX_REQUEST_BYTES = 256 << 20
+
+# the raw output of every served function
+FUNCTIONS = {
+    'image_to_alto_xml': image_to_alto_xml,
+    'image_to_boxes': lambda image, **kwargs: image_to_boxes(
+        image,
+        output_type=Output.BYTES,
+        **kwargs,
+    ),
+    'image_to_data': lambda image, **kwargs: image_to_data(
+        image,
+        output_type=Output.BYTES,
+        **kwargs,
+    ),
+    'image_to_osd': lambda image, **kwargs: image_to_osd(
+        image,
+        output_type=Output.BYTES,
+        **kwargs,
+    ),
+    'image_to_pdf_or_hocr': image_to_pdf_or_hocr,
+    'image_to_string': lambda image, **kwargs: image_to_string(
+        image,
+        output_type=Output.BYTES,
+        **kwargs,
+    ),
+}
+
+# query parameters of the served functions
+PARAMETERS = {
+    'config': str,
+    'extension': str,
+    'lang': str,
+    'nice': int,
+    'timeout': float,
+}
+
+# tesseract variables the clients can set with -c, the others could read or
+# write files as the server user (e.g. debug_file)
+ALLOWED_VARIABLES = frozenset(
+    {
+        'classify_bln_numeric_mode',
+        'load_freq_dawg',
+        'load_system_dawg',
+        'preserve_interword_spaces',
+        'tessedit_char_blacklist',
+        'tessedit_char_whitelist',
+        'tessedit_do_invert',
+        'textord_heavy_nr',
+        'textord_min_linesize',
+    },
+)
+# the unix socket is only accessible by the user of the server by default
+SOCKET_MODE = 0o600
+
+STATUS_CODES = {
+    'ALTONotSupported': 400,
+    'QueueFullError': 429,
+    'TesseractError': 422,
+    'TesseractNotFoundError': 503,
+    'TSVNotSupported': 400,
+    'TypeError': 400,
+    'ValueError': 400,
+}
+
+
+def checked_config(config, allowed_variables=ALLOWED_VARIABLES):
+    """
+    Returns the config of a client, raises ValueError unless it only holds
+    --psm and --oem options and -c variables of allowed_variables
+    """
+    tokens = iter(split_config(config))
+    for token in tokens:
+        value = next(tokens, '')
+        if token in {'--psm', '--oem'}:
+            if not value.isdigit():
+                raise ValueError(f'Invalid {token} value: {value!r}')
+        elif token == '-c':
+            name = value.partition('=')[0]
+            if name not in allowed_variables:
+                raise ValueError(f'Variable not allowed: {name!r}')
+        else:
+            raise ValueError(f'Option not allowed: {token!r}')
+    return config
+
+
+class UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+    socket_mode = SOCKET_MODE
+
+    def server_bind(self):
+        # only the socket of an earlier server is replaced
+        try:
+            mode = os.lstat(self.server_address).st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(mode):
+                raise FileExistsError(
+                    f'Not a unix socket: {self.server_address}',
+                )
+            os.remove(self.server_address)
+        super().server_bind()
+        os.chmod(self.server_address, self.socket_mode)
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'pytesseract'
+
+    def address_string(self):
+        # unix socket clients have no address
+        return self.client_address[0] if self.client_address else 'local'
+
+    def log_message(self, format, *args):
+        LOGGER.debug('%s %s', self.address_string(), format % args)
+
+    def send(self, code, body, content_type, headers=()):
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, code, value, headers=()):
+        body = json.dumps(value).encode(DEFAULT_ENCODING)
+        self.send(code, body, 'application/json', headers)
+
+    def send_error_json(self, error):
+        name = type(error).__name__
+        payload = {'error': name, 'message': str(error)}
+        if isinstance(error, TesseractError):
+            payload.update(status=error.status, message=error.message)
+        elif isinstance(error, TesseractNotFoundError):
+            payload['cmd'] = current_tesseract_cmd()
+        headers = [('Retry-After', '1')] if name == 'QueueFullError' else []
+        self.send_json(STATUS_CODES.get(name, 500), payload, headers)
+
+    def query(self):
+        url = urlsplit(self.path)
+        params = {
+            name: values[-1] for name, values in parse_qs(url.query).items()
+        }
+        return url.path.strip('/'), params
+
+    def do_GET(self):
+        ocr = self.server.ocr
+        route, params = self.query()
+        try:
+            if route == 'health':
+                self.send_json(200, ocr.health())
+            elif route == 'metrics':
+                self.send(
+                    200,
+                    ocr.prometheus().encode(DEFAULT_ENCODING),
+                    'text/plain; version=0.0.4',
+                )
+            elif route == 'languages':
+                config = checked_config(
+                    params.get('config', ''),
+                    ocr.allowed_variables,
+                )
+                languages = get_languages(config, cached=True)
+                self.send_json(200, languages)
+            elif route == 'version':
+                version = str(get_tesseract_version(cached=True))
+                self.send(200, version.encode(), 'text/plain')
+            else:
+                self.send_json(404, {'error': 'NotFound', 'message': route})
+        except Exception as e:
+            self.send_error_json(e)
+
+    def do_POST(self):
+        ocr = self.server.ocr
+        route, params = self.query()
+        if route not in FUNCTIONS:
+            self.close_connection = True
+            self.send_json(404, {'error': 'NotFound', 'message': route})
+            return
+
+        size = int(self.headers.get('Content-Length') or -1)
+        if not 0 < size <= ocr.max_request_bytes:
+            self.close_connection = True
+            self.send_json(
+                413 if size > 0 else 411,
+                {'error': 'ValueError', 'message': f'Invalid size: {size}'},
+            )
+            return
+        image = self.rfile.read(size)
+
+        unknown = set(params) - set(PARAMETERS)
+        try:
+            if unknown:
+                raise ValueError(f'Unknown parameters: {sorted(unknown)}')
+            kwargs = {
+                name: PARAMETERS[name](value) for name, value in params.items()
+            }
+            if 'config' in kwargs:
+                checked_config(kwargs['config'], ocr.allowed_variables)
+            output = ocr.run(route, image, kwargs)
+        except Exception as e:
+            self.send_error_json(e)
+        else:
+            self.send(200, output, 'application/octet-stream')
+
+
+class OCRServer:
+    """
+    HTTP server (TCP or unix socket) running the OCR jobs of its clients in
+    an OCRExecutor. At most workers + queue_size jobs are accepted at once,
+    the others are rejected right away. The config of the clients can only
+    hold --psm, --oem and -c allowed_variables, the unix socket is created
+    with the permissions of socket_mode
+    """
+
+    def __init__(
+        self,
+        host=DEFAULT_HOST,
+        port=DEFAULT_PORT,
+        unix_socket=None,
+        workers=None,
+        omp_threads=None,
+        queue_size=None,
+        max_request_bytes=MAX_REQUEST_BYTES,
+        allowed_variables=ALLOWED_VARIABLES,
+        socket_mode=SOCKET_MODE,
+    ):
+        self.executor = OCRExecutor(workers, omp_threads)
+        self.queue_size = (
+            2 * self.executor.workers if queue_size is None else queue_size
+        )
+        self.capacity = self.executor.workers + self.queue_size
+        self.max_request_bytes = max_request_bytes
+        self.allowed_variables = frozenset(allowed_variables)
+        self.aggregator = StatsAggregator()
+
+        self.pending = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self._lock = Lock()
+
+        if unix_socket:
+            self.httpd = UnixHTTPServer(
+                unix_socket,
+                RequestHandler,
+                bind_and_activate=False,
+            )
+            self.httpd.socket_mode = socket_mode
+            try:
+                self.httpd.server_bind()
+                self.httpd.server_activate()
+            except BaseException:
+                self.httpd.server_close()
+                raise
+        else:
+            self.httpd = ThreadingHTTPServer((host, port), RequestHandler)
+        self.httpd.ocr = self
+        self._thread = None
+
+    @property
+    def address(self):
+        return self.httpd.server_address
+
+    @property
+    def url(self):
+        if isinstance(self.address, str):
+            return f'unix:{self.address}'
+        host, port = self.address[:2]
+        return f'http://{host}:{port}'
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def start(self):
+        """Serves the requests in a background thread"""
+        self._thread = Thread(
+            target=self.httpd.serve_forever,
+            name='pytesseract-server',
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def shutdown(self):
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread.join()
+        self.httpd.server_close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.remove(self.address)
+        self.executor.shutdown()
+
+    def run(self, name, image, kwargs):
+        """
+        Returns the raw output of the function on the image bytes, raises
+        QueueFullError when the pool is saturated
+        """
+        with self._lock:
+            if self.pending >= self.capacity:
+                self.rejected += 1
+                raise QueueFullError()
+            self.pending += 1
+
+        try:
+            future = self.executor.submit(self._job, name, image, kwargs)
+        except BaseException:
+            self._done()
+            raise
+        future.add_done_callback(lambda _: self._done())
+        return future.result()
+
+    def _done(self):
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+
+    def _job(self, name, image, kwargs):
+        with self._lock:
+            self.running += 1
+        stats = OCRStats()
+        with NamedTemporaryFile(prefix='tess_', delete=False) as f:
+            f.write(image)
+        try:
+            return FUNCTIONS[name](f.name, stats=stats, **kwargs)
+        finally:
+            os.remove(f.name)
+            with self._lock:
+                self.running -= 1
+            self.aggregator(stats)
+
+    def health(self):
+        with self._lock:
+            return {
+                'status': 'ok',
+                'workers': self.executor.workers,
+                'queue_size': self.queue_size,
+                'pending': self.pending,
+                'running': self.running,
+                'queued': self.pending - self.running,
+                'completed': self.completed,
+                'rejected': self.rejected,
+            }
+
+    def prometheus(self, prefix='pytesseract'):
+        """Returns the pool gauges followed by the metrics of the jobs"""
+        health = self.health()
+        lines = []
+        for name in ('workers', 'queue_size', 'pending', 'running'):
+            lines.append(f'# TYPE {prefix}_server_{name} gauge')
+            lines.append(f'{prefix}_server_{name} {health[name]}')
+        for name in ('completed', 'rejected'):
+            lines.append(f'# TYPE {prefix}_server_{name}_total counter')
+            lines.append(f'{prefix}_server_{name}_total {health[name]}')
+        metrics = ''.join(f'{line}\n' for line in lines)
+        return metrics + self.aggregator.prometheus(prefix)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='pytesseract serve',
+        description='Runs a local OCR server with a bounded worker pool',
+    )
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix-socket', help='listen on a unix socket')
+    parser.add_argument(
+        '--socket-mode',
+        type=lambda mode: int(mode, 8),
+        default=SOCKET_MODE,
+        help='permissions of the unix socket, default: 600',
+    )
+    parser.add_argument(
+        '--allow-variable',
+        action='append',
+        default=[],
+        help='tesseract variable the clients can set with -c, besides '
+        'the default ones',
+    )
+    parser.add_argument('--workers', type=int, help='default: one per CPU')
+    parser.add_argument('--omp-threads', type=int)
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        help='jobs waiting for a worker, default: twice the workers',
+    )
+    parser.add_argument(
+        '--engine',
+        choices=('subprocess', 'libtesseract'),
+        default=pytesseract.engine,
+    )
+    parser.add_argument('--tesseract-cmd', default=pytesseract.tesseract_cmd)
+    args = parser.parse_args(args)
+
+    pytesseract.engine = args.engine
+    pytesseract.tesseract_cmd = args.tesseract_cmd
+    server = OCRServer(
+        args.host,
+        args.port,
+        args.unix_socket,
+        args.workers,
+        args.omp_threads,
+        args.queue_size,
+        allowed_variables=ALLOWED_VARIABLES | set(args.allow_variable),
+        socket_mode=args.socket_mode,
+    )
+    print(f'Serving OCR on {server.url}', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+    return 0
@@ -0,0 +1,156 @@
+"""
+Aggregation of the OCRStats of many calls into histograms.
+
+Install an aggregator as the hook receiving the stats of every call::
+
+    aggregator = StatsAggregator()
+    pytesseract.pytesseract.stats_hook = aggregator
+
+and export aggregator.export(), a dict of histograms with cumulative bucket
+counts, or aggregator.prometheus(), the Prometheus text format, to a
+metrics system.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from threading import Lock
+
+
+TIME_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+MEMORY_BUCKETS = tuple(1 << power for power in range(24, 33))  # 16MB-4GB
+PIXEL_BUCKETS = (1e5, 3e5, 1e6, 3e6, 1e7, 3e7, 1e8)
+BYTE_BUCKETS = (1e2, 1e3, 1e4, 1e5, 1e6, 1e7)
+
+COUNTERS = {'failed', 'processes'}
+
+
+def metric_buckets(name):
+    if name.endswith('_time'):
+        return TIME_BUCKETS
+    if name == 'max_rss':
+        return MEMORY_BUCKETS
+    if name == 'pixels':
+        return PIXEL_BUCKETS
+    return BYTE_BUCKETS
+
+
+class Histogram:
+    """Counts of the observed values per bucket, with their count and sum"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """Returns the (upper bound, count of values <= bound) pairs"""
+        total, pairs = 0, []
+        for bound, count in zip((*self.buckets, float('inf')), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def export(self):
+        return {
+            'buckets': self.cumulative(),
+            'count': self.count,
+            'sum': self.sum,
+        }
+
+
+class StatsAggregator:
+    """
+    Collects the OCRStats it is called with into one histogram per metric
+    (stage times, CPU times, peak memory, pixels, output bytes) and counts
+    the calls, failed calls and tesseract processes
+    """
+
+    def __init__(self, buckets=None):
+        self.buckets = buckets or {}
+        self.histograms = {}
+        self.calls = 0
+        self.failed = 0
+        self.processes = 0
+        self._lock = Lock()
+
+    def __call__(self, stats):
+        with self._lock:
+            self.calls += 1
+            self.failed += stats.failed
+            self.processes += stats.processes
+            for name, value in stats.as_dict().items():
+                if name in COUNTERS:
+                    continue
+                if name not in self.histograms:
+                    self.histograms[name] = Histogram(
+                        self.buckets.get(name) or metric_buckets(name),
+                    )
+                self.histograms[name].observe(value)
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.calls = self.failed = self.processes = 0
+
+    def export(self):
+        """Returns the counters and the histograms of every metric"""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'failed': self.failed,
+                'processes': self.processes,
+                'histograms': {
+                    name: histogram.export()
+                    for name, histogram in sorted(self.histograms.items())
+                },
+            }
+
+    def prometheus(self, prefix='pytesseract'):
+        """Returns the metrics in the Prometheus text exposition format"""
+        exported = self.export()
+        lines = []
+        for counter in ('calls', 'failed', 'processes'):
+            lines.append(f'# TYPE {prefix}_{counter}_total counter')
+            lines.append(f'{prefix}_{counter}_total {exported[counter]}')
+
+        for name, histogram in exported['histograms'].items():
+            metric = f'{prefix}_{metric_name(name)}'
+            lines.append(f'# TYPE {metric} histogram')
+            for bound, count in histogram['buckets']:
+                le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                lines.append(f'{metric}_bucket{{le="{le}"}} {count}')
+            lines.append(f'{metric}_sum {histogram["sum"]:g}')
+            lines.append(f'{metric}_count {histogram["count"]}')
+        return ''.join(f'{line}\n' for line in lines)
+
+
+def metric_name(name):
+    """Returns the metric name with its Prometheus base unit suffix"""
+    if name.endswith('_time'):
+        return f'{name[:-5]}_seconds'
+    if name == 'max_rss':
+        return 'max_rss_bytes'
+    return name
@@ -0,0 +1,217 @@
+"""
+Tiled OCR of very large images.
+
+The page is cut into a grid of overlapping tiles, preferably along the
+lightest rows and columns (the gaps between text lines and columns) found by
+a projection profile of the page. The tiles are recognized concurrently by
+an OCRExecutor and the TSV or box outputs are merged back in page
+coordinates. A word found in the overlap of two tiles is only kept by the
+tile whose core (the tile without the overlap) holds its center.
+"""
+
+from __future__ import annotations
+
+from PIL import Image
+
+from .executor import available_cpu_count
+from .executor import map_images
+from .pytesseract import DEFAULT_ENCODING
+from .pytesseract import open_image
+from .pytesseract import output_config
+from .pytesseract import run_and_get_output
+from .pytesseract import TSV_HEADER
+
+
+DEFAULT_OVERLAP = 64
+
+TILED_EXTENSIONS = {'box', 'tsv'}
+
+
+def ink_profile(image, axis):
+    """
+    Returns the mean darkness (0-255) of every row (axis 0) or column
+    (axis 1) of the image
+    """
+    gray = image.convert('L')
+    size = (1, gray.height) if axis == 0 else (gray.width, 1)
+    # the box filter averages every row/column in one pass
+    return [255 - value for value in gray.resize(size, Image.BOX).tobytes()]
+
+
+def cut_positions(profile, count):
+    """
+    Returns the positions splitting the profile into count bands of about
+    the same size, each one moved to the lightest row/column within a
+    quarter of a band from the even split
+    """
+    length = len(profile)
+    window = length // (4 * count)
+    cuts = [0]
+    for index in range(1, count):
+        ideal = index * length // count
+        low = max(cuts[-1] + 1, ideal - window)
+        high = min(length - 1, ideal + window)
+        if low > high:
+            continue
+        cuts.append(
+            min(
+                range(low, high + 1),
+                key=lambda position: (
+                    profile[position],
+                    abs(position - ideal),
+                ),
+            ),
+        )
+    cuts.append(length)
+    return cuts
+
+
+def tile_grid(image, tiles, overlap=DEFAULT_OVERLAP):
+    """
+    Returns the crop box (with the overlap) and the core box (without it) of
+    every tile, row by row. tiles is the number of horizontal strips or a
+    (rows, columns) pair
+    """
+    if isinstance(tiles, bool):
+        raise TypeError(f'Invalid tiles: {tiles}')
+    rows, columns = (tiles, 1) if isinstance(tiles, int) else tiles
+    if rows < 1 or columns < 1:
+        raise ValueError(f'Invalid tiles: {tiles}')
+
+    width, height = image.size
+    ys = (
+        cut_positions(ink_profile(image, 0), rows) if rows > 1 else [0, height]
+    )
+    xs = (
+        cut_positions(ink_profile(image, 1), columns)
+        if columns > 1
+        else [0, width]
+    )
+
+    grid = []
+    for top, bottom in zip(ys, ys[1:]):
+        for left, right in zip(xs, xs[1:]):
+            crop = (
+                max(0, left - overlap),
+                max(0, top - overlap),
+                min(width, right + overlap),
+                min(height, bottom + overlap),
+            )
+            grid.append((crop, (left, top, right, bottom)))
+    return grid
+
+
+def in_core(core, x, y):
+    left, top, right, bottom = core
+    return left <= x < right and top <= y < bottom
+
+
+def merge_tsv(outputs, grid, size):
+    """Returns the TSV outputs of the tiles as the TSV of a single page"""
+    width, height = size
+    rows = [f'1\t1\t0\t0\t0\t0\t0\t0\t{width}\t{height}\t-1\t']
+    block_offset = 0
+    for output, ((crop_left, crop_top, _, _), core) in zip(outputs, grid):
+        _, _, body = output.partition('\n')
+        last_block = 0
+        for row in body.split('\n'):
+            cells = row.split('\t')
+            if len(cells) < 12 or cells[0] == '1':
+                continue
+
+            left, top, box_width, box_height = map(int, cells[6:10])
+            left += crop_left
+            top += crop_top
+            block = int(cells[2])
+            last_block = max(last_block, block)
+            if not in_core(
+                core,
+                left + box_width // 2,
+                top + box_height // 2,
+            ):
+                continue
+
+            cells[2] = str(block + block_offset)
+            cells[6], cells[7] = str(left), str(top)
+            rows.append('\t'.join(cells))
+        block_offset += last_block
+
+    return ''.join(f'{row}\n' for row in [TSV_HEADER, *rows])
+
+
+def merge_boxes(outputs, grid, size):
+    """Returns the box outputs of the tiles as the boxes of a single page"""
+    _, height = size
+    lines = []
+    for output, ((crop_left, _, _, crop_bottom), core) in zip(outputs, grid):
+        # box coordinates start at the bottom of the image
+        offset_y = height - crop_bottom
+        for line in output.split('\n'):
+            cells = line.rsplit(' ', 5)
+            if len(cells) < 6:
+                continue
+
+            char, (left, bottom, right, top) = cells[0], map(int, cells[1:5])
+            left += crop_left
+            right += crop_left
+            bottom += offset_y
+            top += offset_y
+            if not in_core(
+                core,
+                (left + right) // 2,
+                height - (bottom + top) // 2,
+            ):
+                continue
+
+            lines.append(f'{char} {left} {bottom} {right} {top} 0')
+
+    return ''.join(f'{line}\n' for line in lines)
+
+
+MERGERS = {
+    'box': merge_boxes,
+    'tsv': merge_tsv,
+}
+
+
+def tiled_ocr(
+    image,
+    extension='tsv',
+    tiles=None,
+    overlap=DEFAULT_OVERLAP,
+    lang=None,
+    config='',
+    nice=0,
+    timeout=0,
+    workers=None,
+    return_bytes=False,
+    cache=True,
+):
+    """
+    Returns the TSV or box output of the image recognized tile by tile, in
+    page coordinates. tiles defaults to one horizontal strip per worker,
+    as does tiles=True.
+    The stitched output is never cached, the output of every tile is (keyed
+    by its pixels, so by the grid and overlap) unless cache is False
+    """
+    if extension not in TILED_EXTENSIONS:
+        raise ValueError(f'Unsupported extension: {extension}')
+
+    image = open_image(image)
+    if tiles is None or tiles is True:
+        tiles = workers or available_cpu_count()
+    grid = tile_grid(image, tiles, overlap)
+
+    outputs = map_images(
+        run_and_get_output,
+        (image.crop(crop) for crop, _ in grid),
+        workers=workers,
+        extension=extension,
+        lang=lang,
+        config=output_config([extension], config),
+        nice=nice,
+        timeout=timeout,
+        cache=cache,
+    )
+    output = MERGERS[extension](list(outputs), grid, image.size)
+    return output.encode(DEFAULT_ENCODING) if return_bytes else output
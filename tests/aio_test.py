@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+from os import path
+from sys import platform
+from unittest import mock
+
+import pytest
+
+from pytesseract import aio
+from pytesseract import image_to_boxes
+from pytesseract import image_to_osd
+from pytesseract import image_to_string
+from pytesseract import Output
+
+try:
+    from PIL import Image
+except ImportError:
+    import Image
+
+
+TESTS_DIR = path.dirname(path.abspath(__file__))
+DATA_DIR = path.join(TESTS_DIR, 'data')
+TEST_JPEG = path.join(DATA_DIR, 'test.jpg')
+
+
+@pytest.fixture
+def slow_tesseract(tmp_path, monkeypatch, tesseract_script):
+    script = tesseract_script(tmp_path, run='exec sleep 30')
+    monkeypatch.setattr('pytesseract.pytesseract.tesseract_cmd', script)
+    return script
+
+
+@pytest.fixture
+def spawned(monkeypatch):
+    processes = []
+    create_subprocess_exec = asyncio.create_subprocess_exec
+
+    async def spy(*args, **kwargs):
+        proc = await create_subprocess_exec(*args, **kwargs)
+        processes.append(proc)
+        return proc
+
+    monkeypatch.setattr('asyncio.create_subprocess_exec', spy)
+    return processes
+
+
+@pytest.mark.pytesseract
+@pytest.mark.parametrize(
+    'test_file',
+    [TEST_JPEG, Image.open(TEST_JPEG)],
+    ids=['path_str', 'image_object'],
+)
+def test_image_to_string(test_file):
+    result = asyncio.run(aio.image_to_string(test_file))
+    assert result == image_to_string(test_file)
+
+
+@pytest.mark.pytesseract
+@pytest.mark.parametrize(
+    ('aio_func', 'func'),
+    [(aio.image_to_boxes, image_to_boxes), (aio.image_to_osd, image_to_osd)],
+    ids=['boxes', 'osd'],
+)
+@pytest.mark.parametrize('output', [Output.BYTES, Output.DICT, Output.STRING])
+def test_output_types(aio_func, func, output):
+    result = asyncio.run(aio_func(TEST_JPEG, output_type=output))
+    assert result == func(TEST_JPEG, output_type=output)
+
+
+@pytest.mark.pytesseract
+def test_image_to_pdf_or_hocr():
+    result = asyncio.run(aio.image_to_pdf_or_hocr(TEST_JPEG))
+    assert result.startswith(b'%PDF')
+
+
+@pytest.mark.skipif(platform.startswith('win32'), reason='uses a sh script')
+def test_timeout_kills_process(slow_tesseract, spawned):
+    with pytest.raises(RuntimeError):
+        asyncio.run(aio.image_to_string(TEST_JPEG, timeout=0.1))
+
+    (proc,) = spawned
+    assert proc.returncode is not None
+
+
+@pytest.mark.skipif(platform.startswith('win32'), reason='uses a sh script')
+def test_cancel_kills_process(slow_tesseract, spawned):
+    async def cancel():
+        task = asyncio.ensure_future(aio.image_to_string(TEST_JPEG))
+        while not spawned:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel())
+    (proc,) = spawned
+    assert proc.returncode is not None
+
+
+@pytest.mark.skipif(platform.startswith('win32'), reason='uses a sh script')
+def test_max_processes(slow_tesseract, spawned, monkeypatch):
+    monkeypatch.setattr('pytesseract.aio.max_processes', 2)
+
+    async def run_many():
+        tasks = [
+            asyncio.ensure_future(aio.image_to_string(TEST_JPEG))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0.5)
+        running = len(spawned)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return running
+
+    assert asyncio.run(run_many()) == 2
+
+
+@pytest.mark.skipif(platform.startswith('win32'), reason='uses a sh script')
+def test_encode_waits_for_process_slot(slow_tesseract, spawned, monkeypatch):
+    monkeypatch.setattr('pytesseract.aio.max_processes', 1)
+    encoded = []
+
+    def encode(image):
+        encoded.append(image)
+        return '-', b'image'
+
+    monkeypatch.setattr('pytesseract.aio.encode', encode)
+
+    async def run_many():
+        tasks = [
+            asyncio.ensure_future(aio.image_to_string(TEST_JPEG))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.5)
+        count = len(encoded)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return count
+
+    assert asyncio.run(run_many()) == 1
+
+
+def test_tesseract_not_found(monkeypatch):
+    monkeypatch.setattr(
+        'pytesseract.pytesseract.tesseract_cmd',
+        'wrong_tesseract',
+    )
+    with pytest.raises(aio.TesseractNotFoundError):
+        asyncio.run(aio.image_to_string(TEST_JPEG))
+
+
+def test_unsupported_output_type():
+    with mock.patch('pytesseract.aio.run_and_get_output') as run_mock:
+        with pytest.raises(KeyError):
+            asyncio.run(aio.image_to_string(TEST_JPEG, output_type='invalid'))
+        run_mock.assert_not_called()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import sys
+
+import pytest
+from PIL import Image
+
+from pytesseract import pytesseract as pytesseract_module
+from pytesseract.batch import iter_inputs
+from pytesseract.batch import main
+
+
+pytestmark = [
+    pytest.mark.usefixtures('fake_tesseract'),
+    pytest.mark.fake_tesseract_words(3),
+]
+
+
+@pytest.fixture
+def scans(tmp_path):
+    directory = tmp_path / 'scans'
+    (directory / 'b').mkdir(parents=True)
+    for name in ['a.png', 'b/c.png', 'b/d.tiff']:
+        Image.new('L', (60, 40), 255).save(directory / name)
+    (directory / 'notes.txt').write_text('not an image')
+    return directory
+
+
+def test_iter_inputs(scans, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manifest = tmp_path / 'manifest.txt'
+    manifest.write_text('scans/a.png\n\n/elsewhere/e.jpg\n')
+    assert list(iter_inputs(['scans', 'scans/b/*.png'], str(manifest))) == [
+        ('scans/a.png', 'a'),
+        ('scans/b/c.png', 'b/c'),
+        ('scans/b/d.tiff', 'b/d'),
+        ('scans/b/c.png', 'scans/b/c'),
+        ('scans/a.png', 'scans/a'),
+        ('/elsewhere/e.jpg', 'e'),
+    ]
+
+
+def test_batch_output_dir(scans, tmp_path, capsys):
+    output_dir = tmp_path / 'out'
+    code = main(
+        [str(scans), '--format', 'json', '--output-dir', str(output_dir)]
+    )
+    assert code == 0
+    assert sorted(
+        str(name.relative_to(output_dir)) for name in output_dir.rglob('*.*')
+    ) == ['a.json', 'b/c.json', 'b/d.json']
+    with open(output_dir / 'b' / 'c.json') as f:
+        assert json.load(f)['text'][-3:] == ['word0', 'word1', 'word2']
+
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert '3 files (0 failed, 0 skipped), 3 pages' in captured.err
+
+
+def test_batch_jsonl_checkpoint(scans, tmp_path, capsys):
+    results = tmp_path / 'results.jsonl'
+    checkpoint = tmp_path / 'done.txt'
+    missing = str(scans / 'missing.png')
+    args = [
+        str(scans / 'b'),
+        missing,
+        '--jsonl',
+        str(results),
+        '--checkpoint',
+        str(checkpoint),
+        '--workers',
+        '2',
+    ]
+    assert main(args) == 1
+    records = [json.loads(line) for line in results.read_text().splitlines()]
+    assert [record['path'] for record in records] == [
+        str(scans / 'b' / 'c.png'),
+        str(scans / 'b' / 'd.tiff'),
+        missing,
+    ]
+    assert records[0]['output'] == 'word0 word1 word2\n\f'
+    assert records[0]['pages'] == 1
+    assert 'TesseractError' in records[2]['error']
+    assert len(checkpoint.read_text().splitlines()) == 2
+    assert '3 files (1 failed, 0 skipped)' in capsys.readouterr().err
+
+    # resumed, only the failed file runs again
+    assert main(args) == 1
+    assert len(results.read_text().splitlines()) == 4
+    assert '1 files (1 failed, 2 skipped)' in capsys.readouterr().err
+
+
+def test_batch_stdout(scans, capsys, monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['pytesseract', 'batch', str(scans)])
+    assert pytesseract_module.main() == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)['path'] for line in lines] == [
+        str(scans / 'a.png'),
+        str(scans / 'b' / 'c.png'),
+        str(scans / 'b' / 'd.tiff'),
+    ]
+
+
+def test_batch_duplicate_output_names(scans, tmp_path, capsys):
+    other = tmp_path / 'other'
+    other.mkdir()
+    Image.new('L', (60, 40), 0).save(other / 'a.png')
+    output_dir = tmp_path / 'out'
+    sources = [str(scans / 'a.png'), str(other / 'a.png')]
+    code = main([*sources, '--output-dir', str(output_dir)])
+    assert code == 1
+    assert [path.name for path in output_dir.iterdir()] == ['a.txt']
+
+    err = capsys.readouterr().err
+    assert f"{other / 'a.png'}: ValueError: output name 'a'" in err
+    assert '2 files (1 failed, 0 skipped), 1 pages' in err
+
+
+def test_batch_no_sources(capsys):
+    with pytest.raises(SystemExit):
+        main([])
+    assert 'no images' in capsys.readouterr().err
+
+
+def test_batch_pdf_output_dir(scans, tmp_path):
+    output_dir = tmp_path / 'out'
+    args = [str(scans / 'a.png'), '--format', 'pdf']
+    assert main([*args, '--output-dir', str(output_dir)]) == 0
+    assert (output_dir / 'a.pdf').read_bytes().startswith(b'%PDF')
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from os import path
+from unittest import mock
+
+import pytest
+from PIL import Image
+from PIL import ImageDraw
+
+from pytesseract import image_to_boxes
+from pytesseract import image_to_data
+from pytesseract import image_to_string
+from pytesseract import Output
+from pytesseract import pytesseract as pytesseract_module
+from pytesseract.blank import BlankPageFilter
+from pytesseract.blank import page_stats
+
+
+TESTS_DIR = path.dirname(path.abspath(__file__))
+DATA_DIR = path.join(TESTS_DIR, 'data')
+TEST_JPEG = path.join(DATA_DIR, 'test.jpg')
+
+
+@pytest.fixture
+def blank_filter():
+    blank_filter = BlankPageFilter()
+    with mock.patch.object(
+        pytesseract_module, 'blank_page_filter', blank_filter
+    ):
+        yield blank_filter
+
+
+@pytest.fixture
+def no_tesseract():
+    with mock.patch.object(
+        pytesseract_module,
+        'run_tesseract',
+        side_effect=AssertionError('tesseract ran'),
+    ) as run:
+        yield run
+
+
+def specks(size=(800, 1000)):
+    image = Image.new('L', size, 250)
+    draw = ImageDraw.Draw(image)
+    # scanner dust and a punch hole
+    for x, y in [(100, 100), (400, 700), (650, 300)]:
+        draw.point((x, y), fill=0)
+    draw.ellipse((30, 480, 50, 500), fill=20)
+    return image
+
+
+@pytest.mark.parametrize(
+    'image',
+    [
+        Image.new('L', (800, 1000), 255),
+        Image.new('RGB', (640, 480), (20, 60, 200)),
+        specks(),
+    ],
+    ids=['white', 'solid_color', 'specks'],
+)
+def test_is_blank(image):
+    assert BlankPageFilter().is_blank(image)
+
+
+def test_not_blank():
+    assert not BlankPageFilter().is_blank(TEST_JPEG)
+    assert not BlankPageFilter().is_blank(Image.open(TEST_JPEG))
+
+
+def test_page_stats_unreadable():
+    assert page_stats('/does/not/exist.png') is None
+    assert not BlankPageFilter().is_blank('/does/not/exist.png')
+
+
+@pytest.mark.usefixtures('no_tesseract')
+def test_blank_page_outputs(blank_filter):
+    image = Image.new('L', (300, 200), 255)
+
+    assert image_to_string(image) == '\f'
+    assert image_to_boxes(image) == ''
+    data = image_to_data(image, output_type=Output.DICT)
+    assert data['level'] == [1]
+    assert data['width'] == [300] and data['height'] == [200]
+    assert data['text'] == ['']
+    assert blank_filter.stats == {'checked': 3, 'skipped': 3}
+
+
+def test_blank_page_filter_falls_through(blank_filter, no_tesseract):
+    with pytest.raises(AssertionError, match='tesseract ran'):
+        image_to_string(TEST_JPEG)
+    assert no_tesseract.called
+    assert blank_filter.stats == {'checked': 1, 'skipped': 0}
+
+
+def test_blank_page_filter_multi_page(blank_filter, tmp_path):
+    # a blank separator sheet followed by a page of text
+    filename = str(tmp_path / 'document.tiff')
+    separator = Image.new('L', (800, 1000), 255)
+    with Image.open(TEST_JPEG) as text:
+        separator.save(
+            filename,
+            save_all=True,
+            append_images=[text.convert('L')],
+        )
+
+    assert page_stats(filename) is None
+    assert blank_filter.blank_output(filename, 'txt') is None
+    with Image.open(filename) as opened:
+        assert blank_filter.blank_output(opened, 'txt') is None
+
+
+def test_blank_page_filter_other_formats(blank_filter):
+    image = Image.new('L', (300, 200), 255)
+    assert blank_filter.blank_output(image, 'hocr') is None
+    assert blank_filter.blank_output(image, 'pdf') is None
+    assert blank_filter.stats == {'checked': 0, 'skipped': 0}
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from os import path
+from unittest import mock
+
+import pytest
+
+from pytesseract import image_to_string
+from pytesseract import run_and_get_multiple_output
+from pytesseract.blank import BlankPageFilter
+from pytesseract.cache import image_digest
+from pytesseract.cache import ResultCache
+from pytesseract.pytesseract import numpy_installed
+from pytesseract.resolution import ResolutionNormalizer
+
+if numpy_installed:
+    import numpy as np
+
+try:
+    from PIL import Image
+except ImportError:
+    import Image
+
+
+TESTS_DIR = path.dirname(path.abspath(__file__))
+DATA_DIR = path.join(TESTS_DIR, 'data')
+TEST_JPEG = path.join(DATA_DIR, 'test.jpg')
+
+
+@pytest.fixture(autouse=True)
+def tesseract_version():
+    with mock.patch(
+        'pytesseract.cache.get_tesseract_version',
+        return_value='5.3.0',
+    ):
+        yield
+
+
+@pytest.fixture
+def result_cache(monkeypatch):
+    result_cache = ResultCache()
+    monkeypatch.setattr('pytesseract.pytesseract.result_cache', result_cache)
+    return result_cache
+
+
+@pytest.fixture
+def run_tesseract(monkeypatch):
+    monkeypatch.setattr('pytesseract.pytesseract.use_pipes', True)
+    with mock.patch(
+        'pytesseract.pytesseract.run_tesseract',
+        return_value=b'This is a test\n\f',
+    ) as run_mock:
+        yield run_mock
+
+
+def test_image_digest():
+    image = Image.open(TEST_JPEG)
+    assert image_digest(image) == image_digest(image.copy())
+    assert image_digest(image) != image_digest(image.convert('RGB'))
+    assert image_digest(TEST_JPEG) == image_digest(TEST_JPEG)
+    assert image_digest(TEST_JPEG) != image_digest(image)
+    assert image_digest(path.join(DATA_DIR, 'images.txt')) is None
+    assert image_digest(1) is None
+
+
+def test_image_digest_palette():
+    black = Image.new('P', (20, 10))
+    black.putpalette([0, 0, 0, 255, 255, 255])
+    white = black.copy()
+    white.putpalette([255, 255, 255, 0, 0, 0])
+    assert image_digest(black) != image_digest(white)
+
+    transparent = black.copy()
+    transparent.info['transparency'] = 0
+    assert image_digest(black) != image_digest(transparent)
+
+
+@pytest.mark.skipif(numpy_installed is False, reason='requires numpy')
+def test_image_digest_numpy():
+    array = np.array(Image.open(TEST_JPEG))
+    assert image_digest(array) == image_digest(array.copy())
+    assert image_digest(array[:, ::2]) == image_digest(array[:, ::2].copy())
+    assert image_digest(array) != image_digest(array[:-1])
+
+    digest = image_digest(array)
+    with mock.patch('pytesseract.pytesseract.ndarray_channel_order', 'BGR'):
+        assert image_digest(array) != digest
+
+
+def test_keys(result_cache):
+    (key,) = result_cache.keys(TEST_JPEG, 'eng', '--psm 6  --oem 1', ['txt'])
+    assert result_cache.keys(TEST_JPEG, 'eng', '--psm 6 --oem 1', ['txt']) == [
+        key,
+    ]
+    assert key not in result_cache.keys(TEST_JPEG, 'fra', '--psm 6', ['txt'])
+    assert key not in result_cache.keys(TEST_JPEG, 'eng', '--psm 6', ['tsv'])
+    assert key not in result_cache.keys(
+        TEST_JPEG,
+        'eng',
+        '--psm 6 --oem 1',
+        ['txt', 'box'],
+    )
+    with mock.patch('pytesseract.pytesseract.intermediate_format', 'PNG'):
+        assert key not in result_cache.keys(
+            TEST_JPEG,
+            'eng',
+            '--psm 6 --oem 1',
+            ['txt'],
+        )
+
+
+@pytest.mark.parametrize(
+    ('name', 'value'),
+    [
+        ('engine', 'libtesseract'),
+        ('resolution_normalizer', ResolutionNormalizer()),
+        ('blank_page_filter', BlankPageFilter()),
+    ],
+)
+def test_keys_pipeline_settings(result_cache, monkeypatch, name, value):
+    (key,) = result_cache.keys(TEST_JPEG, 'eng', '', ['txt'])
+    monkeypatch.setattr(f'pytesseract.pytesseract.{name}', value)
+    (other,) = result_cache.keys(TEST_JPEG, 'eng', '', ['txt'])
+    assert other != key
+    if name != 'engine':
+        # other settings of the same stage
+        value.contrast = value.max_scale = 0.5
+        assert result_cache.keys(TEST_JPEG, 'eng', '', ['txt']) != [other]
+
+
+def test_memory_lru():
+    result_cache = ResultCache(max_entries=2)
+    result_cache.set('a', b'1')
+    result_cache.set('b', b'2')
+    assert result_cache.get('a') == b'1'
+    result_cache.set('c', b'3')
+
+    assert result_cache.get('b') is None
+    assert result_cache.get('a') == b'1'
+    assert result_cache.get('c') == b'3'
+    assert result_cache.stats['hits'] == 3
+    assert result_cache.stats['misses'] == 1
+    assert result_cache.stats['evictions'] == 1
+
+
+def test_memory_max_bytes():
+    result_cache = ResultCache(max_bytes=10)
+    result_cache.set('a', b'12345')
+    result_cache.set('b', b'12345')
+    result_cache.set('c', b'12345')
+    result_cache.set('d', b'12345678901')
+    assert result_cache.stats['entries'] == 2
+    assert result_cache.stats['bytes'] == 10
+    assert result_cache.get('a') is None
+
+
+def test_disk_tier(tmp_path):
+    result_cache = ResultCache(directory=str(tmp_path))
+    result_cache.set('abcdef', b'text')
+
+    result_cache = ResultCache(directory=str(tmp_path))
+    assert result_cache.stats['disk_bytes'] == 4
+    assert result_cache.get('abcdef') == b'text'
+    assert result_cache.stats['disk_hits'] == 1
+    assert result_cache.get('abcdef') == b'text'
+    assert result_cache.stats['disk_hits'] == 1
+
+    result_cache.clear()
+    assert result_cache.get('abcdef') is None
+    assert list(tmp_path.glob('*/*')) == []
+
+
+def test_disk_eviction(tmp_path):
+    result_cache = ResultCache(max_entries=1, directory=str(tmp_path))
+    result_cache.max_disk_bytes = 25
+    for key in ('aa1', 'aa2', 'bb3'):
+        result_cache.set(key, b'0123456789')
+
+    assert result_cache.stats['disk_evictions'] == 1
+    assert result_cache.stats['disk_bytes'] == 20
+    assert result_cache.get('aa1') is None
+    assert result_cache.get('bb3') == b'0123456789'
+
+
+def test_run_and_get_output_cache(result_cache, run_tesseract):
+    image = Image.open(TEST_JPEG)
+    assert image_to_string(image) == 'This is a test\n\f'
+    assert image_to_string(image.copy()) == 'This is a test\n\f'
+    assert run_tesseract.call_count == 1
+    assert result_cache.stats['hits'] == 1
+
+    image_to_string(image, cache=False)
+    image_to_string(image, lang='fra')
+    assert run_tesseract.call_count == 3
+
+
+def test_run_and_get_multiple_output_cache(result_cache):
+    outputs = [b'This is a test\n\f', b'%PDF-1.5']
+    with mock.patch(
+        'pytesseract.pytesseract.save',
+    ) as save_mock, mock.patch(
+        'pytesseract.pytesseract.run_tesseract',
+    ) as run_mock, mock.patch(
+        'pytesseract.pytesseract._read_output',
+        side_effect=outputs * 2,
+    ):
+        save_mock.return_value.__enter__.return_value = ('tess_', TEST_JPEG)
+        for _ in range(2):
+            assert run_and_get_multiple_output(TEST_JPEG, ['txt', 'pdf']) == [
+                'This is a test\n\f',
+                b'%PDF-1.5',
+            ]
+    run_mock.assert_called_once()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import os
+from unittest import mock
+
+import pytest
+from packaging.version import Version
+
+from pytesseract import get_languages
+from pytesseract import get_output_formats
+from pytesseract import get_tesseract_version
+from pytesseract import pytesseract as pytesseract_module
+from pytesseract.pytesseract import tesseract_identity
+
+
+pytestmark = pytest.mark.skipif(
+    os.name == 'nt',
+    reason='shell script tesseract binaries',
+)
+
+
+@pytest.fixture(autouse=True)
+def capabilities(monkeypatch):
+    capabilities = {}
+    monkeypatch.setattr(pytesseract_module, '_capabilities', capabilities)
+    monkeypatch.setattr(pytesseract_module, 'capability_cache_dir', None)
+    return capabilities
+
+
+@pytest.fixture
+def tesseract(monkeypatch, tmp_path, tesseract_script):
+    cmd = tesseract_script(tmp_path / 'bin', languages=('deu', 'eng'))
+    monkeypatch.setattr(pytesseract_module, 'tesseract_cmd', cmd)
+    return cmd
+
+
+@pytest.mark.usefixtures('tesseract')
+def test_cached_probe_runs_once():
+    version = get_tesseract_version(cached=True)
+    assert version == Version('5.3.0')
+    with mock.patch('subprocess.check_output') as check_output:
+        assert get_tesseract_version(cached=True) == version
+        assert not check_output.called
+
+        # uncached calls always probe
+        check_output.return_value = b'tesseract 5.3.1'
+        assert get_tesseract_version() == Version('5.3.1')
+        assert get_tesseract_version(cached=True) == Version('5.3.1')
+
+
+def test_cache_keyed_by_binary(
+    monkeypatch,
+    tmp_path,
+    tesseract,
+    tesseract_script,
+):
+    assert get_tesseract_version(cached=True) == Version('5.3.0')
+
+    other = tesseract_script(tmp_path / 'other', '4.1.1', ('fra',))
+    monkeypatch.setattr(pytesseract_module, 'tesseract_cmd', other)
+    assert get_tesseract_version(cached=True) == Version('4.1.1')
+    assert get_languages(cached=True) == ['fra']
+    assert 'xml' in get_output_formats()
+
+    # an upgraded binary in place
+    tesseract_script(tmp_path / 'other', '5.0.0-long-version', ('fra',))
+    assert get_tesseract_version(cached=True) == Version('5.0.0')
+
+
+def test_cache_keyed_by_tessdata_dir(monkeypatch, tmp_path, tesseract):
+    (tmp_path / 'fast').mkdir()
+    (tmp_path / 'best').mkdir()
+    monkeypatch.delenv('TESSDATA_PREFIX', raising=False)
+
+    identities = {
+        tesseract_identity(config)
+        for config in [
+            '',
+            f'--tessdata-dir {tmp_path}/fast',
+            f'--tessdata-dir {tmp_path}/best --psm 6',
+        ]
+    }
+    assert len(identities) == 3
+    assert tesseract_identity('--psm 6') == tesseract_identity('')
+
+
+def test_missing_binary(monkeypatch):
+    monkeypatch.setattr(
+        pytesseract_module,
+        'tesseract_cmd',
+        '/does/not/exist/tesseract',
+    )
+    assert tesseract_identity() is None
+    with pytest.raises(pytesseract_module.TesseractNotFoundError):
+        get_tesseract_version(cached=True)
+
+
+@pytest.mark.usefixtures('tesseract')
+def test_disk_cache(monkeypatch, tmp_path, capabilities):
+    directory = tmp_path / 'capabilities'
+    monkeypatch.setattr(
+        pytesseract_module,
+        'capability_cache_dir',
+        str(directory),
+    )
+    assert get_languages(cached=True) == ['deu', 'eng']
+    assert get_tesseract_version(cached=True) == Version('5.3.0')
+    assert len(list(directory.glob('*.json'))) == 2
+
+    # a new process, without any probe subprocess
+    capabilities.clear()
+    with mock.patch('subprocess.check_output') as check_output, mock.patch(
+        'subprocess.run',
+    ) as run:
+        assert get_tesseract_version(cached=True) == Version('5.3.0')
+        assert get_languages(cached=True) == ['deu', 'eng']
+        assert not check_output.called and not run.called
+
+
+@pytest.mark.usefixtures('tesseract')
+def test_disk_cache_invalid_entry(monkeypatch, tmp_path):
+    directory = tmp_path / 'capabilities'
+    directory.mkdir()
+    monkeypatch.setattr(
+        pytesseract_module,
+        'capability_cache_dir',
+        str(directory),
+    )
+    key = ('get_tesseract_version', *tesseract_identity())
+    with open(pytesseract_module._capability_file(key), 'w') as f:
+        f.write('{"key": ')
+    assert get_tesseract_version(cached=True) == Version('5.3.0')
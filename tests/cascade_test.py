@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from os import path
+from unittest import mock
+
+import pytest
+from PIL import Image
+
+from pytesseract import image_to_data
+from pytesseract import Output
+from pytesseract.cascade import ConfidenceCascade
+from pytesseract.pytesseract import TSV_HEADER
+
+
+TESTS_DIR = path.dirname(path.abspath(__file__))
+DATA_DIR = path.join(TESTS_DIR, 'data')
+TEST_JPEG = path.join(DATA_DIR, 'test.jpg')
+
+FAST_TSV = '\n'.join(
+    [
+        TSV_HEADER,
+        '1\t1\t0\t0\t0\t0\t0\t0\t400\t200\t-1\t',
+        '2\t1\t1\t0\t0\t0\t10\t10\t300\t100\t-1\t',
+        '3\t1\t1\t1\t0\t0\t10\t10\t300\t100\t-1\t',
+        '4\t1\t1\t1\t1\t0\t10\t10\t300\t30\t-1\t',
+        '5\t1\t1\t1\t1\t1\t10\t10\t100\t30\t95.1\tThe',
+        '5\t1\t1\t1\t1\t2\t120\t10\t100\t30\t91.0\tquick',
+        '4\t1\t1\t1\t2\t0\t10\t80\t300\t30\t-1\t',
+        '5\t1\t1\t1\t2\t1\t10\t80\t100\t30\t92.4\tbr0wn',
+        '5\t1\t1\t1\t2\t2\t120\t80\t190\t30\t21.7\tf0xjumps',
+        '',
+    ],
+)
+
+
+def best_tsv(*words):
+    rows = [TSV_HEADER, '1\t1\t0\t0\t0\t0\t0\t0\t308\t38\t-1\t']
+    for index, (left, conf, text) in enumerate(words, 1):
+        rows.append(
+            f'5\t1\t1\t1\t1\t{index}\t{left}\t4\t90\t30\t{conf}\t{text}'
+        )
+    return '\n'.join(rows) + '\n'
+
+
+@pytest.fixture
+def run():
+    with mock.patch('pytesseract.cascade.run_and_get_output') as run:
+        yield run
+
+
+def outputs(best):
+    def run_and_get_output(image, *args, config='', **kwargs):
+        if '--psm 7' in (config or args[2]):
+            return best
+        return FAST_TSV
+
+    return run_and_get_output
+
+
+def test_cascade_replaces_low_confidence_lines(run):
+    run.side_effect = outputs(best_tsv((4, 96.0, 'brown'), (110, 94.5, 'fox')))
+    cascade = ConfidenceCascade('--oem 1', '--tessdata-dir best')
+    image = Image.new('L', (400, 200), 255)
+
+    rows = [row.split('\t') for row in cascade.run(image).split('\n')[1:-1]]
+    words = [(cells[4], cells[11]) for cells in rows if cells[0] == '5']
+    assert words == [
+        ('1', 'The'),
+        ('1', 'quick'),
+        ('2', 'brown'),
+        ('2', 'fox'),
+    ]
+    # crop of the line with the default 4 pixels of padding
+    fox = rows[-1]
+    assert fox[5:10] == ['2', '116', '80', '90', '30']
+    assert cascade.stats == {'lines': 2, 'escalated': 1, 'replaced': 1}
+
+    fast_call, best_call = run.call_args_list
+    assert '--oem 1' in fast_call.args[3]
+    assert best_call.kwargs['config'].startswith('--psm 7 ')
+    assert '--tessdata-dir best' in best_call.kwargs['config']
+    assert best_call.args[0].size == (308, 38)
+
+
+def test_cascade_keeps_more_confident_fast_words(run):
+    run.side_effect = outputs(best_tsv((4, 20.0, 'bnown'), (110, 10.0, '')))
+    cascade = ConfidenceCascade(threshold=50)
+    output = cascade.run(Image.new('L', (400, 200), 255))
+    assert output == FAST_TSV
+    assert cascade.stats == {'lines': 2, 'escalated': 1, 'replaced': 0}
+
+
+def test_cascade_threshold(run):
+    run.side_effect = outputs(best_tsv())
+    cascade = ConfidenceCascade(threshold=20)
+    assert cascade.run(Image.new('L', (400, 200), 255)) == FAST_TSV
+    assert run.call_count == 1
+    assert cascade.stats['escalated'] == 0
+
+
+def test_image_to_data_cascade():
+    cascade = ConfidenceCascade(threshold=101)
+    data = image_to_data(TEST_JPEG, output_type=Output.DICT, cascade=cascade)
+    assert 'dog' in data['text']
+    assert cascade.stats['escalated'] == cascade.stats['lines'] > 0
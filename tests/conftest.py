@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import sys
+from os import path
+
+import pytest
+
+from pytesseract import pytesseract as pytesseract_module
+
+
+ROOT_DIR = path.dirname(path.dirname(path.abspath(__file__)))
+FAKE_TESSERACT = path.join(ROOT_DIR, 'benchmarks', 'fake_tesseract.py')
+
+
+@pytest.fixture
+def fake_tesseract(request, monkeypatch):
+    """
+    Runs the calls with the deterministic tesseract of the benchmarks and
+    without the result cache. Its number of words per page is given by the
+    fake_tesseract_words marker
+    """
+    if sys.platform == 'win32':
+        pytest.skip('the fake tesseract is started through its shebang')
+    marker = request.node.get_closest_marker('fake_tesseract_words')
+    words = marker.args[0] if marker else 100
+    monkeypatch.setattr(pytesseract_module, 'tesseract_cmd', FAKE_TESSERACT)
+    monkeypatch.setattr(pytesseract_module, 'result_cache', None)
+    monkeypatch.setenv('FAKE_TESSERACT_WORDS', str(words))
+
+
+@pytest.fixture
+def tesseract_script():
+    """
+    Returns a factory of shell script tesseract binaries. They answer
+    --version and --list-langs like tesseract and run the shell command
+    otherwise
+    """
+
+    def make(directory, version='5.3.0', languages=('eng',), run=':'):
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / 'tesseract'
+        listing = ''.join(f'{lang}\\n' for lang in languages)
+        path.write_text(
+            '#!/bin/sh\n'
+            'case "$1" in\n'
+            f'  --version) echo "tesseract {version}" ;;\n'
+            '  --list-langs) '
+            f'printf "List of available languages:\\n{listing}" ;;\n'
+            f'  *) {run} ;;\n'
+            'esac\n',
+        )
+        path.chmod(0o755)
+        return str(path)
+
+    return make
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from os import environ
+from os import path
+from threading import get_ident
+from unittest import mock
+
+import pytest
+
+from pytesseract import image_to_string
+from pytesseract import map_images
+from pytesseract import OCRExecutor
+from pytesseract.executor import available_cpu_count
+from pytesseract.executor import cgroup_cpu_limit
+from pytesseract.pytesseract import subprocess_args
+
+
+TESTS_DIR = path.dirname(path.abspath(__file__))
+DATA_DIR = path.join(TESTS_DIR, 'data')
+
+
+@pytest.mark.parametrize(
+    ('cpu_max', 'expected'),
+    (
+        ('max 100000\n', None),
+        ('150000 100000\n', 2),
+        ('50000 100000\n', 1),
+        ('', None),
+    ),
+    ids=['unlimited', 'fraction', 'below_one', 'missing'],
+)
+def test_cgroup_cpu_limit(cpu_max, expected):
+    with mock.patch(
+        'pytesseract.executor._read_cgroup_file',
+        side_effect=lambda name: cpu_max.split() if 'cpu.max' in name else [],
+    ):
+        assert cgroup_cpu_limit() == expected
+
+
+def test_available_cpu_count():
+    assert available_cpu_count() >= 1
+
+    with mock.patch('pytesseract.executor.cgroup_cpu_limit', return_value=1):
+        assert available_cpu_count() == 1
+
+
+@pytest.mark.parametrize(
+    ('workers', 'omp_threads', 'expected'),
+    (
+        (None, None, (8, 1)),
+        (2, None, (2, 4)),
+        (None, 4, (2, 4)),
+        (3, 2, (3, 2)),
+    ),
+)
+def test_executor_sizing(workers, omp_threads, expected):
+    with mock.patch(
+        'pytesseract.executor.available_cpu_count',
+        return_value=8,
+    ):
+        with OCRExecutor(workers, omp_threads) as executor:
+            assert (executor.workers, executor.omp_threads) == expected
+
+
+def test_executor_omp_thread_limit():
+    with OCRExecutor(workers=2, omp_threads=3) as executor:
+        envs = list(
+            executor.map(lambda _: subprocess_args()['env'], range(4)),
+        )
+    assert all(env['OMP_THREAD_LIMIT'] == '3' for env in envs)
+    assert subprocess_args()['env'] is environ
+
+
+def test_map_images_keeps_input_order():
+    def func(value, offset=0):
+        return value + offset, get_ident()
+
+    results = list(map_images(func, range(20), workers=4, offset=1))
+    assert [value for value, _ in results] == list(range(1, 21))
+    assert len({ident for _, ident in results}) > 1
+
+
+@pytest.mark.pytesseract
+def test_map_images_image_to_string():
+    test_files = [
+        path.join(DATA_DIR, test_file)
+        for test_file in ('test.jpg', 'test.png', 'test.ppm', 'test.tiff')
+    ]
+    for result in map_images(image_to_string, test_files, workers=2):
+        assert 'The quick brown dog' in result
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from os import path
+
+import pytest
+from PIL import Image
+
+import pytesseract
+from pytesseract import Output
+
+
+ROOT_DIR = path.dirname(path.dirname(path.abspath(__file__)))
+BENCH_DIR = path.join(ROOT_DIR, 'benchmarks')
+
+pytestmark = pytest.mark.fake_tesseract_words(25)
+
+
+@pytest.mark.usefixtures('fake_tesseract')
+def test_fake_tesseract_outputs():
+    image = Image.new('L', (200, 100), 255)
+
+    text = pytesseract.image_to_string(image)
+    assert text.split('\n')[0] == ' '.join(f'word{i}' for i in range(10))
+    data = pytesseract.image_to_data(image, output_type=Output.DICT)
+    assert data['text'].count('') == 4  # page and line rows
+    assert len(data['text']) == 25 + 4
+    boxes = pytesseract.image_to_boxes(image, output_type=Output.DICT)
+    assert ''.join(boxes['char']).startswith('word0word1')
+    assert pytesseract.image_to_osd(image, output_type=Output.DICT) == {
+        'page_num': 0,
+        'orientation': 0,
+        'rotate': 0,
+        'orientation_conf': 9.3,
+        'script': 'Latin',
+        'script_conf': 3.3,
+    }
+    hocr = pytesseract.image_to_pdf_or_hocr(image, extension='hocr')
+    assert hocr.count(b'ocrx_word') == 25
+    assert pytesseract.image_to_alto_xml(image).startswith(b'<?xml')
+
+
+@pytest.mark.usefixtures('fake_tesseract')
+def test_fake_tesseract_batch():
+    images = [Image.new('L', (200, 100), 255) for _ in range(3)]
+    texts = pytesseract.image_to_string_batch(images)
+    assert len(texts) == 3
+    assert all(text.startswith('word0 ') for text in texts)
+
+
+@pytest.mark.skipif(
+    sys.platform == 'win32',
+    reason='the fake tesseract is started through its shebang',
+)
+def test_bench_overhead():
+    result = subprocess.run(
+        [
+            sys.executable,
+            path.join(BENCH_DIR, 'bench_overhead.py'),
+            '--number=1',
+            '--sizes=64x48',
+            '--workers=2',
+            '--filter=image_to_string',
+        ],
+        stdout=subprocess.PIPE,
+        check=True,
+        text=True,
+    )
+    assert 'largest overhead' in result.stdout
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from os import path
+
+import pytest
+
+
+ROOT_DIR = path.dirname(path.dirname(path.abspath(__file__)))
+FAKE_TESSERACT = path.join(ROOT_DIR, 'benchmarks', 'fake_tesseract.py')
+TEST_JPEG = path.join(ROOT_DIR, 'tests', 'data', 'test.jpg')
+
+# optional dependencies pytesseract must not pull in on import
+DEFERRED_MODULES = ('numpy', 'pandas')
+
+
+def import_times(statement):
+    """
+    Returns the cumulative import time in microseconds of every module
+    imported by the statement, as reported by python -X importtime
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=True,
+        text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.partition(':')[2].split('|')
+        try:
+            times[name.strip()] = int(cumulative)
+        except ValueError:  # the header line
+            continue
+    return times
+
+
+def test_import_defers_optional_dependencies():
+    times = import_times('import pytesseract')
+    assert 'pytesseract' in times
+    for name in DEFERRED_MODULES:
+        assert name not in times
+
+
+@pytest.mark.skipif(
+    sys.platform == 'win32',
+    reason='the fake tesseract is started through its shebang',
+)
+@pytest.mark.parametrize(
+    ('name', 'output_type'),
+    [('numpy', 'NUMPY'), ('pandas', 'DATAFRAME')],
+)
+def test_optional_dependency_imported_on_use(name, output_type):
+    pytest.importorskip(name)
+    statement = (
+        'import sys\n'
+        'import pytesseract\n'
+        f'assert {name!r} not in sys.modules\n'
+        'from pytesseract import image_to_data, Output\n'
+        f'assert {name!r} not in sys.modules\n'
+        f'pytesseract.pytesseract.tesseract_cmd = {FAKE_TESSERACT!r}\n'
+        'pytesseract.pytesseract.result_cache = None\n'
+        f'image_to_data({TEST_JPEG!r}, output_type=Output.{output_type})\n'
+        f'assert {name!r} in sys.modules\n'
+    )
+    subprocess.run([sys.executable, '-c', statement], check=True)
+
+
+def test_client_imports_only_the_standard_library():
+    times = import_times(
+        'from pytesseract.client import OCRClient;'
+        'OCRClient("unix:/tmp/ocr.sock")',
+    )
+    assert 'pytesseract.client' in times
+    for name in ('PIL', 'packaging', 'pytesseract.pytesseract'):
+        assert name not in times
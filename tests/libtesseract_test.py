@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from os import path
+from unittest import mock
+
+import pytest
+
+import pytesseract
+from pytesseract import image_to_boxes
+from pytesseract import image_to_data
+from pytesseract import image_to_string
+from pytesseract import Output
+from pytesseract.libtesseract import image_buffer
+from pytesseract.libtesseract import load_library
+from pytesseract.libtesseract import parse_config
+from pytesseract.libtesseract import run_and_get_output
+from pytesseract.pytesseract import numpy_installed
+
+try:
+    from PIL import Image
+except ImportError:
+    import Image
+
+
+TESTS_DIR = path.dirname(path.abspath(__file__))
+DATA_DIR = path.join(TESTS_DIR, 'data')
+TEST_PNG = path.join(DATA_DIR, 'test.png')
+
+requires_libtesseract = pytest.mark.skipif(
+    load_library(cached=True) is None,
+    reason='requires libtesseract >= 4.1',
+)
+
+
+@pytest.fixture
+def libtesseract_engine(monkeypatch):
+    monkeypatch.setattr('pytesseract.pytesseract.engine', 'libtesseract')
+
+
+@pytest.mark.parametrize(
+    ('config', 'expected'),
+    (
+        ('', {}),
+        (
+            '--oem 1 --psm 6 --dpi 300',
+            {'oem': 1, 'psm': 6, 'dpi': 300},
+        ),
+        (
+            '--tessdata-dir "/usr/share/tessdata" digits',
+            {'tessdata_dir': '/usr/share/tessdata', 'configs': ['digits']},
+        ),
+        (
+            '-c tessedit_create_tsv=1 -c tessedit_char_whitelist=0123',
+            {'variables': {'tessedit_char_whitelist': '0123'}},
+        ),
+        (
+            '--user-words words.txt',
+            {'variables': {'user_words_file': 'words.txt'}},
+        ),
+    ),
+    ids=['empty', 'numeric', 'tessdata_configs', 'variables', 'user_words'],
+)
+def test_parse_config(config, expected):
+    options = {
+        'tessdata_dir': None,
+        'oem': 3,
+        'psm': 3,
+        'dpi': None,
+        'configs': [],
+        'variables': {},
+    }
+    options.update(expected)
+    assert parse_config(config) == options
+
+
+@pytest.mark.parametrize(
+    'config',
+    ['--psm', '--psm auto', '--list-langs', '--tessdata-dir=invalid'],
+)
+def test_parse_config_unsupported(config):
+    assert parse_config(config) is None
+
+
+@pytest.mark.parametrize(
+    ('mode', 'expected'),
+    (('1', 1), ('L', 1), ('P', 3), ('RGB', 3), ('RGBA', 3), ('LA', 3)),
+)
+def test_image_buffer(mode, expected):
+    image = Image.new(mode, (7, 5))
+    data, width, height, bytes_per_pixel, dpi = image_buffer(image)
+    assert (width, height, bytes_per_pixel, dpi) == (7, 5, expected, None)
+    assert len(data) == 7 * 5 * expected
+
+
+@pytest.mark.parametrize('mode', ('I', 'I;16'))
+def test_image_buffer_high_depth(mode):
+    assert image_buffer(Image.new(mode, (7, 5), 1000)) is None
+
+
+@pytest.mark.skipif(numpy_installed is False, reason='requires numpy')
+def test_image_buffer_high_depth_array():
+    import numpy as np
+
+    assert image_buffer(np.full((2, 2), 1000, np.uint16)) is None
+
+
+def test_image_buffer_path():
+    assert image_buffer(TEST_PNG)[1:3] == Image.open(TEST_PNG).size
+    assert image_buffer(TEST_PNG + 'invalid') is None
+
+
+def test_fallback_without_library(libtesseract_engine):
+    with mock.patch(
+        'pytesseract.libtesseract.load_library',
+        return_value=None,
+    ):
+        assert run_and_get_output(TEST_PNG, 'txt') is None
+
+        with mock.patch(
+            'pytesseract.pytesseract.run_tesseract',
+            side_effect=pytesseract.TesseractNotFoundError,
+        ) as run_mock:
+            with pytest.raises(pytesseract.TesseractNotFoundError):
+                image_to_string(TEST_PNG)
+            run_mock.assert_called_once()
+
+
+@requires_libtesseract
+@pytest.mark.pytesseract
+@pytest.mark.parametrize(
+    'func',
+    [
+        image_to_string,
+        image_to_boxes,
+        lambda image: image_to_data(image, output_type=Output.DICT),
+    ],
+    ids=['txt', 'box', 'tsv'],
+)
+def test_identical_outputs(monkeypatch, func):
+    with Image.open(TEST_PNG) as image:
+        expected = func(image)
+        monkeypatch.setattr('pytesseract.pytesseract.engine', 'libtesseract')
+        with mock.patch('pytesseract.pytesseract.run_tesseract') as run_mock:
+            assert func(image) == expected
+            run_mock.assert_not_called()
+
+
+@requires_libtesseract
+def test_handle_reuse(libtesseract_engine):
+    with mock.patch(
+        'pytesseract.libtesseract.TessBaseAPI',
+        wraps=pytesseract.libtesseract.TessBaseAPI,
+    ) as api_mock:
+        for _ in range(3):
+            run_and_get_output(TEST_PNG, 'txt', 'eng', '--psm 6')
+        run_and_get_output(TEST_PNG, 'tsv', 'eng', '-c tessedit_create_tsv=1')
+    api_mock.assert_called_once()
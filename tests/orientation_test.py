@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from os import path
+from unittest import mock
+
+import pytest
+from PIL import Image
+
+from pytesseract import image_to_string
+from pytesseract import TesseractError
+from pytesseract.orientation import OrientationRouter
+from pytesseract.orientation import SCRIPT_LANGUAGES
+
+
+TESTS_DIR = path.dirname(path.abspath(__file__))
+DATA_DIR = path.join(TESTS_DIR, 'data')
+TEST_JPEG = path.join(DATA_DIR, 'test.jpg')
+
+
+def osd(rotate=0, script='Latin', orientation_conf=5.0, script_conf=2.0):
+    return {
+        'page_num': 0,
+        'orientation': (360 - rotate) % 360,
+        'rotate': rotate,
+        'orientation_conf': orientation_conf,
+        'script': script,
+        'script_conf': script_conf,
+    }
+
+
+@pytest.fixture
+def image_to_osd():
+    with mock.patch('pytesseract.orientation.image_to_osd') as image_to_osd:
+        image_to_osd.return_value = osd()
+        yield image_to_osd
+
+
+def test_route_rotation(image_to_osd):
+    image = Image.new('L', (300, 200), 255)
+    image.putpixel((0, 0), 0)
+    image_to_osd.return_value = osd(rotate=90)
+
+    rotated, lang = OrientationRouter().route(image, 'eng+deu')
+    assert rotated.size == (200, 300)
+    # clockwise: the top left corner goes to the top right
+    assert rotated.getpixel((199, 0)) == 0
+    assert lang == 'eng+deu'
+
+
+@pytest.mark.parametrize(
+    ('detected', 'routing', 'expected'),
+    [
+        (osd(script='Cyrillic'), True, 'rus'),
+        (osd(script='Cyrillic'), {'Cyrillic': 'rus+ukr'}, 'rus+ukr'),
+        (osd(script='Cyrillic'), None, 'eng+rus'),
+        (osd(script='Ogham'), True, 'eng+rus'),
+        (osd(script='Cyrillic', script_conf=0.2), True, 'eng+rus'),
+    ],
+    ids=['default', 'custom', 'no_routing', 'unknown', 'low_confidence'],
+)
+def test_route_languages(image_to_osd, detected, routing, expected):
+    image_to_osd.return_value = detected
+    image = Image.new('L', (300, 200), 255)
+    routed, lang = OrientationRouter(routing).route(image, 'eng+rus')
+    assert routed is image
+    assert lang == expected
+
+
+def test_route_low_orientation_confidence(image_to_osd):
+    image_to_osd.return_value = osd(rotate=180, orientation_conf=0.3)
+    image = Image.new('L', (300, 200), 255)
+    assert OrientationRouter().route(image)[0] is image
+
+
+def test_route_osd_error(image_to_osd):
+    image_to_osd.side_effect = TesseractError(1, 'Too few characters')
+    router = OrientationRouter(True)
+    image = Image.new('L', (300, 200), 255)
+    assert router.route(image, 'eng') == (image, 'eng')
+
+
+def test_router_stable_pages(image_to_osd):
+    router = OrientationRouter(True, stable_pages=2)
+    image = Image.new('L', (300, 200), 255)
+
+    image_to_osd.return_value = osd(rotate=180)
+    router.decide(image)
+    image_to_osd.return_value = osd()
+    router.decide(image)
+    router.decide(image)
+    assert router.stable
+    # the decision isn't detected anymore
+    image_to_osd.return_value = osd(rotate=90, script='Greek')
+    assert router.decide(image) == (0, 'Latin')
+    assert router.osd_runs == image_to_osd.call_count == 3
+
+
+def test_image_to_string_script_routing(image_to_osd):
+    image_to_osd.return_value = osd(script='Greek')
+    with mock.patch(
+        'pytesseract.pytesseract.run_and_get_output',
+        return_value='text',
+    ) as run:
+        assert image_to_string(TEST_JPEG, 'eng+ell', script_routing=True)
+    assert run.call_args.args[2] == SCRIPT_LANGUAGES['Greek']
+
+
+def test_image_to_string_auto_orient():
+    image = Image.open(TEST_JPEG).transpose(Image.ROTATE_90)
+    assert 'dog' in image_to_string(image, 'eng', auto_orient=True)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import io
+import mmap
+from errno import EXDEV
+from unittest import mock
+
+import pytest
+from PIL import Image
+
+from pytesseract import image_to_alto_xml
+from pytesseract import image_to_pdf_or_hocr
+from pytesseract import run_and_get_multiple_output
+from pytesseract.pytesseract import OCRStats
+
+
+pytestmark = [
+    pytest.mark.usefixtures('fake_tesseract'),
+    pytest.mark.fake_tesseract_words(20),
+]
+
+
+@pytest.fixture
+def image():
+    return Image.new('L', (120, 80), 255)
+
+
+def test_output_path(image, tmp_path):
+    expected = image_to_pdf_or_hocr(image)
+    destination = tmp_path / 'document.pdf'
+    destination.write_bytes(b'old')
+
+    stats = OCRStats()
+    result = image_to_pdf_or_hocr(
+        image,
+        output_path=str(destination),
+        stats=stats,
+    )
+    assert result == str(destination)
+    assert destination.read_bytes() == expected
+    assert stats.output_bytes == len(expected)
+
+
+def test_output_path_other_file_system(image, tmp_path):
+    destination = tmp_path / 'document.hocr'
+    with mock.patch(
+        'pytesseract.pytesseract.replace',
+        side_effect=OSError(EXDEV, 'Invalid cross-device link'),
+    ):
+        image_to_pdf_or_hocr(image, extension='hocr', output_path=destination)
+    assert b'ocrx_word' in destination.read_bytes()
+
+
+def test_output_file_object(image):
+    output = io.BytesIO()
+    assert image_to_alto_xml(image, output_path=output) is output
+    assert output.getvalue() == image_to_alto_xml(image)
+
+
+def test_memory_map(image, tmp_path):
+    expected = image_to_pdf_or_hocr(image)
+    with image_to_pdf_or_hocr(image, memory_map=True) as output:
+        assert isinstance(output, mmap.mmap)
+        assert output[:] == expected
+
+    destination = tmp_path / 'document.pdf'
+    with image_to_pdf_or_hocr(
+        image,
+        output_path=destination,
+        memory_map=True,
+    ) as output:
+        assert output[:] == destination.read_bytes() == expected
+
+
+def test_multiple_output_paths(image, tmp_path):
+    destination = tmp_path / 'document.pdf'
+    text, pdf = run_and_get_multiple_output(
+        image,
+        ['txt', 'pdf'],
+        output_paths={'pdf': destination},
+    )
+    assert text.startswith('word0 word1')
+    assert pdf == destination
+    assert destination.read_bytes().startswith(b'%PDF')
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from packaging.version import Version
+
+from pytesseract import map_images
+from pytesseract import pytesseract as pytesseract_module
+from pytesseract import TesseractNotFoundError
+from pytesseract import TesseractProfile
+from pytesseract.pytesseract import active_profile
+from pytesseract.pytesseract import current_tesseract_cmd
+from pytesseract.pytesseract import tesseract_args
+
+
+TEST_PNG = os.path.join(os.path.dirname(__file__), 'data', 'test.png')
+
+pytestmark = pytest.mark.skipif(
+    os.name == 'nt',
+    reason='shell script tesseract binaries',
+)
+
+
+# the fake binaries write their command line as the text output
+ARGS_TO_TEXT = 'echo "$0 $*" > "$2.txt"'
+
+
+@pytest.fixture(autouse=True)
+def capabilities(monkeypatch):
+    monkeypatch.setattr(pytesseract_module, '_capabilities', {})
+    monkeypatch.setattr(pytesseract_module, 'capability_cache_dir', None)
+
+
+@pytest.fixture
+def tesseract(tesseract_script, tmp_path):
+    return tesseract_script(
+        tmp_path / 'bin',
+        languages=('deu', 'eng', 'osd'),
+        run=ARGS_TO_TEXT,
+    )
+
+
+def test_profile_options(tesseract, tmp_path):
+    profile = TesseractProfile(
+        tesseract,
+        lang='deu+eng',
+        psm=6,
+        oem=1,
+        tessdata_dir=str(tmp_path),
+        variables={'preserve_interword_spaces': 1},
+        config='--dpi 300',
+    )
+    assert profile.options == (
+        '--tessdata-dir',
+        str(tmp_path),
+        '--psm',
+        '6',
+        '--oem',
+        '1',
+        '-c',
+        'preserve_interword_spaces=1',
+        '--dpi',
+        '300',
+    )
+    with profile.active():
+        assert active_profile() is profile
+        args = tesseract_args('in.png', 'out', 'txt', 'eng', '--psm 7')
+    assert args == [
+        tesseract,
+        'in.png',
+        'out',
+        '-l',
+        'eng',
+        *profile.options,
+        '--psm',
+        '7',
+        'txt',
+    ]
+    assert active_profile() is None
+
+
+def test_profile_config_files(tesseract):
+    profile = TesseractProfile(tesseract, config='--dpi 300 digits')
+    assert profile.options == ('--dpi', '300')
+    assert profile.config_files == ('digits',)
+
+    # the renderer variables of the call come before the config files
+    with profile.active():
+        args = tesseract_args(
+            'in.png',
+            'out',
+            'tsv',
+            None,
+            '-c tessedit_create_tsv=1',
+        )
+    assert args[3:] == [
+        '--dpi',
+        '300',
+        '-c',
+        'tessedit_create_tsv=1',
+        'digits',
+    ]
+
+
+@pytest.mark.parametrize(
+    ('kwargs', 'message'),
+    [
+        ({'psm': 14}, 'page segmentation mode'),
+        ({'oem': 4}, 'OCR engine mode'),
+        ({'tessdata_dir': '/does/not/exist'}, 'tessdata'),
+        ({'variables': {'bad name': 1}}, 'variable'),
+        ({'lang': 'eng+fra+jpn'}, r'fra\+jpn'),
+    ],
+)
+def test_profile_validation(tesseract, kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        TesseractProfile(tesseract, **kwargs)
+
+
+def test_profile_missing_binary():
+    with pytest.raises(TesseractNotFoundError, match='/does/not/exist'):
+        TesseractProfile('/does/not/exist/tesseract')
+
+
+def test_profile_calls(tesseract):
+    profile = TesseractProfile(tesseract, lang='eng', psm=4, nice=0)
+    assert profile.get_tesseract_version() == Version('5.3.0')
+
+    # the fake binary writes its command line as the text output
+    args = profile.image_to_string(TEST_PNG, config='--dpi 70').split()
+    assert args[0] == profile.cmd
+    assert args[3:] == ['-l', 'eng', '--psm', '4', '--dpi', '70', 'txt']
+    args = profile.image_to_string(TEST_PNG, lang='deu', cache=False).split()
+    assert args[3:5] == ['-l', 'deu']
+
+
+def test_concurrent_profiles(monkeypatch, tmp_path, tesseract_script):
+    monkeypatch.setattr(pytesseract_module, 'tesseract_cmd', 'missing')
+    profiles = [
+        TesseractProfile(tesseract_script(tmp_path / 'old', '4.1.1'), 'eng'),
+        TesseractProfile(tesseract_script(tmp_path / 'new', '5.3.0'), 'eng'),
+    ]
+
+    def version(index):
+        return str(profiles[index % 2].get_tesseract_version(cached=False))
+
+    with ThreadPoolExecutor(8) as pool:
+        versions = list(pool.map(version, range(32)))
+    assert versions == ['4.1.1', '5.3.0'] * 16
+    assert current_tesseract_cmd() == 'missing'
+
+    # the workers of map_images run with the profile of the caller
+    commands = profiles[0].call(
+        lambda: list(map_images(lambda _: current_tesseract_cmd(), 'abc')),
+    )
+    assert commands == [profiles[0].cmd] * 3
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import subprocess
 from functools import partial
 from glob import iglob
+from io import BytesIO
 from multiprocessing import Pool
 from os import getcwd
 from os import path
@@ -18,19 +20,37 @@ from pytesseract import get_languages
 from pytesseract import get_tesseract_version
 from pytesseract import image_to_alto_xml
 from pytesseract import image_to_boxes
+from pytesseract import image_to_boxes_batch
 from pytesseract import image_to_data
+from pytesseract import image_to_data_batch
 from pytesseract import image_to_osd
+from pytesseract import image_to_outputs
 from pytesseract import image_to_pdf_or_hocr
 from pytesseract import image_to_string
+from pytesseract import image_to_string_batch
+from pytesseract import iter_image_to_data
+from pytesseract import iter_image_to_string
 from pytesseract import Output
 from pytesseract import run_and_get_multiple_output
+from pytesseract import TesseractError
 from pytesseract import TesseractNotFoundError
 from pytesseract import TSVNotSupported
+from pytesseract.pytesseract import encode
 from pytesseract.pytesseract import file_to_dict
+from pytesseract.pytesseract import file_to_numpy
+from pytesseract.pytesseract import iter_tsv_pages
 from pytesseract.pytesseract import LANG_PATTERN
+from pytesseract.pytesseract import ndarray_pixels
 from pytesseract.pytesseract import numpy_installed
+from pytesseract.pytesseract import output_config
 from pytesseract.pytesseract import pandas_installed
 from pytesseract.pytesseract import prepare
+from pytesseract.pytesseract import run_tesseract
+from pytesseract.pytesseract import save
+from pytesseract.pytesseract import split_boxes
+from pytesseract.pytesseract import split_text
+from pytesseract.pytesseract import split_tsv
+from pytesseract.pytesseract import tsv_to_text
 
 if numpy_installed:
     import numpy as np
@@ -159,6 +179,127 @@ def test_image_to_string_batch():
     assert 'The quick brown dog' in image_to_string(batch_file)
 
 
+def test_image_to_string_batch_split(test_file, test_file_small):
+    images = [test_file, Image.open(test_file), test_file_small]
+    results = image_to_string_batch(images)
+    assert len(results) == len(images)
+    assert 'The quick brown dog' in results[0]
+    assert 'The quick brown dog' in results[1]
+    assert results[2] == image_to_string(test_file_small)
+
+
+def test_image_to_string_batch_animated(tmp_path, test_file_small):
+    # a single page for tesseract, whatever its number of frames
+    animation = str(tmp_path / 'animation.gif')
+    frames = [Image.new('L', (40, 20), color) for color in (0, 255)]
+    frames[0].save(animation, save_all=True, append_images=frames[1:])
+
+    def run_tesseract(input_filename, output_filename_base, *args):
+        with open(f'{output_filename_base}.txt', 'w') as f:
+            f.write('A\fB\f')
+
+    with mock.patch(
+        'pytesseract.pytesseract.run_tesseract',
+        side_effect=run_tesseract,
+    ):
+        results = image_to_string_batch([animation, test_file_small])
+    assert results == ['A\f', 'B\f']
+
+
+def test_image_to_boxes_batch(test_file, test_file_small):
+    results = image_to_boxes_batch([test_file_small, test_file])
+    assert results == [
+        image_to_boxes(test_file_small),
+        image_to_boxes(test_file),
+    ]
+
+
+@pytest.mark.skipif(
+    TESSERACT_VERSION[:2] < (3, 5),
+    reason='requires tesseract >= 3.05',
+)
+def test_image_to_data_batch(test_file, test_file_small):
+    results = image_to_data_batch(
+        [test_file, test_file_small],
+        output_type=Output.DICT,
+    )
+    assert len(results) == 2
+    for result, image in zip(results, [test_file, test_file_small]):
+        assert set(result['page_num']) == {1}
+        assert result == image_to_data(image, output_type=Output.DICT)
+
+
+def test_image_to_string_batch_empty():
+    assert image_to_string_batch([]) == []
+
+
+def test_iter_image_to_string():
+    batch_file = path.join(DATA_DIR, 'images.txt')
+    pages = list(iter_image_to_string(batch_file))
+    assert len(pages) == 2
+    assert ''.join(pages) == image_to_string(batch_file)
+    assert all(page.endswith('\f') for page in pages)
+
+
+@pytest.mark.skipif(
+    TESSERACT_VERSION[:2] < (3, 5),
+    reason='requires tesseract >= 3.05',
+)
+def test_iter_image_to_data():
+    batch_file = path.join(DATA_DIR, 'images.txt')
+    pages = list(iter_image_to_data(batch_file, output_type=Output.DICT))
+    assert len(pages) == 2
+    for page_num, page in enumerate(pages, 1):
+        assert set(page['page_num']) == {page_num}
+
+
+def test_iter_tsv_pages():
+    tsv = b'level\tpage_num\ttext\n1\t1\t\n5\t1\ta\n1\t2\t\n5\t2\tb'
+    # one byte chunks, cut through every cell and line
+    chunks = [bytes([byte]) for byte in tsv]
+    assert list(iter_tsv_pages(iter(chunks))) == [
+        b'level\tpage_num\ttext\n1\t1\t\n5\t1\ta\n',
+        b'level\tpage_num\ttext\n1\t2\t\n5\t2\tb',
+    ]
+
+
+@pytest.fixture
+def streaming_tesseract(tmp_path, monkeypatch, tesseract_script):
+    script = tesseract_script(
+        tmp_path,
+        run='printf "page 1\\f"; exec sleep 30',
+    )
+    monkeypatch.setattr('pytesseract.pytesseract.tesseract_cmd', script)
+    return script
+
+
+def test_iter_image_to_string_yields_before_exit(
+    streaming_tesseract,
+    test_file,
+):
+    processes = []
+    popen = subprocess.Popen
+
+    def spy(*args, **kwargs):
+        processes.append(popen(*args, **kwargs))
+        return processes[-1]
+
+    with mock.patch('subprocess.Popen', side_effect=spy):
+        pages = iter_image_to_string(test_file)
+        assert next(pages) == 'page 1\f'
+        pages.close()
+
+    (proc,) = processes
+    assert proc.returncode is not None
+
+
+def test_iter_image_to_string_timeout(streaming_tesseract, test_file):
+    pages = iter_image_to_string(test_file, timeout=0.5)
+    assert next(pages) == 'page 1\f'
+    with pytest.raises(RuntimeError):
+        next(pages)
+
+
 def test_image_to_string_multiprocessing():
     """Test parallel system calls."""
     test_files = [
@@ -270,6 +411,147 @@ def test_run_and_get_multiple_output(test_file, function_mapping, extensions):
             assert result == function_mapping[extension](test_file)
 
 
+def test_image_to_outputs(test_file, function_mapping):
+    outputs = ['txt', 'tsv', 'box', 'hocr', 'pdf']
+    with mock.patch(
+        'pytesseract.pytesseract.run_tesseract',
+        wraps=run_tesseract,
+    ) as run_mock:
+        results = image_to_outputs(
+            test_file,
+            outputs,
+            output_type={'tsv': Output.DICT, 'box': Output.BYTES},
+        )
+    run_mock.assert_called_once()
+
+    assert list(results) == outputs
+    assert results['txt'] == function_mapping['txt'](test_file)
+    assert results['tsv'] == image_to_data(test_file, output_type=Output.DICT)
+    assert results['box'] == image_to_boxes(
+        test_file, output_type=Output.BYTES
+    )
+    assert isinstance(results['hocr'], bytes)
+    assert results['pdf'].startswith(b'%PDF')
+
+
+@pytest.mark.skipif(
+    TESSERACT_VERSION[:2] < (3, 5),
+    reason='requires tesseract >= 3.05',
+)
+def test_image_to_outputs_text_from_tsv(test_file):
+    with mock.patch(
+        'pytesseract.pytesseract.run_tesseract',
+        wraps=run_tesseract,
+    ) as run_mock:
+        results = image_to_outputs(test_file, ['txt', 'tsv'])
+    (call,) = run_mock.call_args_list
+    assert 'tsv' in call.args or call.kwargs.get('extension') == 'tsv'
+    assert results['txt'] == tsv_to_text(results['tsv'])
+
+
+@pytest.mark.usefixtures('fake_tesseract')
+@pytest.mark.parametrize(
+    'config',
+    ['', '-c preserve_interword_spaces=1'],
+    ids=['from_tsv', 'preserve_interword_spaces'],
+)
+def test_image_to_outputs_text_equals_image_to_string(config):
+    image = Image.new('L', (200, 100), 255)
+    results = image_to_outputs(image, ['txt', 'tsv'], config=config)
+    assert results['txt'] == image_to_string(image, config=config)
+
+
+@pytest.mark.skipif(numpy_installed is False, reason='requires numpy')
+@pytest.mark.usefixtures('fake_tesseract')
+def test_image_to_outputs_single_output_type():
+    image = Image.new('L', (200, 100), 255)
+    outputs = ['txt', 'tsv', 'box']
+    results = image_to_outputs(image, outputs, output_type=Output.NUMPY)
+    assert isinstance(results['txt'], str)
+    assert 'word0' in results['tsv']['text']
+    assert 'w' in results['box']['char']
+
+    with pytest.raises(ValueError, match='txt'):
+        image_to_outputs(image, ['txt'], output_type={'txt': Output.NUMPY})
+
+
+@pytest.mark.parametrize(
+    ('extensions', 'config', 'expected'),
+    [
+        (['tsv'], '', '-c tessedit_create_tsv=1'),
+        (
+            ['tsv'],
+            '--psm 6 digits',
+            '--psm 6 -c tessedit_create_tsv=1 digits',
+        ),
+        (
+            ['box', 'tsv'],
+            '-c preserve_interword_spaces=1 digits quiet',
+            '-c preserve_interword_spaces=1 -c tessedit_create_boxfile=1'
+            ' -c tessedit_create_tsv=1 batch.nochop makebox digits quiet',
+        ),
+    ],
+)
+def test_output_config(extensions, config, expected):
+    assert output_config(extensions, config) == expected
+
+
+def test_image_to_outputs_config_file(test_file):
+    with mock.patch(
+        'pytesseract.pytesseract.run_tesseract',
+        side_effect=TesseractError(1, 'stop'),
+    ) as run_mock, pytest.raises(TesseractError):
+        image_to_outputs(test_file, ['txt', 'tsv'], config='digits')
+    assert run_mock.call_args.kwargs['config'] == (
+        '-c tessedit_create_tsv=1 digits'
+    )
+
+
+def test_image_to_outputs_unsupported(test_file):
+    with pytest.raises(ValueError):
+        image_to_outputs(test_file, ['txt', 'osd'])
+
+
+def test_tsv_to_text():
+    header = '\t'.join(['level', 'page_num', 'block_num', 'par_num'])
+    header += '\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext'
+    rows = [
+        ('1', ''),
+        ('2', ''),
+        ('3', ''),
+        ('4', ''),
+        ('5', 'Hello'),
+        ('5', 'world'),
+        ('4', ''),
+        ('5', 'foo'),
+        ('3', ''),
+        ('4', ''),
+        ('5', 'bar'),
+        ('1', ''),
+    ]
+    tsv = ''.join(
+        f'{level}\t1\t1\t1\t1\t1\t0\t0\t1\t1\t-1\t{text}\n'
+        for level, text in rows
+    )
+    assert tsv_to_text(f'{header}\n{tsv}') == 'Hello world\nfoo\n\nbar\n\n\f\f'
+    assert tsv_to_text(header) == ''
+
+
+@pytest.mark.parametrize('extension', ['txt', 'box', 'tsv', 'hocr'])
+@pytest.mark.parametrize(
+    'test_file',
+    [TEST_JPEG, Image.open(TEST_JPEG)],
+    ids=['path_str', 'image_object'],
+)
+def test_use_pipes(monkeypatch, function_mapping, test_file, extension):
+    expected = function_mapping[extension](test_file)
+
+    monkeypatch.setattr('pytesseract.pytesseract.use_pipes', True)
+    with mock.patch('pytesseract.pytesseract.save') as save_mock:
+        assert function_mapping[extension](test_file) == expected
+        save_mock.assert_not_called()
+
+
 @pytest.mark.skipif(
     TESSERACT_VERSION[:2] < (4, 1),
     reason='requires tesseract >= 4.1',
@@ -369,12 +651,153 @@ def test_image_to_data_common_output(test_file_small, output):
             assert key in result
 
 
+@pytest.mark.skipif(
+    TESSERACT_VERSION[:2] < (3, 5),
+    reason='requires tesseract >= 3.05',
+)
+@pytest.mark.skipif(numpy_installed is False, reason='requires numpy')
+def test_image_to_data_numpy_output(test_file_small):
+    result = image_to_data(test_file_small, output_type=Output.NUMPY)
+    expected = image_to_data(test_file_small, output_type=Output.DICT)
+    assert result.dtype['left'] == np.int32
+    assert result.dtype['conf'] == np.float32
+    assert result.dtype['text'] == object
+    for name, values in expected.items():
+        if name == 'conf':
+            assert result[name].astype(int).tolist() == values
+        else:
+            assert result[name].tolist() == values
+
+
+@pytest.mark.skipif(numpy_installed is False, reason='requires numpy')
+def test_image_to_boxes_numpy_output(test_file):
+    result = image_to_boxes(test_file, output_type=Output.NUMPY)
+    expected = image_to_boxes(test_file, output_type=Output.DICT)
+    assert result.dtype.names == tuple(expected)
+    for name, values in expected.items():
+        assert result[name].tolist() == values
+
+
 @pytest.mark.parametrize('obj', [1, 1.0, None], ids=['int', 'float', 'none'])
 def test_wrong_prepare_type(obj):
     with pytest.raises(TypeError):
         prepare(obj)
 
 
+@pytest.mark.parametrize(
+    ('intermediate_format', 'mode', 'expected'),
+    (
+        ('PNM', 'L', ('PPM', 'L')),
+        ('PNM', '1', ('PPM', '1')),
+        ('PNM', 'P', ('PPM', 'RGB')),
+        ('PNM', 'CMYK', ('PPM', 'RGB')),
+        ('PNM', 'RGBA', ('PPM', 'RGB')),
+        ('PNM', 'I;16', ('PNG', 'I;16')),
+        ('BMP', 'P', ('BMP', 'P')),
+        ('TIFF', 'RGB', ('TIFF', 'RGB')),
+        ('PNG', 'LA', ('PNG', 'RGB')),
+        (None, 'L', ('PNG', 'L')),
+    ),
+)
+def test_prepare_intermediate_format(
+    monkeypatch,
+    intermediate_format,
+    mode,
+    expected,
+):
+    monkeypatch.setattr(
+        'pytesseract.pytesseract.intermediate_format',
+        intermediate_format,
+    )
+    image, extension = prepare(Image.new(mode, (4, 3)))
+    assert (extension, image.mode) == expected
+
+    with save(image) as (_, input_filename):
+        with Image.open(input_filename) as saved:
+            assert saved.format == extension
+            assert saved.size == (4, 3)
+
+
+def test_prepare_keeps_lossless_copy():
+    with Image.open(TEST_JPEG) as image:
+        _, extension = prepare(image)
+        assert extension == 'PPM'
+        assert image.format == 'JPEG'
+
+
+@pytest.mark.skipif(numpy_installed is False, reason='requires numpy')
+@pytest.mark.parametrize('shape', [(5, 4), (5, 4, 3)], ids=['gray', 'rgb'])
+def test_ndarray_pixels_zero_copy(shape):
+    array = np.arange(np.prod(shape), dtype=np.uint8).reshape(shape)
+    pixels = ndarray_pixels(array)
+    assert np.shares_memory(pixels, array)
+    assert np.array_equal(pixels, array)
+
+
+@pytest.mark.skipif(numpy_installed is False, reason='requires numpy')
+@pytest.mark.parametrize(
+    ('mode', 'channels'),
+    [('LA', 2), ('RGBA', 4)],
+    ids=['gray_alpha', 'rgba'],
+)
+def test_ndarray_pixels_alpha(mode, channels):
+    array = np.random.default_rng(0).integers(
+        0,
+        256,
+        (6, 5, channels),
+        dtype=np.uint8,
+    )
+    expected, _ = prepare(Image.fromarray(array, mode))
+    pixels = ndarray_pixels(array)
+    assert pixels.flags.c_contiguous
+    difference = pixels.astype(int) - np.array(
+        expected.convert('L' if pixels.ndim == 2 else 'RGB'),
+    )
+    assert np.abs(difference).max() <= 1
+
+
+@pytest.mark.skipif(numpy_installed is False, reason='requires numpy')
+def test_ndarray_pixels_bgr(monkeypatch):
+    array = np.zeros((2, 3, 4), dtype=np.uint8)
+    array[..., 0] = 255  # blue in OpenCV order
+    array[..., 3] = 255
+
+    monkeypatch.setattr('pytesseract.pytesseract.ndarray_channel_order', 'BGR')
+    assert ndarray_pixels(array)[0, 0].tolist() == [0, 0, 255]
+    assert ndarray_pixels(array[..., :3])[0, 0].tolist() == [0, 0, 255]
+
+
+@pytest.mark.skipif(numpy_installed is False, reason='requires numpy')
+@pytest.mark.parametrize(
+    'array',
+    (
+        [np.zeros((2, 3, 5), np.uint8), np.zeros((2, 3, 3, 1), np.uint8)]
+        if numpy_installed
+        else []
+    ),
+    ids=['channels', 'dimensions'],
+)
+def test_ndarray_pixels_unsupported(array):
+    with pytest.raises(TypeError):
+        ndarray_pixels(array)
+
+
+@pytest.mark.skipif(numpy_installed is False, reason='requires numpy')
+@pytest.mark.parametrize('shape', [(5, 4), (5, 4, 3)], ids=['gray', 'rgb'])
+def test_ndarray_written_as_pnm(shape):
+    array = np.arange(np.prod(shape), dtype=np.uint8).reshape(shape)
+    with mock.patch('pytesseract.pytesseract.Image.fromarray') as pil_mock:
+        with save(array) as (_, input_filename):
+            with Image.open(input_filename) as image:
+                assert np.array_equal(np.array(image), array)
+
+        input_filename, data = encode(array)
+        with Image.open(BytesIO(data)) as image:
+            assert input_filename == 'stdin'
+            assert np.array_equal(np.array(image), array)
+        pil_mock.assert_not_called()
+
+
 @pytest.mark.parametrize(
     'test_path',
     [r'wrong_tesseract', getcwd() + path.sep + r'wrong_tesseract'],
@@ -484,12 +907,87 @@ def test_get_languages(test_config, expected):
         (('', ' ', 0), {}),
         (('\n', '\n', 0), {}),
         (('header1 header2 header3\n', '\t', 0), {}),
+        (
+            ('a\tb\tconf\ttext\n1\t2\t-1\t\n3\t4\t96.5\tword\n', '\t', -1),
+            {'a': [1, 3], 'b': [2, 4], 'conf': [-1, 96], 'text': ['', 'word']},
+        ),
+        (
+            ('char left page\na 1 0\nb 2 0 extra\nc 3\n', ' ', 0),
+            {'char': ['a', 'b', 'c'], 'left': [1, 2, 3], 'page': [0, 0, '']},
+        ),
+        (
+            ('a\tb\n1\tx\n2.5\t\n', '\t', 1),
+            {'a': [1, 2], 'b': ['x', '']},
+        ),
+        (
+            ('a\tb\nx\t1\n2\t1\n', '\t', 1),
+            {'a': ['x', 2], 'b': ['1', '1']},
+        ),
     ),
+    ids=['empty', 'newline', 'header_only', 'tsv', 'ragged', 'float', 'str'],
 )
 def test_file_to_dict(input_args, expected):
     assert file_to_dict(*input_args) == expected
 
 
+@pytest.mark.skipif(numpy_installed is False, reason='requires numpy')
+def test_file_to_numpy():
+    result = file_to_numpy(
+        'level\tleft\tconf\ttext\n1\t0\t-1\t\n5\t11\t96.5\tThis\n',
+        '\t',
+        -1,
+    )
+    assert result.dtype == np.dtype(
+        [
+            ('level', np.int32),
+            ('left', np.int32),
+            ('conf', np.float32),
+            ('text', object),
+        ],
+    )
+    assert result.tolist() == [(1, 0, -1.0, ''), (5, 11, 96.5, 'This')]
+
+    result = file_to_numpy('char left page\na 1 0\nb 2\n', ' ', 0)
+    assert result.tolist() == [('a', 1, 0), ('b', 2, -1)]
+
+    result = file_to_numpy('level\tleft\ttext\n5\t3\tword\n1\n', '\t', -1)
+    assert result.tolist() == [(5, 3, 'word'), (1, -1, '')]
+
+    result = file_to_numpy('char left bottom right top page\n', ' ', 0)
+    assert len(result) == 0
+    assert result.dtype.names == (
+        'char',
+        'left',
+        'bottom',
+        'right',
+        'top',
+        'page',
+    )
+
+
+def test_split_text():
+    text = 'one\n\fpage two\n\fthree\n\f'
+    assert split_text(text, [1, 2]) == ['one\n\f', 'page two\n\fthree\n\f']
+
+
+def test_split_tsv():
+    header = 'level\tpage_num\ttext'
+    tsv = f'{header}\n1\t1\t\n5\t1\ta\n1\t2\t\n5\t3\tb\n'
+    assert split_tsv(tsv, [2, 1]) == [
+        f'{header}\n1\t1\t\n5\t1\ta\n1\t2\t\n',
+        f'{header}\n5\t1\tb\n',
+    ]
+
+
+def test_split_boxes():
+    boxes = 'a 1 2 3 4 0\nb 1 2 3 4 1\nc 1 2 3 4 2\n'
+    assert split_boxes(boxes, [1, 1, 1]) == [
+        'a 1 2 3 4 0\n',
+        'b 1 2 3 4 0\n',
+        'c 1 2 3 4 0\n',
+    ]
+
+
 @pytest.mark.parametrize(
     ('tesseract_version', 'expected'),
     (
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from itertools import combinations
+from os import path
+from unittest import mock
+
+import pytest
+from PIL import Image
+
+from pytesseract import image_to_string_regions
+from pytesseract import Output
+from pytesseract.pytesseract import run_tesseract
+from pytesseract.pytesseract import TSV_HEADER
+from pytesseract.regions import build_montage
+from pytesseract.regions import region_text
+from pytesseract.regions import shelf_pack
+from pytesseract.regions import split_regions
+
+
+TESTS_DIR = path.dirname(path.abspath(__file__))
+DATA_DIR = path.join(TESTS_DIR, 'data')
+TEST_JPEG = path.join(DATA_DIR, 'test.jpg')
+
+
+def test_shelf_pack():
+    sizes = [(30, 10), (40, 20), (50, 15), (80, 5)]
+    positions, size = shelf_pack(sizes, 120, gap=5)
+    # tallest first, a new shelf when the next size doesn't fit
+    assert positions == [(5, 30), (5, 5), (50, 5), (5, 45)]
+    assert size == (105, 55)
+
+
+def test_shelf_pack_no_overlap():
+    sizes = [(17 * i % 50 + 1, 7 * i % 30 + 1) for i in range(100)]
+    positions, (width, height) = shelf_pack(sizes, 200, gap=2)
+    rectangles = [
+        (x, y, x + w, y + h) for (x, y), (w, h) in zip(positions, sizes)
+    ]
+    for left, top, right, bottom in rectangles:
+        assert right <= width and bottom <= height
+    for first, second in combinations(rectangles, 2):
+        assert (
+            first[2] + 2 <= second[0]
+            or second[2] + 2 <= first[0]
+            or first[3] + 2 <= second[1]
+            or second[3] + 2 <= first[1]
+        )
+
+
+def test_build_montage():
+    image = Image.new('L', (100, 100), 255)
+    image.paste(0, (10, 10, 20, 20))
+    boxes = [(0, 0, 50, 50), (5, 5, 25, 25)]
+    montage, positions = build_montage(image, boxes, gap=4)
+    assert montage.mode == 'L'
+    for (left, top, right, bottom), (x, y) in zip(boxes, positions):
+        crop = montage.crop((x, y, x + right - left, y + bottom - top))
+        assert (
+            crop.tobytes() == image.crop((left, top, right, bottom)).tobytes()
+        )
+
+
+def test_build_montage_out_of_bounds():
+    image = Image.new('L', (100, 100), 0)
+    boxes = [(-10, 90, 20, 110), (120, 0, 130, 10)]
+    montage, positions = build_montage(image, boxes, gap=4)
+    (x, y), _ = positions
+    crop = montage.crop((x, y, x + 30, y + 20))
+    assert crop.getpixel((0, 0)) == 255
+    assert crop.getpixel((15, 5)) == 0
+    assert crop.getpixel((15, 15)) == 255
+    x, y = positions[1]
+    assert montage.crop((x, y, x + 10, y + 10)).getextrema() == (255, 255)
+
+
+def test_split_regions():
+    boxes = [(100, 200, 150, 220), (0, 0, 40, 20)]
+    positions = [(4, 4), (58, 4)]
+    tsv = (
+        f'{TSV_HEADER}\n'
+        '1\t1\t0\t0\t0\t0\t0\t0\t102\t28\t-1\t\n'
+        '5\t1\t1\t1\t1\t1\t6\t6\t20\t10\t95\tfirst\n'
+        '5\t1\t1\t1\t1\t2\t60\t6\t30\t10\t90\tsecond\n'
+        '5\t1\t1\t1\t1\t3\t55\t6\t2\t10\t10\tgap\n'
+    )
+    first, second = split_regions(tsv, boxes, positions)
+    assert first == (
+        f'{TSV_HEADER}\n5\t1\t1\t1\t1\t1\t102\t202\t20\t10\t95\tfirst\n'
+    )
+    assert second == (
+        f'{TSV_HEADER}\n5\t1\t1\t1\t1\t2\t2\t2\t30\t10\t90\tsecond\n'
+    )
+
+
+def test_region_text():
+    tsv = (
+        f'{TSV_HEADER}\n'
+        '5\t1\t1\t1\t1\t1\t0\t0\t1\t1\t95\tone\n'
+        '5\t1\t1\t1\t1\t2\t0\t0\t1\t1\t95\ttwo\n'
+        '5\t1\t1\t1\t2\t1\t0\t0\t1\t1\t95\tthree\n'
+    )
+    assert region_text(tsv) == 'one two\nthree'
+    assert region_text(f'{TSV_HEADER}\n') == ''
+
+
+def test_image_to_string_regions_empty():
+    assert image_to_string_regions(TEST_JPEG, []) == []
+
+
+def test_image_to_string_regions_single_run():
+    with Image.open(TEST_JPEG) as image:
+        width, height = image.size
+    boxes = [(0, 0, width, height), (0, 0, width, height // 2)]
+
+    with mock.patch(
+        'pytesseract.pytesseract.run_tesseract',
+        wraps=run_tesseract,
+    ) as run_mock:
+        texts = image_to_string_regions(TEST_JPEG, boxes)
+    run_mock.assert_called_once()
+    assert len(texts) == 2
+    assert 'dog' in texts[0]
+
+
+def test_image_to_string_regions_dict():
+    with Image.open(TEST_JPEG) as image:
+        width, height = image.size
+    (words,) = image_to_string_regions(
+        TEST_JPEG,
+        [(0, height // 2, width, height)],
+        output_type=Output.DICT,
+    )
+    # no words at all is an empty dict, like image_to_data returns it
+    assert all(top >= height // 2 for top in words.get('top', []))
+
+
+@pytest.mark.parametrize('output_type', [Output.STRING, Output.BYTES])
+def test_image_to_string_regions_types(output_type):
+    (text,) = image_to_string_regions(
+        TEST_JPEG,
+        [(0, 0, 10, 10)],
+        output_type=output_type,
+    )
+    assert isinstance(text, str if output_type == Output.STRING else bytes)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from os import path
+from unittest import mock
+
+import pytest
+from PIL import Image
+
+from pytesseract import image_to_boxes
+from pytesseract import image_to_data
+from pytesseract import Output
+from pytesseract import pytesseract as pytesseract_module
+from pytesseract.pytesseract import TSV_HEADER
+from pytesseract.resolution import estimate_x_height
+from pytesseract.resolution import rescale_boxes
+from pytesseract.resolution import rescale_tsv
+from pytesseract.resolution import ResolutionNormalizer
+
+
+TESTS_DIR = path.dirname(path.abspath(__file__))
+DATA_DIR = path.join(TESTS_DIR, 'data')
+TEST_JPEG = path.join(DATA_DIR, 'test.jpg')
+
+
+@pytest.fixture
+def large_image():
+    """test.jpg four times larger, without DPI information"""
+    image = Image.open(TEST_JPEG)
+    large = image.resize((image.width * 4, image.height * 4), Image.LANCZOS)
+    large.info.pop('dpi', None)
+    return large
+
+
+@pytest.fixture
+def normalizer():
+    normalizer = ResolutionNormalizer()
+    with mock.patch.object(
+        pytesseract_module,
+        'resolution_normalizer',
+        normalizer,
+    ):
+        yield normalizer
+
+
+def test_estimate_x_height(large_image):
+    x_height = estimate_x_height(Image.open(TEST_JPEG))
+    assert x_height
+    assert estimate_x_height(large_image) == pytest.approx(4 * x_height, 0.1)
+    assert estimate_x_height(Image.new('L', (300, 200), 255)) is None
+
+
+def test_normalize(large_image):
+    normalizer = ResolutionNormalizer()
+    small, config, size = normalizer.normalize(large_image, 'tsv', '--psm 6')
+    assert size == large_image.size
+    assert config == '--dpi 300 --psm 6'
+    assert small.width < large_image.width / 2
+
+    # trusted DPI information is used as it is
+    large_image.info['dpi'] = (800, 800)
+    small, config, _ = normalizer.normalize(large_image, 'box')
+    assert config == '--dpi 300'
+    assert small.size == (960, 720)
+
+
+@pytest.mark.parametrize(
+    ('image', 'extension', 'config'),
+    [
+        (TEST_JPEG, 'tsv', ''),
+        ('large', 'hocr', ''),
+        ('large', 'tsv', '--dpi 600'),
+        (path.join(DATA_DIR, 'images.txt'), 'txt', ''),
+    ],
+    ids=['low_resolution', 'hocr', 'dpi_config', 'list_file'],
+)
+def test_normalize_keeps_image(large_image, image, extension, config):
+    image = large_image if image == 'large' else image
+    assert ResolutionNormalizer().normalize(image, extension, config) is None
+
+
+def test_normalize_x_height(large_image):
+    x_height = estimate_x_height(large_image)
+    small, _, _ = ResolutionNormalizer(x_height=x_height / 2).normalize(
+        large_image,
+        'txt',
+    )
+    assert small.width == round(large_image.width / 2)
+
+
+def test_rescale_tsv():
+    tsv = (
+        f'{TSV_HEADER}\n'
+        '1\t1\t0\t0\t0\t0\t0\t0\t100\t50\t-1\t\n'
+        '5\t1\t1\t1\t1\t1\t10\t5\t20\t8\t95.5\tword\n'
+    )
+    rows = rescale_tsv(tsv, (300, 150), (100, 50)).split('\n')
+    assert rows[1].split('\t')[6:10] == ['0', '0', '300', '150']
+    assert rows[2].split('\t')[6:] == ['30', '15', '60', '24', '95.5', 'word']
+
+
+def test_rescale_boxes():
+    boxes = 'a 10 20 15 30 0\n  1 2 3 4 0\n'
+    assert rescale_boxes(boxes, (200, 400), (100, 200)) == (
+        'a 20 40 30 60 0\n  2 4 6 8 0\n'
+    )
+
+
+@pytest.mark.usefixtures('normalizer')
+def test_image_to_data_normalized(large_image):
+    data = image_to_data(large_image, output_type=Output.DICT)
+    assert data['width'][0] == large_image.width
+    assert data['height'][0] == large_image.height
+
+    words = dict(zip(data['text'], zip(data['left'], data['top'])))
+    assert 'dog' in words
+    # test.jpg coordinates of the word, four times larger
+    left, top = words['dog']
+    original = image_to_data(TEST_JPEG, output_type=Output.DICT)
+    index = original['text'].index('dog')
+    assert left == pytest.approx(4 * original['left'][index], abs=12)
+    assert top == pytest.approx(4 * original['top'][index], abs=12)
+
+
+@pytest.mark.usefixtures('normalizer')
+def test_image_to_boxes_normalized(large_image):
+    boxes = image_to_boxes(large_image, output_type=Output.DICT)
+    assert boxes['char']
+    assert max(boxes['right']) > large_image.width / 2
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import json
+import socket
+import stat
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+from threading import Event
+from time import sleep
+
+import pytest
+from packaging.version import Version
+from PIL import Image
+
+from pytesseract import ALTONotSupported
+from pytesseract import Output
+from pytesseract import pytesseract as pytesseract_module
+from pytesseract import server as server_module
+from pytesseract import TesseractError
+from pytesseract import TesseractNotFoundError
+from pytesseract.client import OCRClient
+from pytesseract.client import QueueFullError
+from pytesseract.server import OCRServer
+
+
+ROOT_DIR = path.dirname(path.dirname(path.abspath(__file__)))
+TEST_PNG = path.join(ROOT_DIR, 'tests', 'data', 'test.png')
+
+pytestmark = [
+    pytest.mark.usefixtures('fake_tesseract'),
+    pytest.mark.fake_tesseract_words(12),
+]
+
+
+@pytest.fixture
+def server():
+    with OCRServer(port=0, workers=2, queue_size=1) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    return OCRClient(server.url, timeout=10)
+
+
+def test_client_outputs(client):
+    image = Image.new('L', (200, 100), 255)
+    text = client.image_to_string(image)
+    assert text == pytesseract_module.image_to_string(image)
+    assert client.image_to_string(TEST_PNG, output_type=Output.DICT) == {
+        'text': text,
+    }
+
+    data = client.image_to_data(image, output_type=Output.DICT)
+    assert data == pytesseract_module.image_to_data(
+        image,
+        output_type=Output.DICT,
+    )
+    boxes = client.image_to_boxes(image, output_type=Output.DICT)
+    assert boxes['char'][:4] == ['w', 'o', 'r', 'd']
+    osd = client.image_to_osd(image, output_type=Output.DICT)
+    assert osd['orientation'] == 0
+    assert client.image_to_pdf_or_hocr(image).startswith(b'%PDF')
+    assert b'ocrx_word' in client.image_to_pdf_or_hocr(
+        image,
+        extension='hocr',
+    )
+    assert client.get_tesseract_version() == Version('5.3.0')
+    assert client.get_languages() == ['eng', 'fra', 'osd']
+
+
+def test_client_errors(client):
+    with pytest.raises(ValueError, match='Unsupported extension'):
+        client.image_to_pdf_or_hocr(TEST_PNG, extension='txt')
+    with pytest.raises(ValueError, match='Unknown parameters'):
+        client.run('image_to_string', TEST_PNG, psm=6)
+
+
+def test_client_tesseract_errors(monkeypatch, tmp_path, client):
+    failing = tmp_path / 'tesseract'
+    failing.write_text(
+        '#!/bin/sh\necho "Error opening data file" >&2\nexit 1\n'
+    )
+    failing.chmod(0o755)
+    monkeypatch.setattr(pytesseract_module, 'tesseract_cmd', str(failing))
+    with pytest.raises(TesseractError) as e:
+        client.image_to_string(TEST_PNG)
+    assert e.value.args == (1, 'Error opening data file')
+
+    monkeypatch.setattr(pytesseract_module, 'tesseract_cmd', 'missing')
+    with pytest.raises(TesseractNotFoundError, match='missing'):
+        client.image_to_string(TEST_PNG)
+
+
+def test_unix_socket(tmp_path):
+    socket = str(tmp_path / 'ocr.sock')
+    with OCRServer(unix_socket=socket, workers=1) as server:
+        client = OCRClient(server.url)
+        assert client.image_to_string(TEST_PNG).startswith('word0 word1')
+        assert client.health()['completed'] == 1
+    assert not path.exists(socket)
+
+
+def test_unix_socket_mode(tmp_path):
+    socket_path = tmp_path / 'ocr.sock'
+    with OCRServer(unix_socket=str(socket_path), workers=1):
+        assert stat.S_IMODE(socket_path.stat().st_mode) == 0o600
+    with OCRServer(unix_socket=str(socket_path), socket_mode=0o660):
+        assert stat.S_IMODE(socket_path.stat().st_mode) == 0o660
+
+
+@pytest.mark.parametrize(
+    'config',
+    [
+        '-c debug_file=/tmp/overwritten',
+        '--tessdata-dir /tmp',
+        '--user-words words.txt',
+        '--psm auto',
+        'digits',
+    ],
+)
+def test_client_config_not_allowed(client, config):
+    with pytest.raises(ValueError, match='not allowed|Invalid'):
+        client.image_to_string(TEST_PNG, config=config)
+    with pytest.raises(ValueError):
+        client.get_languages(config=config)
+
+
+def test_client_config_allowed(client):
+    config = '--psm 6 --oem 1 -c tessedit_char_whitelist=0123456789'
+    assert client.image_to_string(TEST_PNG, config=config).startswith('word0')
+
+
+def test_unix_socket_existing_path(tmp_path):
+    # the socket left by a killed server is replaced
+    stale = tmp_path / 'stale.sock'
+    listener = socket.socket(socket.AF_UNIX)
+    listener.bind(str(stale))
+    listener.close()
+    with OCRServer(unix_socket=str(stale), workers=1) as server:
+        assert OCRClient(server.url).health()['completed'] == 0
+
+    regular = tmp_path / 'notes.txt'
+    regular.write_text('keep')
+    with pytest.raises(FileExistsError, match='Not a unix socket'):
+        OCRServer(unix_socket=str(regular), workers=1)
+    assert regular.read_text() == 'keep'
+
+
+def test_unsupported_output_status(monkeypatch, tmp_path, tesseract_script):
+    old = tesseract_script(tmp_path, version='4.0.0')
+    monkeypatch.setattr(pytesseract_module, 'tesseract_cmd', old)
+    with OCRServer(port=0, workers=1) as server:
+        client = OCRClient(server.url)
+        connection = client.connection()
+        with open(TEST_PNG, 'rb') as f:
+            connection.request('POST', '/image_to_alto_xml', body=f.read())
+        response = connection.getresponse()
+        assert response.status == 400
+        assert json.loads(response.read())['error'] == 'ALTONotSupported'
+        connection.close()
+        with pytest.raises(ALTONotSupported):
+            client.image_to_alto_xml(TEST_PNG)
+
+
+def test_backpressure(monkeypatch, server, client):
+    started, release = Event(), Event()
+    served = server_module.FUNCTIONS['image_to_string']
+
+    def blocked(image, **kwargs):
+        started.set()
+        release.wait(10)
+        return served(image, **kwargs)
+
+    monkeypatch.setitem(server_module.FUNCTIONS, 'image_to_string', blocked)
+    with ThreadPoolExecutor(server.capacity) as pool:
+        futures = [
+            pool.submit(client.image_to_string, TEST_PNG)
+            for _ in range(server.capacity)
+        ]
+        started.wait(10)
+        while server.health()['pending'] < server.capacity:
+            sleep(0.01)
+
+        with pytest.raises(QueueFullError):
+            client.image_to_string(TEST_PNG)
+        health = client.health()
+        assert health['running'] == 2 and health['queued'] == 1
+        release.set()
+        assert len({future.result() for future in futures}) == 1
+
+    health = client.health()
+    assert health['rejected'] == 1
+    assert health['completed'] == server.capacity
+    assert health['pending'] == 0
+
+
+def test_metrics(client):
+    client.image_to_data(TEST_PNG)
+    connection = client.connection()
+    connection.request('GET', '/metrics')
+    metrics = connection.getresponse().read().decode()
+    assert 'pytesseract_server_workers 2\n' in metrics
+    assert 'pytesseract_calls_total 1\n' in metrics
+    assert 'pytesseract_wait_seconds_count 1\n' in metrics
+
+    connection.request('GET', '/missing')
+    response = connection.getresponse()
+    assert response.status == 404
+    assert json.loads(response.read())['error'] == 'NotFound'
+
+
+def test_serve_entry_point(monkeypatch, capsys):
+    monkeypatch.setattr(sys, 'argv', ['pytesseract', 'serve', '--help'])
+    with pytest.raises(SystemExit) as e:
+        pytesseract_module.main()
+    assert e.value.code == 0
+    assert '--queue-size' in capsys.readouterr().out
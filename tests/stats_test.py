@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from os import path
+from unittest import mock
+
+import pytest
+from PIL import Image
+
+from pytesseract import image_to_data
+from pytesseract import image_to_string
+from pytesseract import Output
+from pytesseract import pytesseract as pytesseract_module
+from pytesseract import TesseractNotFoundError
+from pytesseract.pytesseract import current_stats
+from pytesseract.pytesseract import OCRStats
+from pytesseract.pytesseract import ResourcePopen
+from pytesseract.stats import Histogram
+from pytesseract.stats import StatsAggregator
+
+
+TESTS_DIR = path.dirname(path.abspath(__file__))
+DATA_DIR = path.join(TESTS_DIR, 'data')
+TEST_JPEG = path.join(DATA_DIR, 'test.jpg')
+
+
+@pytest.fixture
+def aggregator():
+    aggregator = StatsAggregator()
+    with mock.patch.object(pytesseract_module, 'stats_hook', aggregator):
+        yield aggregator
+
+
+def test_stats_stages():
+    stats = OCRStats()
+    image = Image.open(TEST_JPEG)
+    image_to_data(image, output_type=Output.DICT, stats=stats)
+
+    assert set(stats.stages) == {
+        'prepare',
+        'encode',
+        'spawn',
+        'wait',
+        'read',
+        'parse',
+        'total',
+    }
+    assert stats.stages['total'] >= sum(
+        seconds for stage, seconds in stats.stages.items() if stage != 'total'
+    )
+    assert stats.pixels == image.width * image.height
+    assert stats.output_bytes > 0
+    assert not stats.failed
+    assert current_stats() is None
+
+
+@pytest.mark.skipif(
+    not hasattr(pytesseract_module.os, 'wait4'),
+    reason='no wait4',
+)
+def test_stats_resource_usage():
+    stats = OCRStats()
+    image_to_string(TEST_JPEG, stats=stats)
+    assert stats.processes == 1
+    assert stats.user_time + stats.system_time > 0
+    assert stats.max_rss > 1 << 20
+    # pixels from the header of the file
+    assert stats.pixels == 640 * 480
+
+
+@pytest.mark.skipif(
+    not hasattr(pytesseract_module.os, 'wait4'),
+    reason='no wait4',
+)
+def test_resource_popen():
+    pipes = dict.fromkeys(('stdin', 'stdout', 'stderr'), subprocess.PIPE)
+    proc = ResourcePopen(
+        [
+            sys.executable,
+            '-c',
+            'import sys; sys.stdout.write(sys.stdin.read()); sys.exit(3)',
+        ],
+        **pipes,
+    )
+    assert proc.communicate(b'page') == (b'page', b'')
+    assert proc.returncode == 3
+    assert proc.rusage.ru_maxrss > 0
+
+    proc = ResourcePopen(
+        [sys.executable, '-c', 'import time; time.sleep(30)'],
+        **pipes,
+    )
+    with pytest.raises(subprocess.TimeoutExpired):
+        proc.communicate(timeout=0.1)
+    proc.kill()
+    assert proc.wait() < 0
+
+
+def test_stats_hook(aggregator):
+    image_to_data(TEST_JPEG, output_type=Output.DICT)
+    image_to_string(TEST_JPEG)
+    exported = aggregator.export()
+    assert exported['calls'] == 2
+    assert exported['failed'] == 0
+    assert exported['histograms']['total_time']['count'] == 2
+    assert exported['histograms']['parse_time']['count'] == 1
+
+
+@pytest.mark.usefixtures('fake_tesseract')
+def test_stats_hook_tiles(aggregator):
+    stats = OCRStats()
+    image_to_data(TEST_JPEG, tiles=(2, 2), stats=stats)
+    # the tile calls of the workers are recorded into the stats of the call,
+    # with their overlaps
+    assert stats.pixels > 640 * 480
+    assert stats.output_bytes > 0
+    if hasattr(pytesseract_module.os, 'wait4'):
+        assert stats.processes == 4
+    assert aggregator.export()['calls'] == 1
+
+
+def test_stats_failed_call(aggregator, monkeypatch):
+    monkeypatch.setattr(pytesseract_module, 'tesseract_cmd', 'no_tesseract')
+    stats = OCRStats()
+    with pytest.raises(TesseractNotFoundError):
+        image_to_string(TEST_JPEG, stats=stats)
+    assert stats.failed
+    assert aggregator.export()['failed'] == 1
+
+
+def test_histogram():
+    histogram = Histogram((1, 10, 100))
+    for value in (0.5, 1, 5, 50, 500, 5000):
+        histogram.observe(value)
+    assert histogram.cumulative() == [
+        (1, 2),
+        (10, 3),
+        (100, 4),
+        (float('inf'), 6),
+    ]
+    assert histogram.export()['sum'] == 5556.5
+
+
+def test_prometheus():
+    aggregator = StatsAggregator()
+    stats = OCRStats()
+    stats.add_time('wait', 0.3)
+    stats.max_rss = 50 << 20
+    stats.processes = 1
+    aggregator(stats)
+
+    text = aggregator.prometheus()
+    assert 'pytesseract_calls_total 1\n' in text
+    assert 'pytesseract_processes_total 1\n' in text
+    assert 'pytesseract_wait_seconds_bucket{le="0.25"} 0\n' in text
+    assert 'pytesseract_wait_seconds_bucket{le="0.5"} 1\n' in text
+    assert 'pytesseract_max_rss_bytes_bucket{le="+Inf"} 1\n' in text
+    assert 'pytesseract_wait_seconds_count 1\n' in text
+
+
+@pytest.mark.skipif(sys.platform == 'darwin', reason='ru_maxrss in bytes')
+def test_add_rusage():
+    stats = OCRStats()
+    stats.add_rusage(
+        mock.Mock(ru_utime=0.5, ru_stime=0.25, ru_maxrss=2048),
+    )
+    assert stats.as_dict()['max_rss'] == 2 << 20
+    assert (stats.user_time, stats.system_time) == (0.5, 0.25)
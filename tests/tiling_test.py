@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from os import path
+
+import pytest
+from PIL import Image
+from PIL import ImageDraw
+
+from pytesseract import image_to_boxes
+from pytesseract import image_to_data
+from pytesseract import Output
+from pytesseract.cache import ResultCache
+from pytesseract.tiling import cut_positions
+from pytesseract.tiling import ink_profile
+from pytesseract.tiling import merge_boxes
+from pytesseract.tiling import merge_tsv
+from pytesseract.tiling import tile_grid
+from pytesseract.tiling import tiled_ocr
+
+
+TESTS_DIR = path.dirname(path.abspath(__file__))
+DATA_DIR = path.join(TESTS_DIR, 'data')
+TEST_JPEG = path.join(DATA_DIR, 'test.jpg')
+
+TSV_HEADER = (
+    'level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\t'
+    'left\ttop\twidth\theight\tconf\ttext\n'
+)
+
+
+@pytest.fixture
+def striped_image():
+    # black everywhere but in the blank rows 90-97
+    image = Image.new('L', (50, 200), 0)
+    ImageDraw.Draw(image).rectangle((0, 90, 49, 97), fill=255)
+    return image
+
+
+def test_ink_profile(striped_image):
+    rows = ink_profile(striped_image, 0)
+    assert len(rows) == 200
+    assert rows[0] == 255
+    assert rows[92] == 0
+    assert ink_profile(striped_image, 1) == [245] * 50
+
+
+def test_cut_positions():
+    profile = [255] * 100
+    profile[45] = 0
+    assert cut_positions(profile, 2) == [0, 45, 100]
+    assert cut_positions([0] * 100, 4) == [0, 25, 50, 75, 100]
+    assert cut_positions([0] * 10, 1) == [0, 10]
+
+
+def test_tile_grid(striped_image):
+    grid = tile_grid(striped_image, 2, overlap=8)
+    # the cut lands in the blank rows around the middle of the page
+    assert grid == [
+        ((0, 0, 50, 105), (0, 0, 50, 97)),
+        ((0, 89, 50, 200), (0, 97, 50, 200)),
+    ]
+
+    grid = tile_grid(striped_image, (1, 2), overlap=0)
+    assert [core for _, core in grid] == [(0, 0, 25, 200), (25, 0, 50, 200)]
+
+    with pytest.raises(ValueError):
+        tile_grid(striped_image, 0)
+    with pytest.raises(TypeError):
+        tile_grid(striped_image, True)
+
+
+def test_merge_tsv():
+    grid = [
+        ((0, 0, 100, 60), (0, 0, 100, 50)),
+        ((0, 40, 100, 100), (0, 50, 100, 100)),
+    ]
+    outputs = [
+        f'{TSV_HEADER}'
+        '1\t1\t0\t0\t0\t0\t0\t0\t100\t60\t-1\t\n'
+        '5\t1\t1\t1\t1\t1\t10\t10\t20\t10\t90\tkept\n'
+        '5\t1\t1\t1\t2\t1\t10\t45\t20\t10\t80\toverlap\n',
+        f'{TSV_HEADER}'
+        '1\t1\t0\t0\t0\t0\t0\t0\t100\t60\t-1\t\n'
+        '5\t1\t1\t1\t1\t1\t10\t5\t20\t10\t85\toverlap\n'
+        '5\t1\t1\t1\t2\t1\t10\t30\t20\t10\t95\tmoved\n',
+    ]
+    assert merge_tsv(outputs, grid, (100, 100)) == (
+        f'{TSV_HEADER}'
+        '1\t1\t0\t0\t0\t0\t0\t0\t100\t100\t-1\t\n'
+        '5\t1\t1\t1\t1\t1\t10\t10\t20\t10\t90\tkept\n'
+        '5\t1\t2\t1\t1\t1\t10\t45\t20\t10\t85\toverlap\n'
+        '5\t1\t2\t1\t2\t1\t10\t70\t20\t10\t95\tmoved\n'
+    )
+
+
+def test_merge_boxes():
+    grid = [
+        ((0, 0, 100, 60), (0, 0, 100, 50)),
+        ((0, 40, 100, 100), (0, 50, 100, 100)),
+    ]
+    outputs = [
+        # the second box is centered at y=55 of the page, not in the core
+        'a 10 40 20 50 0\nb 10 0 20 10 0\n',
+        'b 10 40 20 50 0\nc 10 0 20 10 0\n',
+    ]
+    assert merge_boxes(outputs, grid, (100, 100)) == (
+        'a 10 80 20 90 0\nb 10 40 20 50 0\nc 10 0 20 10 0\n'
+    )
+
+
+def test_tiled_ocr_unsupported_extension():
+    with pytest.raises(ValueError):
+        tiled_ocr(TEST_JPEG, 'txt', tiles=2)
+
+
+@pytest.mark.usefixtures('fake_tesseract')
+def test_tiled_ocr_tiles_true():
+    assert tiled_ocr(TEST_JPEG, tiles=True, workers=3) == tiled_ocr(
+        TEST_JPEG,
+        workers=3,
+    )
+
+
+def test_image_to_data_tiles():
+    result = image_to_data(TEST_JPEG, output_type=Output.DICT, tiles=2)
+    with Image.open(TEST_JPEG) as image:
+        assert result['level'][0] == 1
+        assert (result['width'][0], result['height'][0]) == image.size
+    assert 'dog' in ' '.join(result['text'])
+
+
+def test_image_to_boxes_tiles():
+    result = image_to_boxes(TEST_JPEG, output_type=Output.DICT, tiles=(2, 2))
+    assert set(result['page']) == {0}
+    assert 'd' in result['char']
+
+
+@pytest.mark.usefixtures('fake_tesseract')
+def test_tiled_ocr_cache(monkeypatch):
+    result_cache = ResultCache()
+    monkeypatch.setattr('pytesseract.pytesseract.result_cache', result_cache)
+    output = tiled_ocr(TEST_JPEG, 'tsv', tiles=(2, 2))
+    assert (result_cache.hits, result_cache.misses) == (0, 4)
+    assert tiled_ocr(TEST_JPEG, 'tsv', tiles=(2, 2)) == output
+    assert (result_cache.hits, result_cache.misses) == (4, 4)
+
+    # other tiles, other keys
+    tiled_ocr(TEST_JPEG, 'tsv', tiles=(2, 2), overlap=32)
+    assert (result_cache.hits, result_cache.misses) == (4, 8)
+    tiled_ocr(TEST_JPEG, 'tsv', tiles=(2, 2), cache=False)
+    assert (result_cache.hits, result_cache.misses) == (4, 8)